@@ -14,3 +14,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'codebreaker.settings')
 
 application = get_asgi_application()
+
+# Set CODEBREAKER_WARMUP=1 when the server imports this module before forking its workers.
+if os.environ.get('CODEBREAKER_WARMUP') == '1':
+    from codebreaker.warmup import warm_up
+
+    warm_up()
@@ -0,0 +1,51 @@
+"""
+API documentation routes: the OpenAPI schema and Swagger UI.
+
+drf-spectacular's views pull in its schema generator, YAML and most of DRF, so they are imported on
+the first docs request instead of when the URLconf loads. The schema itself is served from the file
+built by `manage.py spectacular --file` when it exists, and generated at request time otherwise.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+
+@lru_cache(maxsize=None)
+def _read_schema(path: str) -> bytes:
+    return Path(path).read_bytes()
+
+
+def _prebuilt_schema(path: str) -> bytes | None:
+    # Only successful reads are cached (lru_cache does not keep exceptions), so a schema file built
+    # after the first request is picked up without a restart.
+    try:
+        return _read_schema(path)
+    except FileNotFoundError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def _spectacular_views():
+    from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
+    return SpectacularAPIView.as_view(), SpectacularSwaggerView.as_view(url_name="api-schema")
+
+
+@require_GET
+def schema_view(request, *args, **kwargs):
+    path = str(settings.API_SCHEMA_FILE)
+    content = _prebuilt_schema(path)
+    if content is None:
+        return _spectacular_views()[0](request, *args, **kwargs)
+    content_type = "application/vnd.oai.openapi+json" if path.endswith(".json") else "application/vnd.oai.openapi"
+    return HttpResponse(content, content_type=content_type)
+
+
+def swagger_view(request, *args, **kwargs):
+    return _spectacular_views()[1](request, *args, **kwargs)
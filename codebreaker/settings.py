@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -38,11 +39,11 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'drf_spectacular',
     'games',
 ]
 
 MIDDLEWARE = [
+    'games.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -50,6 +51,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'games.middleware.QueryCountMiddleware',
 ]
 
 ROOT_URLCONF = 'codebreaker.urls'
@@ -78,10 +80,137 @@ WSGI_APPLICATION = 'codebreaker.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('CODEBREAKER_SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        # A file-backed test database lets the contention tests exercise real SQLite locking;
+        # the shared-cache in-memory default fails fast on table locks instead of waiting.
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+# High-concurrency SQLite profile, enabled with CODEBREAKER_SQLITE_PROFILE=concurrent.
+# WAL lets readers run alongside the single writer, IMMEDIATE transactions take the write lock up
+# front (so busy_timeout applies instead of failing on a lock upgrade), and connections persist
+# across requests with a health check before reuse.
+SQLITE_CONCURRENT_PRAGMAS = (
+    'PRAGMA journal_mode=WAL;'
+    'PRAGMA synchronous=NORMAL;'
+    'PRAGMA busy_timeout=5000;'
+    'PRAGMA mmap_size=268435456;'
+    'PRAGMA cache_size=-65536;'
+    'PRAGMA temp_store=MEMORY;'
+)
+
+if os.environ.get('CODEBREAKER_SQLITE_PROFILE', 'stock') == 'concurrent':
+    DATABASES['default'].update(
+        {
+            'CONN_MAX_AGE': 600,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': SQLITE_CONCURRENT_PRAGMAS,
+                'transaction_mode': 'IMMEDIATE',
+                'timeout': 20,
+            },
+        }
+    )
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Game state is cached write-through; use a shared backend (Redis, Memcached) when running several processes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+GAMES_CACHE_TIMEOUT = 300
+GAMES_FINISHED_CACHE_TIMEOUT = 86400
+
+# How check_guess serializes concurrent guesses on one game:
+# "locking" holds select_for_update for the whole request, "optimistic" claims the attempt with a
+# single conditional UPDATE and never holds a row lock while scoring.
+GAMES_GUESS_CONCURRENCY = 'locking'
+
+# Serve guess_history from the packed copy on the Game row instead of joining GameGuess.
+# check_guess keeps the column current; run `manage.py backfill_packed_history` before enabling.
+GAMES_PACKED_HISTORY = False
+
+# Funnel guess writes through one in-process writer thread (games.writer) so concurrent requests
+# never queue on the SQLite write lock; pairs with CODEBREAKER_SQLITE_PROFILE=concurrent.
+# A guess still queued after 30 seconds is dropped with a 503; one already running always finishes.
+GAMES_SERIALIZED_WRITES = os.environ.get('CODEBREAKER_SERIALIZED_WRITES') == '1'
+
+# Write-behind guess journal (games.journal): active games live in memory and guesses are flushed
+# with bulk_create every GAMES_JOURNAL_FLUSH_INTERVAL_MS or GAMES_JOURNAL_FLUSH_RECORDS, whichever
+# comes first. Up to that many accepted guesses are at risk if the process is killed; a clean
+# shutdown drains the journal. Only for deployments where one process owns all game writes, on SQLite
+# or PostgreSQL (startup fails on other databases, which cannot reserve guess IDs).
+# At most GAMES_JOURNAL_MAX_PENDING guesses wait for a flush (further guesses get 503 once none is
+# flushed within a few seconds), and games with nothing to flush leave memory after
+# GAMES_JOURNAL_IDLE_SECONDS or beyond the GAMES_JOURNAL_MAX_GAMES most recently used.
+GAMES_WRITE_BEHIND = False
+GAMES_JOURNAL_FLUSH_INTERVAL_MS = 50
+GAMES_JOURNAL_FLUSH_RECORDS = 500
+GAMES_JOURNAL_MAX_PENDING = 5000
+GAMES_JOURNAL_MAX_GAMES = 10_000
+GAMES_JOURNAL_IDLE_SECONDS = 600
+
+# The 100 MB feedback table for classic games is memory-mapped from this file (written on first use,
+# in the user's cache directory by default), so all worker processes share one copy. If it cannot be
+# written, a warning is logged and each process builds its own copy; set to None to do that silently.
+GAMES_FEEDBACK_TABLE_FILE = os.environ.get(
+    'CODEBREAKER_FEEDBACK_TABLE_FILE',
+    Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'codebreaker' / 'feedback_table.npy',
+)
+
+# Bulk provisioning (POST /api/games/bulk/ and `manage.py provision_games`).
+GAMES_BULK_MAX_GAMES = 100_000
+GAMES_BULK_CHUNK_SIZE = 1000
+
+# Idempotency-Key support for game creation and guesses: replayable responses are cached for the
+# TTL (guesses are also recorded in IdempotencyRecord), and duplicates of an in-flight request wait up
+# to GAMES_IDEMPOTENCY_WAIT_SECONDS for it. Run `manage.py purge_idempotency_keys` periodically.
+GAMES_IDEMPOTENCY_TTL = 86400
+GAMES_IDEMPOTENCY_WAIT_SECONDS = 10
+
+# Token-bucket rate limits for game creation and guesses (games.ratelimit): `burst` requests at once,
+# refilled at `per_second`. "guess" is per client, "game_guess" per client and game, and "bulk_create"
+# is charged one token per game requested, so its burst must cover GAMES_BULK_MAX_GAMES; scopes left
+# out are not limited. Buckets live in process memory unless GAMES_RATE_LIMIT_BACKEND points elsewhere.
+GAMES_RATE_LIMITS = {} if DEBUG else {
+    'create': {'burst': 10, 'per_second': 0.5},
+    'bulk_create': {'burst': 100_000, 'per_second': 100.0},
+    'guess': {'burst': 30, 'per_second': 5.0},
+    'game_guess': {'burst': 10, 'per_second': 1.0},
+}
+GAMES_RATE_LIMIT_BACKEND = 'games.ratelimit.LocalTokenBuckets'
+
+# Server-Sent Events (GET /api/games/<id>/events/, served under ASGI). The default backend fans out
+# within one process; point GAMES_EVENTS_BACKEND at a games.events.EventBackend subclass to share
+# events between processes.
+GAMES_EVENTS_BACKEND = 'games.events.LocalEventBackend'
+GAMES_EVENTS_KEEPALIVE_SECONDS = 15
+GAMES_EVENTS_BUFFER_SIZE = 16
+
+# Finished games older than this are moved to ArchivedGame by `manage.py archive_games`.
+GAMES_ARCHIVE_AFTER_DAYS = 30
+
+# Games per keyset batch in the NDJSON export (GET /api/games/export/ and `manage.py export_games`).
+GAMES_EXPORT_BATCH_SIZE = 500
+
+# Add an X-Query-Count header to every response; `manage.py loadtest` reads it.
+GAMES_QUERY_COUNT_HEADER = DEBUG
+
+# Fraction of requests timed into the histograms served at /metrics (0 disables instrumentation).
+GAMES_METRICS_SAMPLE_RATE = 1.0 if DEBUG else 0.05
+
+# /metrics is served to staff sessions and to scrapers sending `Authorization: Bearer <token>`;
+# leave unset to allow staff only.
+GAMES_METRICS_TOKEN = os.environ.get('CODEBREAKER_METRICS_TOKEN')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -124,9 +253,19 @@ STATIC_URL = 'static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Keeps the test suite's feedback table file out of GAMES_FEEDBACK_TABLE_FILE.
+TEST_RUNNER = 'codebreaker.test_runner.TestRunner'
+
 
 REST_FRAMEWORK = {
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'games.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    # Reverse proxies in front of the app. Throttles identify clients by REMOTE_ADDR when this is 0, and
+    # by the address that many hops from the end of X-Forwarded-For otherwise; DRF's default (None)
+    # would trust the client-supplied header as is.
+    'NUM_PROXIES': int(os.environ.get('CODEBREAKER_NUM_PROXIES', '0')),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -135,3 +274,17 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# /docs/schema/ and /docs/swagger/. The schema is served from API_SCHEMA_FILE when it exists; build it
+# at deploy time with `python manage.py spectacular --validate --file openapi.yaml` (a .json name is
+# served as JSON). Without it, the schema is generated on each request.
+# CODEBREAKER_API_DOCS=0 drops the routes and drf-spectacular's app and schema class, so its schema
+# generator (drf_spectacular.openapi), a large share of worker startup, is never imported. The views
+# still import the small drf_spectacular.utils and .types modules for their `extend_schema`
+# annotations. The `spectacular` command then needs the docs enabled.
+API_DOCS_ENABLED = os.environ.get('CODEBREAKER_API_DOCS', '1') == '1'
+API_SCHEMA_FILE = os.environ.get('CODEBREAKER_API_SCHEMA_FILE', BASE_DIR / 'openapi.yaml')
+
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index('games'), 'drf_spectacular')
+    REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'] = 'drf_spectacular.openapi.AutoSchema'
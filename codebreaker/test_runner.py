@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Django's runner, with the feedback table file written to a temporary directory for the run.
+
+    The path is also exported as CODEBREAKER_FEEDBACK_TABLE_FILE for the interpreters some tests start.
+    """
+
+    def setup_test_environment(self, **kwargs) -> None:
+        super().setup_test_environment(**kwargs)
+        from games.services import feedback_table
+
+        self._feedback_directory = tempfile.TemporaryDirectory(prefix="codebreaker-tests-")
+        path = str(Path(self._feedback_directory.name) / "feedback_table.npy")
+        self._previous_environ = os.environ.get("CODEBREAKER_FEEDBACK_TABLE_FILE")
+        os.environ["CODEBREAKER_FEEDBACK_TABLE_FILE"] = path
+        self._feedback_settings = override_settings(GAMES_FEEDBACK_TABLE_FILE=path)
+        self._feedback_settings.enable()
+        feedback_table.cache_clear()
+
+    def teardown_test_environment(self, **kwargs) -> None:
+        from games.services import feedback_table
+
+        feedback_table.cache_clear()
+        self._feedback_settings.disable()
+        if self._previous_environ is None:
+            os.environ.pop("CODEBREAKER_FEEDBACK_TABLE_FILE", None)
+        else:
+            os.environ["CODEBREAKER_FEEDBACK_TABLE_FILE"] = self._previous_environ
+        self._feedback_directory.cleanup()
+        super().teardown_test_environment(**kwargs)
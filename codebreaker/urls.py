@@ -14,14 +14,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from games.metrics import metrics_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("docs/schema/", SpectacularAPIView.as_view(), name="api-schema"),
-    path("docs/swagger/", SpectacularSwaggerView.as_view(url_name="api-schema"), name="swagger-ui"),
     path("api/", include("games.urls")),
+    path("metrics", metrics_view, name="metrics"),
 ]
+
+if settings.API_DOCS_ENABLED:
+    from .docs import schema_view, swagger_view
+
+    urlpatterns += [
+        path("docs/schema/", schema_view, name="api-schema"),
+        path("docs/swagger/", swagger_view, name="swagger-ui"),
+    ]
@@ -0,0 +1,67 @@
+"""
+Pre-fork warm-up: pay the first-request costs once in the server's parent process.
+
+With a pre-forking server that imports the application before forking (gunicorn --preload, or any
+server that imports `codebreaker.wsgi`/`codebreaker.asgi` in its master), set CODEBREAKER_WARMUP=1
+and every worker starts with the URLconf and views imported, DRF's settings resolved, serializers
+exercised and the feedback table mapped. Workers share those pages copy-on-write instead of each
+rebuilding them on its first request.
+"""
+
+from __future__ import annotations
+
+import gc
+
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+from rest_framework.settings import api_settings
+
+# DRF resolves these import strings on first access.
+_DRF_SETTINGS = (
+    "DEFAULT_RENDERER_CLASSES",
+    "DEFAULT_PARSER_CLASSES",
+    "DEFAULT_AUTHENTICATION_CLASSES",
+    "DEFAULT_PERMISSION_CLASSES",
+    "DEFAULT_THROTTLE_CLASSES",
+    "DEFAULT_CONTENT_NEGOTIATION_CLASS",
+    "DEFAULT_VERSIONING_CLASS",
+)
+
+
+def warm_up() -> None:
+    """
+    Initialize per-process state that every request needs, then freeze it for copy-on-write sharing.
+
+    The database is queried once so the backend and ORM compiler are loaded, and every connection is
+    closed again: a connection opened before fork must never be shared by the workers.
+    """
+    from games.models import Game
+    from games.serializers import CodeBatchSerializer, CodeSerializer, GameCreateSerializer, game_representation
+    from games.services import feedback_table, score_guess
+
+    resolver = get_resolver()
+    resolver.resolve("/api/games/1/")
+    resolver.reverse_dict  # Populates the reverse lookup tables.
+
+    for name in _DRF_SETTINGS:
+        getattr(api_settings, name)
+
+    CodeSerializer(data={"code": "1234"}).is_valid()
+    CodeBatchSerializer(data={"codes": ["1234"]}).is_valid()
+    GameCreateSerializer(data={"code": "1234"}).is_valid()
+    game_representation(Game(id=1, code="1234"))
+
+    feedback_table()
+    score_guess("1234", "4321")
+    score_guess("12345", "54321")
+
+    try:
+        Game.objects.exists()
+    except DatabaseError:
+        pass  # Not migrated yet; the workers will report it on their own requests.
+    finally:
+        connections.close_all()
+
+    # Keep the collector from touching (and so copying) every object created so far in each worker.
+    gc.collect()
+    gc.freeze()
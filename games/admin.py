@@ -1,19 +1,147 @@
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.forms.models import BaseInlineFormSet
+from django.utils.functional import cached_property
 
-from .models import Game, GameGuess
+from .cache import invalidate_game
+from .models import CODE_VALIDATOR, Game, GameGuess
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*).
+
+    An unfiltered table is sized from the planner's row estimate on PostgreSQL and from the largest
+    primary key elsewhere, and counted exactly only when that estimate is small. A filtered queryset
+    is counted up to `max_count` rows, so the last pages of a huge result are not reachable by number.
+    """
+
+    exact_count_below = 10_000
+    max_count = 10_000
+
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        if queryset.query.where:
+            return queryset.values("pk")[: self.max_count].count()
+        estimate = self._estimate(queryset)
+        if estimate < self.exact_count_below:
+            return queryset.count()
+        return estimate
+
+    def _estimate(self, queryset) -> int:
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # -1 until the table is first analyzed.
+            if row and row[0] >= 0:
+                return row[0]
+        return queryset.order_by().values_list("pk", flat=True).last() or 0
+
+
+class CappedInlineFormSet(BaseInlineFormSet):
+    """
+    Inline formset that loads at most `limit` related rows, in the inline's ordering.
+    """
+
+    limit = 20
+
+    def get_queryset(self):
+        if not hasattr(self, "_capped_queryset"):
+            self._capped_queryset = super().get_queryset()[: self.limit]
+        return self._capped_queryset
 
 
 class GameGuessInline(admin.TabularInline):
+    """
+    The latest guesses of a game, read-only; older ones are not loaded.
+    """
+
     model = GameGuess
+    formset = CappedInlineFormSet
     extra = 0
-    readonly_fields = ("guess", "well_placed", "misplaced", "created_at")
+    limit = 20
+    can_delete = False
+    ordering = ("-created_at", "-id")
+    verbose_name_plural = "latest guesses"
+    fields = readonly_fields = ("guess", "well_placed", "misplaced", "created_at")
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.limit = self.limit
+        return formset
+
+    def has_add_permission(self, request, obj=None) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
 
 
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
-    list_display = ("id", "code", "attempts_used", "max_attempts", "is_solved", "created_at")
+    list_display = ("id", "code", "guess_count", "attempts_used", "max_attempts", "is_solved", "created_at")
     search_fields = ("code",)
+    search_help_text = "Exact game ID or code."
     ordering = ("-created_at",)
     readonly_fields = ("attempts_used", "created_at")
     inlines = [GameGuessInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # A correlated subquery runs only for the rows on the page, each one an index range scan.
+        guess_counts = (
+            GameGuess.objects.filter(game=OuterRef("pk"))
+            .order_by()
+            .values("game")
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .defer("packed_history")
+            .annotate(guess_count=Coalesce(Subquery(guess_counts, output_field=IntegerField()), 0))
+        )
+
+    # Not sortable: ordering by the subquery would compute it for every row in the table.
+    @admin.display(description="Guesses")
+    def guess_count(self, obj: Game) -> int:
+        return obj.guess_count
+
+    def get_search_results(self, request, queryset, search_term):
+        # Equality on the indexed code column and the primary key instead of a scanning icontains.
+        term = search_term.strip().upper()
+        if not term:
+            return queryset, False
+        condition = Q(pk__in=[])
+        if CODE_VALIDATOR.regex.match(term):
+            condition |= Q(code=term)
+        if term.isdigit() and int(term) < 2**63:
+            condition |= Q(pk=int(term))
+        return queryset.filter(condition), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_game(obj.pk)
+
+    def delete_model(self, request, obj):
+        game_id = obj.pk
+        super().delete_model(request, obj)
+        invalidate_game(game_id)
 
+    def delete_queryset(self, request, queryset):
+        # The "delete selected" action; the selection is bounded by the changelist page.
+        game_ids = list(queryset.values_list("pk", flat=True))
+        super().delete_queryset(request, queryset)
+        for game_id in game_ids:
+            invalidate_game(game_id)
@@ -5,3 +5,7 @@ class GamesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "games"
 
+    def ready(self):
+        from .journal import check_write_behind_support
+
+        check_write_behind_support()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterator
+
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+
+from .history import pack_guesses
+from .models import ArchivedGame, Game, GameGuess
+
+
+def finished_before(cutoff: datetime) -> QuerySet:
+    return Game.objects.filter(
+        Q(is_solved=True) | Q(attempts_used__gte=F("max_attempts")),
+        created_at__lt=cutoff,
+    )
+
+
+def archived_game(game_id: int) -> Game | None:
+    try:
+        return restore_game(ArchivedGame.objects.get(pk=game_id))
+    except ArchivedGame.DoesNotExist:
+        return None
+
+
+def restore_game(archived: ArchivedGame) -> Game:
+    """
+    Rebuild an unsaved `Game` from its archive row, with the full history in `packed_history`.
+
+    Like a queryset annotation, the restored game also carries the archive's `archived_at`.
+    """
+    game = Game(
+        id=archived.pk,
+        challenge_id=archived.challenge_id,
+        code=archived.code,
+        code_length=archived.code_length,
+        alphabet_size=archived.alphabet_size,
+        attempts_used=archived.attempts_used,
+        max_attempts=archived.max_attempts,
+        is_solved=archived.is_solved,
+        created_at=archived.created_at,
+        packed_history=zlib.decompress(archived.history),
+    )
+    game.archived_at = archived.archived_at
+    return game
+
+
+def is_archived(game: Game) -> bool:
+    return getattr(game, "archived_at", None) is not None
+
+
+def archive_games(
+    cutoff: datetime,
+    *,
+    batch_size: int = 500,
+    delete_chunk_size: int = 100,
+) -> Iterator[int]:
+    """
+    Move finished games created before `cutoff` into `ArchivedGame`, yielding the size of each batch.
+
+    Each batch is copied in one short transaction and its source rows are then deleted
+    `delete_chunk_size` games at a time. The archive table is the checkpoint: a run that stops between
+    the copy and the deletes is finished by the next run, which first deletes every game already
+    archived before copying anything new.
+    """
+    _delete_games(Game.objects.filter(pk__in=ArchivedGame.objects.values("pk")), delete_chunk_size)
+
+    games = finished_before(cutoff).defer("packed_history").order_by("pk")
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            batch = list(games.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                return
+            last_pk = batch[-1].pk
+
+            guesses_by_game: dict[int, list[GameGuess]] = defaultdict(list)
+            for guess in GameGuess.objects.filter(game__in=batch).order_by("game_id", "created_at", "id"):
+                guesses_by_game[guess.game_id].append(guess)
+
+            ArchivedGame.objects.bulk_create(
+                [
+                    ArchivedGame(
+                        id=game.pk,
+                        challenge_id=game.challenge_id,
+                        code=game.code,
+                        code_length=game.code_length,
+                        alphabet_size=game.alphabet_size,
+                        attempts_used=game.attempts_used,
+                        max_attempts=game.max_attempts,
+                        is_solved=game.is_solved,
+                        created_at=game.created_at,
+                        history=zlib.compress(
+                            pack_guesses(
+                                guesses_by_game[game.pk],
+                                code_length=game.code_length,
+                                alphabet_size=game.alphabet_size,
+                            ),
+                            9,
+                        ),
+                    )
+                    for game in batch
+                ],
+                ignore_conflicts=True,
+            )
+
+        _delete_games(Game.objects.filter(pk__in=[game.pk for game in batch]), delete_chunk_size)
+        yield len(batch)
+
+
+def _delete_games(games: QuerySet, chunk_size: int) -> None:
+    while True:
+        with transaction.atomic():
+            chunk = list(games.values_list("pk", flat=True)[:chunk_size])
+            if not chunk:
+                return
+            # Deleting the games cascades to their guesses.
+            Game.objects.filter(pk__in=chunk).delete()
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import subprocess
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from django.conf import settings
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted, non-empty sequence.
+    """
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(
+    latencies: Sequence[float],
+    elapsed: float,
+    queries: Sequence[int | None] = (),
+    errors: int = 0,
+) -> dict[str, Any]:
+    """
+    Summarize per-operation latencies (in seconds) measured over `elapsed` wall-clock seconds.
+    """
+    ordered = sorted(latencies)
+    counted = [count for count in queries if count is not None]
+    summary: dict[str, Any] = {
+        "count": len(ordered),
+        "errors": errors,
+        "per_second": round(len(ordered) / elapsed, 1) if elapsed > 0 else None,
+        "queries_per_request": round(sum(counted) / len(counted), 2) if counted else None,
+    }
+    for label, fraction in (("p50_ms", 0.50), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+        summary[label] = round(percentile(ordered, fraction) * 1000, 3) if ordered else None
+    return summary
+
+
+def time_callable(func: Callable[[], object], *, number: int, repeat: int = 5) -> dict[str, Any]:
+    """
+    Run `func` `number` times per round for `repeat` rounds and report per-call timings.
+    """
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - started) / number)
+    rounds.sort()
+    return {
+        "calls": number * repeat,
+        "best_us": round(rounds[0] * 1e6, 3),
+        "median_us": round(rounds[len(rounds) // 2] * 1e6, 3),
+    }
+
+
+def git_revision() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def write_results(path: str | Path, kind: str, config: dict[str, Any], results: dict[str, Any]) -> None:
+    """
+    Write a benchmark run as JSON, tagged with the commit and interpreter so runs can be compared.
+    """
+    document = {
+        "kind": kind,
+        "commit": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": config,
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+
+def format_table(results: dict[str, dict[str, Any]]) -> str:
+    columns = sorted({column for row in results.values() for column in row})
+    header = ["name", *columns]
+    rows = [[name, *(str(row.get(column, "")) for column in columns)] for name, row in results.items()]
+    widths = [max(len(line[index]) for line in [header, *rows]) for index in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(line, widths)) for line in [header, *rows]
+    )
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Game
+
+
+class CachedState(TypedDict):
+    etag: str
+    finished: bool
+    attempts_used: int
+    data: Any
+
+
+def _game_key(game_id: int) -> str:
+    return f"games:state:{game_id}"
+
+
+def _history_key(game_id: int, game_etag: str) -> str:
+    # Keyed by the version of the game it belongs to, so a history filled from an older read is never
+    # found once the game state has moved on.
+    return f"games:history:{game_id}:{game_etag}"
+
+
+def representation_etag(data: Any) -> str:
+    """
+    Strong ETag over every field of a representation, so any change to it (admin edits included) shows.
+    """
+    encoded = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return f'"{hashlib.blake2b(encoded, digest_size=12).hexdigest()}"'
+
+
+def is_finished(game: Game) -> bool:
+    return game.is_solved or game.attempts_used >= game.max_attempts
+
+
+def cache_timeout(finished: bool) -> int:
+    if finished:
+        return getattr(settings, "GAMES_FINISHED_CACHE_TIMEOUT", 86400)
+    return getattr(settings, "GAMES_CACHE_TIMEOUT", 300)
+
+
+def _state(game: Game, data: Any) -> CachedState:
+    return {
+        "etag": representation_etag(data),
+        "finished": is_finished(game),
+        "attempts_used": game.attempts_used,
+        "data": data,
+    }
+
+
+def get_game_state(game_id: int) -> CachedState | None:
+    return cache.get(_game_key(game_id))
+
+
+def store_game_state(game: Game, data: Any) -> CachedState:
+    """
+    Cache the state of a game just created.
+    """
+    state = _state(game, data)
+    cache.set(_game_key(game.pk), state, cache_timeout(state["finished"]))
+    return state
+
+
+def fill_game_state(game: Game, data: Any) -> CachedState:
+    """
+    Cache a game state read from the database, unless a writer has stored one meanwhile.
+    """
+    state = _state(game, data)
+    cache.add(_game_key(game.pk), state, cache_timeout(state["finished"]))
+    return state
+
+
+def get_history_state(game_id: int) -> CachedState | None:
+    game_state = get_game_state(game_id)
+    if game_state is None:
+        return None
+    return cache.get(_history_key(game_id, game_state["etag"]))
+
+
+def fill_history_state(game: Game, data: Any) -> CachedState:
+    """
+    Cache a guess history read from the database, filed under the version of its `data["game"]`.
+    """
+    game_state = fill_game_state(game, data["game"])
+    state = _state(game, data)
+    cache.set(_history_key(game.pk, game_state["etag"]), state, cache_timeout(state["finished"]))
+    return state
+
+
+def invalidate_game(game_id: int) -> None:
+    cache.delete(_game_key(game_id))
+
+
+def refresh_after_guess(game: Game, game_data: Any) -> None:
+    """
+    Write the new game state through to the cache, unless a later guess already has.
+
+    Histories of earlier versions are no longer found and expire on their own.
+    """
+    current = get_game_state(game.pk)
+    if current is not None and current["attempts_used"] > game.attempts_used:
+        return
+    state = _state(game, game_data)
+    cache.set(_game_key(game.pk), state, cache_timeout(state["finished"]))
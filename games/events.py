@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Any
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def format_event(event: str, data: Any, event_id: int | None = None) -> str:
+    """
+    Render one Server-Sent Events message.
+    """
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {_encoder.encode(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+# Appended to the last message of a finished game; streams close after sending it.
+END_EVENT = format_event("end", {})
+
+
+class Subscription:
+    """
+    One open stream's mailbox: a small bounded buffer plus a future the stream awaits while idle.
+
+    Messages are delivered on the subscriber's own event loop, so an idle stream is one suspended
+    coroutine and costs no CPU. A subscriber that falls more than `maxsize` messages behind loses the
+    oldest ones; every guess message carries the full game state, so the next one resynchronizes it.
+    """
+
+    def __init__(self, game_id: int, maxsize: int):
+        self.game_id = game_id
+        self.loop = asyncio.get_running_loop()
+        self._messages: deque[str] = deque(maxlen=maxsize)
+        self._waiter: asyncio.Future | None = None
+
+    def deliver(self, message: str) -> None:
+        # Runs on self.loop.
+        self._messages.append(message)
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self, timeout: float) -> str | None:
+        """
+        Next message, or None if nothing arrived within `timeout` seconds.
+        """
+        if not self._messages:
+            self._waiter = self.loop.create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            except asyncio.TimeoutError:
+                return None
+            finally:
+                self._waiter = None
+        return self._messages.popleft()
+
+
+class EventBackend:
+    """
+    Interface for fanning game events out to open streams.
+
+    `publish` may be called from any thread; `subscribe` and `unsubscribe` are called from the
+    streaming coroutine. A cross-process backend (for example on Redis pub/sub) implements the same
+    three methods and delivers to its local subscribers the same way `LocalEventBackend` does.
+    """
+
+    def publish(self, game_id: int, message: str) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, game_id: int) -> Subscription:
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        raise NotImplementedError
+
+    def has_subscribers(self, game_id: int) -> bool:
+        return True
+
+
+class LocalEventBackend(EventBackend):
+    """
+    In-process fan-out. Only streams served by this process see events published by it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscriptions: dict[int, set[Subscription]] = {}
+
+    def publish(self, game_id: int, message: str) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(game_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, message)
+            except RuntimeError:
+                # The subscriber's loop has shut down without unsubscribing.
+                self.unsubscribe(subscription)
+
+    def subscribe(self, game_id: int) -> Subscription:
+        subscription = Subscription(game_id, getattr(settings, "GAMES_EVENTS_BUFFER_SIZE", 16))
+        with self._lock:
+            self._subscriptions.setdefault(game_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.game_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.game_id]
+
+    def has_subscribers(self, game_id: int) -> bool:
+        return game_id in self._subscriptions
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> EventBackend:
+    return import_string(getattr(settings, "GAMES_EVENTS_BACKEND", "games.events.LocalEventBackend"))()
+
+
+def publish_guesses(game_data: dict, guesses_data: list[dict]) -> None:
+    """
+    Announce guesses just recorded for a game; skips encoding entirely when nobody is watching it.
+    """
+    backend = get_backend()
+    game_id = game_data["id"]
+    if backend.has_subscribers(game_id):
+        message = format_event("guess", {"game": game_data, "guesses": guesses_data}, game_data["attempts_used"])
+        if game_data["is_solved"] or game_data["remaining_attempts"] == 0:
+            message += END_EVENT
+        backend.publish(game_id, message)
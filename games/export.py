@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+from typing import Iterator
+
+from django.db.models import Q, QuerySet
+
+from .archive import restore_game
+from .history import unpack_history
+from .models import ArchivedGame, Game, GameGuess
+from .pagination import encode_cursor, keyset_page
+from .serializers import game_representation, guess_representation
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+def export_queryset(
+    *,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    is_solved: bool | None = None,
+    archived: bool = False,
+) -> QuerySet:
+    """
+    Live games matching the filters, or with `archived` the `ArchivedGame` rows matching them.
+    """
+    games = ArchivedGame.objects.all() if archived else Game.objects.defer("packed_history")
+    if created_after is not None:
+        games = games.filter(created_at__gte=created_after)
+    if created_before is not None:
+        games = games.filter(created_at__lt=created_before)
+    if is_solved is not None:
+        games = games.filter(is_solved=is_solved)
+    return games
+
+
+def export_lines(
+    games: QuerySet,
+    archived: QuerySet | None = None,
+    *,
+    cursor: str | None = None,
+    batch_size: int = 500,
+) -> Iterator[str]:
+    """
+    Yield one NDJSON line per game in `games` and `archived`, oldest first, with its guesses and a resume cursor.
+
+    Live games are read in keyset batches of `batch_size`. After each batch, the archive rows up to its
+    last game are read, also in batches, and merged with it on `(created_at, id)`, so one cursor resumes
+    both and memory stays bounded by a batch of each however large the tables are. Live guesses are read
+    with one `.iterator()` query per batch; archived ones are unpacked from the row. Passing a line's
+    `cursor` back resumes right after that game; a malformed cursor raises `ValueError`.
+
+    `archive_games` copies a game before deleting it, and the archive is read after the live batch it
+    is merged with, so a game moved while the export runs is never skipped. A game found in both tables
+    is exported once, from the archive, whose copy was taken with its guesses in one transaction.
+    """
+    lines = (line for _, _, line in _entries(games, archived, cursor, batch_size))
+    while chunk := "".join(islice(lines, batch_size)):
+        yield chunk
+
+
+# Entries are (key, source, line): sorting archive rows (0) before live games (1) on equal keys lets
+# `_unique` keep the archived copy.
+Entry = tuple[tuple, int, str]
+
+
+def _entries(games: QuerySet, archived: QuerySet | None, cursor: str | None, batch_size: int) -> Iterator[Entry]:
+    lower = cursor
+    for batch in _batches(games, cursor, batch_size):
+        live = _live_entries(batch, batch_size)
+        if archived is None:
+            yield from live
+            continue
+        last = batch[-1]
+        window = archived.filter(
+            Q(created_at__lt=last.created_at) | Q(created_at=last.created_at, id__lte=last.pk)
+        )
+        yield from _unique(heapq.merge(live, _archived_entries(window, lower, batch_size)))
+        lower = encode_cursor(last.created_at, last.pk)
+    if archived is not None:
+        yield from _archived_entries(archived, lower, batch_size)
+
+
+def _unique(entries: Iterator[Entry]) -> Iterator[Entry]:
+    # Merged entries arrive in key order, so a game present in both tables is two consecutive entries.
+    previous = None
+    for entry in entries:
+        if entry[0] != previous:
+            yield entry
+        previous = entry[0]
+
+
+def _line(game, guesses: list[dict]) -> str:
+    cursor = encode_cursor(game.created_at, game.pk)
+    return _encoder.encode({"game": game_representation(game), "guesses": guesses, "cursor": cursor}) + "\n"
+
+
+def _batches(queryset: QuerySet, cursor: str | None, batch_size: int) -> Iterator[list]:
+    page = keyset_page(queryset, cursor, descending=False)
+    while batch := list(page[:batch_size]):
+        yield batch
+        last = batch[-1]
+        page = keyset_page(queryset, encode_cursor(last.created_at, last.pk), descending=False)
+
+
+def _live_entries(batch: list[Game], batch_size: int) -> Iterator[Entry]:
+    history: dict[int, list[dict]] = {game.pk: [] for game in batch}
+    guesses = (
+        GameGuess.objects.filter(game_id__in=history)
+        .order_by("game_id", "created_at", "id")
+        .iterator(chunk_size=batch_size)
+    )
+    for guess in guesses:
+        history[guess.game_id].append(guess_representation(guess))
+
+    for game in batch:
+        yield (game.created_at, game.pk), 1, _line(game, history[game.pk])
+
+
+def _archived_entries(archived: QuerySet, cursor: str | None, batch_size: int) -> Iterator[Entry]:
+    for batch in _batches(archived, cursor, batch_size):
+        for row in batch:
+            game = restore_game(row)
+            guesses = [guess_representation(guess) for guess in unpack_history(game)]
+            yield (game.created_at, game.pk), 0, _line(game, guesses)
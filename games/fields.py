@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django import forms
+from django.db import models
+
+from .services import MAX_CODE_LENGTH, StoredCode, code_to_value
+
+
+class CodeField(models.Field):
+    """
+    A code that Python and the API see as its string and the database stores as one integer.
+
+    The integer is `code_to_value`'s numbering, which keeps the code's length and so its leading
+    zeros, and is the feedback-table index of a classic code. Loaded values are `StoredCode` strings
+    that keep the integer, so scoring and saving them back need no parsing. Lookups take code strings;
+    only equality-style lookups (`exact`, `in`) are meaningful.
+
+    There is deliberately no text mode: the column type is fixed by the migrations that created it,
+    not by a setting.
+    """
+
+    description = "Code stored as an integer"
+
+    def get_internal_type(self) -> str:
+        return "BigIntegerField"
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else StoredCode(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return StoredCode(value)
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return code_to_value(value if isinstance(value, str) else str(value))
+        except ValueError as error:
+            raise ValueError(f"Field '{self.name}' expected a code but got {value!r}.") from error
+
+    def value_to_string(self, obj) -> str:
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        return super().formfield(**{"form_class": forms.CharField, "max_length": MAX_CODE_LENGTH, **kwargs})
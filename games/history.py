@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, NamedTuple
+
+from .models import Game, GameGuess
+from .services import ALPHABET_SIZE, CODE_LENGTH, code_to_index, index_to_code, pack_score, unpack_score
+
+# One packed entry: guess id, created_at in microseconds since the epoch, code index, packed score.
+# Classic games fit the code index in 16 bits; configurable games (up to 36**12 codes) need 64.
+_ENTRY = struct.Struct("<qqHB")
+_WIDE_ENTRY = struct.Struct("<qqQB")
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _entry_struct(code_length: int, alphabet_size: int) -> struct.Struct:
+    return _ENTRY if code_length == CODE_LENGTH and alphabet_size == ALPHABET_SIZE else _WIDE_ENTRY
+
+
+class PackedGuess(NamedTuple):
+    """
+    Lightweight stand-in for a `GameGuess` row, readable by `GuessSerializer`.
+    """
+
+    id: int
+    game_id: int
+    guess: str
+    well_placed: int
+    misplaced: int
+    created_at: datetime
+
+
+def pack_guesses(
+    guesses: Iterable[GameGuess],
+    *,
+    code_length: int = CODE_LENGTH,
+    alphabet_size: int = ALPHABET_SIZE,
+) -> bytes:
+    entry = _entry_struct(code_length, alphabet_size)
+    return b"".join(
+        entry.pack(
+            guess.pk,
+            (guess.created_at - _EPOCH) // timedelta(microseconds=1),
+            code_to_index(guess.guess, alphabet_size),
+            pack_score(guess.well_placed, guess.misplaced),
+        )
+        for guess in guesses
+    )
+
+
+def unpack_history(game: Game) -> list[PackedGuess]:
+    """
+    Decode `game.packed_history`, which must not be NULL, in the order the guesses were played.
+    """
+    history = []
+    entry = _entry_struct(game.code_length, game.alphabet_size)
+    for guess_id, created_micros, code_index, score in entry.iter_unpack(bytes(game.packed_history)):
+        evaluation = unpack_score(score)
+        history.append(
+            PackedGuess(
+                id=guess_id,
+                game_id=game.pk,
+                guess=index_to_code(code_index, game.code_length, game.alphabet_size),
+                well_placed=evaluation["well_placed"],
+                misplaced=evaluation["misplaced"],
+                created_at=_EPOCH + timedelta(microseconds=created_micros),
+            )
+        )
+    return history
+
+
+def append_guesses(game: Game, guesses: Iterable[GameGuess]) -> None:
+    """
+    Append newly recorded guesses to the in-memory packed history; callers save the field.
+    """
+    if game.packed_history is not None:
+        packed = pack_guesses(guesses, code_length=game.code_length, alphabet_size=game.alphabet_size)
+        game.packed_history = bytes(game.packed_history) + packed
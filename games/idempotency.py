@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import threading
+from datetime import timedelta
+from typing import Any, Callable, TypedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+from .models import IdempotencyRecord
+from .writer import run_write
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+# Callbacks waiting for the durable transaction of the current request to commit (see `after_commit`).
+_deferred: contextvars.ContextVar[list[Callable[[], None]] | None] = contextvars.ContextVar(
+    "games_idempotency_deferred", default=None
+)
+
+
+class StoredResponse(TypedDict):
+    fingerprint: str
+    status: int
+    data: Any
+
+
+def ttl() -> int:
+    return getattr(settings, "GAMES_IDEMPOTENCY_TTL", 86400)
+
+
+def _wait_seconds() -> float:
+    return getattr(settings, "GAMES_IDEMPOTENCY_WAIT_SECONDS", 10)
+
+
+class _KeyLocks:
+    """
+    One lock per in-flight key, dropped again once no request holds or waits for it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: dict[str, list] = {}
+
+    def acquire(self, key: str, timeout: float) -> bool:
+        with self._lock:
+            entry = self._entries.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        if entry[0].acquire(timeout=timeout):
+            return True
+        self._forget(key, entry)
+        return False
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries[key]
+        entry[0].release()
+        self._forget(key, entry)
+
+    def _forget(self, key: str, entry: list) -> None:
+        with self._lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._entries[key]
+
+
+_key_locks = _KeyLocks()
+
+
+def client_ident(request) -> str:
+    """
+    Who a key belongs to: the authenticated user, else the client address as the throttles see it.
+    """
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return BaseThrottle().get_ident(request)[:MAX_KEY_LENGTH]
+
+
+def idempotent(request, scope: str, handler: Callable[[], Response], *, durable: bool = False) -> Response:
+    """
+    Run `handler` once per client and `Idempotency-Key` within `scope` and replay its response for retries.
+
+    Keys belong to the client that sent them (`client_ident`), so nobody else can replay a response
+    by reusing a key. Responses below 500 are kept in the cache for `GAMES_IDEMPOTENCY_TTL` seconds.
+    With `durable`, `handler` runs in one transaction with its `IdempotencyRecord` (see `_run_recorded`),
+    so a replay survives cache eviction and a crash can never leave a recorded guess without its
+    response. In this process, duplicates wait on a per-key lock. Reusing a key for a different request
+    body is rejected.
+    """
+    key = request.headers.get(HEADER)
+    if key is None:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {"error": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    fingerprint = hashlib.sha256(request.body).hexdigest()
+    client = client_ident(request)
+    digest = hashlib.sha256(f"{scope}\0{client}\0{key}".encode()).hexdigest()
+    cache_key = f"games:idempotency:{digest}"
+    if not _key_locks.acquire(cache_key, _wait_seconds()):
+        return _in_progress_response()
+    try:
+        stored: StoredResponse | None = cache.get(cache_key)
+        if stored is None:
+            if durable:
+                stored, response = run_write(_run_recorded, scope, client, key, fingerprint, handler)
+            else:
+                response = handler()
+            if stored is None:
+                if response.status_code < 500:
+                    stored = {"fingerprint": fingerprint, "status": response.status_code, "data": response.data}
+                    cache.set(cache_key, stored, ttl())
+                return response
+            cache.set(cache_key, stored, ttl())
+        return _replay(stored, fingerprint)
+    finally:
+        _key_locks.release(cache_key)
+
+
+def _run_recorded(
+    scope: str, client: str, key: str, fingerprint: str, handler: Callable[[], Response]
+) -> tuple[StoredResponse | None, Response | None]:
+    """
+    Claim the key and run `handler` in one transaction that also stores its response; returns
+    (stored response, None) if the key was already used, else (None, handler's response).
+
+    The handler's own transactions nest in this one, so the guess and its record commit together or
+    not at all. A duplicate in another process blocks on the record's unique key until this one
+    commits, then replays it. Under `GAMES_SERIALIZED_WRITES` the whole transaction runs on the
+    writer thread. With `GAMES_WRITE_BEHIND` the guesses themselves are only journaled here.
+    """
+    lookup = {"scope": scope, "client": client, "key": key}
+    deferred: list[Callable[[], None]] = []
+    token = _deferred.set(deferred)
+    try:
+        result = _record(lookup, fingerprint, handler)
+    finally:
+        _deferred.reset(token)
+    if result[1] is not None and result[1].status_code < 500:
+        for callback in deferred:
+            callback()
+    return result
+
+
+def _record(
+    lookup: dict[str, str], fingerprint: str, handler: Callable[[], Response]
+) -> tuple[StoredResponse | None, Response | None]:
+    with transaction.atomic():
+        IdempotencyRecord.objects.filter(**lookup, created_at__lt=timezone.now() - timedelta(seconds=ttl())).delete()
+        try:
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(**lookup, fingerprint=fingerprint)
+        except IntegrityError:
+            record = IdempotencyRecord.objects.get(**lookup)
+            stored: StoredResponse = {
+                "fingerprint": record.fingerprint,
+                "status": record.status_code,
+                "data": record.response,
+            }
+            return stored, None
+
+        response = handler()
+        if response.status_code >= 500:
+            # A failed first attempt must not hold the key against its retries.
+            transaction.set_rollback(True)
+            return None, response
+        IdempotencyRecord.objects.filter(pk=record.pk).update(
+            status_code=response.status_code,
+            response=response.data,
+        )
+        return None, response
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """
+    Run `callback` now, or once the durable transaction wrapping this request has committed.
+    """
+    deferred = _deferred.get()
+    if deferred is None:
+        callback()
+    else:
+        deferred.append(callback)
+
+
+def _replay(stored: StoredResponse, fingerprint: str) -> Response:
+    if stored["fingerprint"] != fingerprint:
+        return Response(
+            {"error": f"{HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(stored["data"], status=stored["status"])
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _in_progress_response() -> Response:
+    return Response(
+        {"error": f"A request with this {HEADER} is still in progress."},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+def purge_expired(chunk_size: int = 1000) -> int:
+    """
+    Delete durable records older than the TTL in chunks; returns the number deleted.
+    """
+    cutoff = timezone.now() - timedelta(seconds=ttl())
+    deleted = 0
+    while True:
+        chunk = list(
+            IdempotencyRecord.objects.filter(created_at__lt=cutoff).values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return deleted
+        deleted += IdempotencyRecord.objects.filter(pk__in=chunk).delete()[0]
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import atexit
+import copy
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.http import Http404
+
+from .history import append_guesses
+from .models import Game, GameGuess
+from .stats import StatDeltas
+
+logger = logging.getLogger(__name__)
+
+# GameGuess IDs reserved from the database per round trip; the flusher tops the reserve up whenever
+# it falls below the low-water mark, so requests rarely wait for a reservation.
+ID_BLOCK_SIZE = 1000
+ID_LOW_WATER = ID_BLOCK_SIZE // 4
+# Databases whose GameGuess sequence `reserve_guess_ids` can advance.
+ID_RESERVING_VENDORS = ("postgresql", "sqlite")
+# How long a guess waits for room in a full journal before it is refused.
+_FULL_WAIT_SECONDS = 5.0
+
+
+class GameClosed(Exception):
+    """
+    Raised when a guess is submitted to a solved game or one without remaining attempts.
+    """
+
+    def __init__(self, game: Game):
+        super().__init__(game.pk)
+        self.game = game
+
+
+class JournalFull(Exception):
+    """
+    Raised when the journal holds `max_pending` unflushed guesses and no room frees up in time.
+    """
+
+
+def reserve_guess_ids(count: int) -> range | list[int]:
+    """
+    Take `count` GameGuess IDs from the table's own sequence, so rows inserted by any other writer
+    (another process, the admin, the synchronous guess path) are numbered past them.
+
+    Only for ID_RESERVING_VENDORS; `check_write_behind_support` refuses to start the journal elsewhere.
+    """
+    table = GameGuess._meta.db_table
+    column = GameGuess._meta.pk.column
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                [table, column, count],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+        # AUTOINCREMENT tables number new rows past sqlite_sequence.seq, so raising it reserves the block.
+        floor = f"(SELECT COALESCE(MAX({column}), 0) FROM {table})"
+        cursor.execute(
+            f"UPDATE sqlite_sequence SET seq = MAX(seq, {floor}) + %s WHERE name = %s", [count, table]
+        )
+        if not cursor.rowcount:
+            cursor.execute(f"INSERT INTO sqlite_sequence (name, seq) SELECT %s, {floor} + %s", [table, count])
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = %s", [table])
+        last = cursor.fetchone()[0]
+    return range(last - count + 1, last + 1)
+
+
+@dataclass
+class JournalEntry:
+    guess: GameGuess
+    # Game state right after this guess, written with the guess so a flush never runs ahead of its rows.
+    attempts_used: int
+    is_solved: bool
+    packed_history: bytes | None
+
+
+class GuessJournal:
+    """
+    Write-behind store for guesses: in-memory authoritative state for active games plus an append-only
+    journal that a background thread flushes to `GameGuess` with `bulk_create`.
+
+    Accepted guesses are at risk until flushed: at most `flush_records` guesses or `flush_interval`
+    seconds of traffic (plus one flush in progress) can be lost if the process is killed. `stop()` (also
+    registered with `atexit`) drains everything on a clean shutdown. The journal assumes this process
+    is the only writer for the games it serves; `GameGuess` IDs are reserved in blocks from the table's
+    sequence (`reserve_guess_ids`), so other writers never collide with them.
+
+    At most `max_pending` guesses wait for a flush: beyond that, new guesses wait briefly for room and
+    then raise `JournalFull`. Games with nothing to flush are dropped from memory once they are finished,
+    idle for `idle_seconds`, or the least recently used beyond `max_games`. A batch the database rejects
+    is retried game by game, and the guesses of a game that still fails are logged and dropped.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float,
+        flush_records: int,
+        max_pending: int = 5000,
+        max_games: int = 10_000,
+        idle_seconds: float = 600,
+    ):
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.max_pending = max_pending
+        self.max_games = max_games
+        self.idle_seconds = idle_seconds
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        # Least recently used first; values are (game, last use on the monotonic clock).
+        self._games: OrderedDict[int, tuple[Game, float]] = OrderedDict()
+        self._pending: list[JournalEntry] = []
+        self._guess_ids: deque[int] = deque()
+        # Serializes ID reservations, which run without `_lock` so requests are not held up by them.
+        self._id_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    # Writes
+
+    def record_guesses(
+        self,
+        game_id: int,
+        codes: Sequence[str],
+        validate: Callable[[Game], None] | None = None,
+    ) -> tuple[Game, list[GameGuess]]:
+        """
+        Score `codes` in order against the in-memory game, stopping at solve or attempt exhaustion.
+
+        Returns a snapshot of the game and the accepted guesses; raises `GameClosed` if the game could
+        not take any guess and `Http404` if it does not exist. `validate` is called with the game before
+        anything is recorded and may raise to reject the codes. Raises `JournalFull` when the journal
+        has had no room for `_FULL_WAIT_SECONDS`.
+        """
+        self._ensure_started()
+        game = self._load_game(game_id)
+        while True:
+            with self._lock:
+                deadline = time.monotonic() + _FULL_WAIT_SECONDS
+                while len(self._pending) >= self.max_pending:
+                    self._wakeup.notify()
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._drained.wait(remaining):
+                        raise JournalFull()
+
+                # The game may have been evicted since it was loaded; with nothing left to flush it was
+                # still current, so it is put back unless another request has loaded it again.
+                current = self._touch(game_id)
+                if current is None:
+                    self._games[game_id] = (game, time.monotonic())
+                else:
+                    game = current
+
+                if validate is not None:
+                    validate(game)
+                if game.is_solved or game.attempts_used >= game.max_attempts:
+                    raise GameClosed(copy.copy(game))
+
+                count = min(len(codes), game.remaining_attempts)
+                if len(self._guess_ids) >= count:
+                    return self._append(game, codes[:count])
+            self._reserve_ids(count)
+
+    def _append(self, game: Game, codes: Sequence[str]) -> tuple[Game, list[GameGuess]]:
+        # Called with the lock held and an ID reserved for every code.
+        guesses = []
+        for code_value in codes:
+            evaluation = game.score(code_value)
+            guess = GameGuess(
+                id=self._guess_ids.popleft(),
+                game=game,
+                guess=code_value,
+                well_placed=evaluation["well_placed"],
+                misplaced=evaluation["misplaced"],
+            )
+            game.attempts_used += 1
+            game.is_solved = evaluation["well_placed"] == game.code_length
+            append_guesses(game, [guess])
+            self._pending.append(JournalEntry(guess, game.attempts_used, game.is_solved, game.packed_history))
+            guesses.append(guess)
+            if game.is_solved:
+                break
+
+        if len(self._pending) >= self.flush_records:
+            self._wakeup.notify()
+        return copy.copy(game), guesses
+
+    def _reserve_ids(self, count: int) -> None:
+        """
+        Make sure at least `count` GameGuess IDs are reserved, taking a block from the database if not.
+        """
+        with self._id_lock:
+            with self._lock:
+                if len(self._guess_ids) >= count:
+                    return
+            ids = reserve_guess_ids(max(ID_BLOCK_SIZE, count))
+            with self._lock:
+                self._guess_ids.extend(ids)
+
+    def _load_game(self, game_id: int) -> Game:
+        with self._lock:
+            game = self._touch(game_id)
+        if game is not None:
+            return game
+
+        try:
+            loaded = Game.objects.get(pk=game_id)
+        except Game.DoesNotExist:
+            raise Http404
+        with self._lock:
+            game = self._touch(game_id)
+            if game is None:
+                game = loaded
+                self._games[game_id] = (game, time.monotonic())
+            return game
+
+    def _touch(self, game_id: int) -> Game | None:
+        # Called with the lock held.
+        entry = self._games.get(game_id)
+        if entry is None:
+            return None
+        self._games[game_id] = (entry[0], time.monotonic())
+        self._games.move_to_end(game_id)
+        return entry[0]
+
+    # Reads
+
+    def game(self, game_id: int) -> Game | None:
+        """
+        Snapshot of the in-memory game, or None when the database row is authoritative.
+        """
+        with self._lock:
+            entry = self._games.get(game_id)
+            return copy.copy(entry[0]) if entry is not None else None
+
+    def guesses_for(self, game: Game) -> list[GameGuess]:
+        """
+        Flushed guesses from the database merged with the game's unflushed journal entries.
+        """
+        with self._lock:
+            pending = [entry.guess for entry in self._pending if entry.guess.game_id == game.pk]
+        flushed = list(GameGuess.objects.filter(game_id=game.pk))
+        flushed_ids = {guess.pk for guess in flushed}
+        return flushed + [guess for guess in pending if guess.pk not in flushed_ids]
+
+    # Flushing
+
+    def flush(self) -> int:
+        """
+        Write the journaled guesses and final game states to the database; returns the number flushed.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending[:]
+            if not batch:
+                with self._lock:
+                    self._evict()
+                return 0
+
+            entries_by_game: dict[int, list[JournalEntry]] = {}
+            for entry in batch:
+                entries_by_game.setdefault(entry.guess.game_id, []).append(entry)
+            try:
+                self._write(entries_by_game)
+                failed: set[int] = set()
+            except DatabaseError:
+                logger.exception("Flushing the guess journal failed; retrying game by game.")
+                failed = self._write_each(entries_by_game)
+
+            with self._lock:
+                # Entries appended while flushing stay queued; only the flushed prefix is dropped.
+                del self._pending[: len(batch)]
+                for game_id in failed:
+                    self._pending = [entry for entry in self._pending if entry.guess.game_id != game_id]
+                    self._games.pop(game_id, None)
+                self._evict()
+                self._drained.notify_all()
+            return len(batch) - sum(len(entries_by_game[game_id]) for game_id in failed)
+
+    def _write(self, entries_by_game: dict[int, list[JournalEntry]]) -> None:
+        states = []
+        deltas = StatDeltas()
+        for game_id, entries in entries_by_game.items():
+            latest = entries[-1]
+            state = Game(
+                pk=game_id,
+                challenge_id=latest.guess.game.challenge_id,
+                max_attempts=latest.guess.game.max_attempts,
+                attempts_used=latest.attempts_used,
+                is_solved=latest.is_solved,
+                packed_history=latest.packed_history,
+            )
+            deltas.add_guesses(state, [entry.guess for entry in entries])
+            states.append(state)
+
+        with transaction.atomic():
+            GameGuess.objects.bulk_create([entry.guess for entries in entries_by_game.values() for entry in entries])
+            Game.objects.bulk_update(states, ["attempts_used", "is_solved", "packed_history"])
+            deltas.apply()
+
+    def _write_each(self, entries_by_game: dict[int, list[JournalEntry]]) -> set[int]:
+        """
+        Flush each game in its own transaction; returns the games whose guesses had to be dropped.
+        """
+        failed = set()
+        for game_id, entries in entries_by_game.items():
+            try:
+                self._write({game_id: entries})
+            except DatabaseError:
+                logger.exception("Dropping %d journaled guesses for game %s.", len(entries), game_id)
+                failed.add(game_id)
+        return failed
+
+    def _evict(self) -> None:
+        # Called with the lock held. Games with unflushed guesses stay; the database is behind them.
+        pending = {entry.guess.game_id for entry in self._pending}
+        idle_before = time.monotonic() - self.idle_seconds
+        overflow = len(self._games) - self.max_games
+        for game_id, (game, used_at) in list(self._games.items()):
+            if game_id in pending:
+                continue
+            finished = game.is_solved or game.attempts_used >= game.max_attempts
+            if finished or used_at < idle_before or overflow > 0:
+                del self._games[game_id]
+                overflow -= 1
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._stopping and len(self._pending) < self.flush_records:
+                    self._wakeup.wait(self.flush_interval)
+                stopping = self._stopping
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing the guess journal failed; entries stay queued for the next attempt.")
+            try:
+                if not stopping:
+                    self._reserve_ids(ID_LOW_WATER)
+            except DatabaseError:
+                logger.exception("Reserving guess IDs failed; requests will reserve their own.")
+            finally:
+                close_old_connections()
+            if stopping:
+                return
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="games-journal", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the flusher thread after draining every journaled guess to the database.
+        """
+        with self._lock:
+            thread = self._thread
+            self._stopping = True
+            self._wakeup.notify()
+        if thread is not None:
+            thread.join()
+        self.flush()
+        with self._lock:
+            self._thread = None
+            self._games.clear()
+            self._guess_ids.clear()
+
+
+guess_journal = GuessJournal(
+    flush_interval=getattr(settings, "GAMES_JOURNAL_FLUSH_INTERVAL_MS", 50) / 1000,
+    flush_records=getattr(settings, "GAMES_JOURNAL_FLUSH_RECORDS", 500),
+    max_pending=getattr(settings, "GAMES_JOURNAL_MAX_PENDING", 5000),
+    max_games=getattr(settings, "GAMES_JOURNAL_MAX_GAMES", 10_000),
+    idle_seconds=getattr(settings, "GAMES_JOURNAL_IDLE_SECONDS", 600),
+)
+atexit.register(guess_journal.stop)
+
+
+def write_behind_enabled() -> bool:
+    return getattr(settings, "GAMES_WRITE_BEHIND", False)
+
+
+def check_write_behind_support() -> None:
+    """
+    Refuse GAMES_WRITE_BEHIND on a database the journal cannot reserve GameGuess IDs from.
+    """
+    if write_behind_enabled() and connection.vendor not in ID_RESERVING_VENDORS:
+        raise ImproperlyConfigured(
+            f"GAMES_WRITE_BEHIND needs one of {', '.join(ID_RESERVING_VENDORS)}, not {connection.vendor}."
+        )
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from games.archive import archive_games
+
+
+class Command(BaseCommand):
+    help = (
+        "Move finished games older than a threshold, with their guesses, into the compact ArchivedGame table. "
+        "Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=getattr(settings, "GAMES_ARCHIVE_AFTER_DAYS", 30),
+            help="Archive finished games created more than this many days ago.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500, help="Games copied per transaction.")
+        parser.add_argument(
+            "--delete-chunk-size",
+            type=int,
+            default=100,
+            help="Games (and their guesses) deleted per transaction after each batch is copied.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] < 0:
+            raise CommandError("--older-than-days must not be negative.")
+
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        archived = 0
+        for batch in archive_games(
+            cutoff,
+            batch_size=options["batch_size"],
+            delete_chunk_size=options["delete_chunk_size"],
+        ):
+            archived += batch
+            self.stdout.write(f"Archived {archived} games...")
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} games created before {cutoff.isoformat()}."))
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from games.history import pack_guesses
+from games.models import Game, GameGuess
+
+
+class Command(BaseCommand):
+    help = "Backfill Game.packed_history from the GameGuess audit table, or verify that the two agree."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Games processed per transaction.")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Repack every game instead of only games without a packed history.",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare packed histories with GameGuess rows without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        verify = options["verify"]
+
+        games = Game.objects.only("id", "code_length", "alphabet_size", "packed_history").order_by("pk")
+        if not verify and not options["all"]:
+            games = games.filter(packed_history__isnull=True)
+
+        processed = unpacked = mismatched = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                batch_query = games.filter(pk__gt=last_pk)
+                if not verify:
+                    batch_query = batch_query.select_for_update()
+                batch = list(batch_query[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+
+                guesses_by_game: dict[int, list[GameGuess]] = defaultdict(list)
+                for guess in GameGuess.objects.filter(game__in=batch).order_by("game_id", "created_at", "id"):
+                    guesses_by_game[guess.game_id].append(guess)
+
+                for game in batch:
+                    expected = pack_guesses(
+                        guesses_by_game[game.pk],
+                        code_length=game.code_length,
+                        alphabet_size=game.alphabet_size,
+                    )
+                    if not verify:
+                        game.packed_history = expected
+                    elif game.packed_history is None:
+                        unpacked += 1
+                    elif bytes(game.packed_history) != expected:
+                        mismatched += 1
+                        self.stderr.write(f"Game #{game.pk}: packed history does not match its guesses.")
+
+                if not verify:
+                    Game.objects.bulk_update(batch, ["packed_history"])
+                processed += len(batch)
+
+        if not verify:
+            self.stdout.write(self.style.SUCCESS(f"Packed history for {processed} games."))
+            return
+
+        if mismatched:
+            raise CommandError(f"{mismatched} of {processed} games have a packed history that does not match.")
+        self.stdout.write(
+            self.style.SUCCESS(f"Verified {processed} games: {processed - unpacked} match, {unpacked} not packed.")
+        )
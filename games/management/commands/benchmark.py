@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.throttling import AnonRateThrottle
+
+from games.benchmarking import format_table, time_callable, write_results
+from games.models import Game, GameGuess
+from games.ratelimit import GameGuessRateThrottle, GuessRateThrottle, LocalTokenBuckets
+from games.renderers import FastJSONRenderer
+from games.serializers import (
+    GameSerializer,
+    GuessHistoryResponseSerializer,
+    GuessResponseSerializer,
+    game_representation,
+    guess_representation,
+)
+from games.services import evaluate_guess, feedback_table, score_batch, score_guess
+
+GROUPS = ("scoring", "serializers", "throttling", "views")
+
+# Large enough that no benchmark call is ever refused.
+UNLIMITED = {"burst": 10**9, "per_second": 1e9}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run micro-benchmarks for guess scoring, the serializers, rate limiting and the views "
+        "(through DRF's APIClient)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000, help="Calls per timing round.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timing rounds per benchmark.")
+        parser.add_argument("--only", choices=GROUPS, action="append", help="Run only these groups.")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        number, repeat = options["number"], options["repeat"]
+        groups = options["only"] or GROUPS
+
+        results: dict[str, dict] = {}
+        if "scoring" in groups:
+            results.update(self._scoring(number, repeat))
+        if "serializers" in groups:
+            results.update(self._serializers(number, repeat))
+        if "throttling" in groups:
+            results.update(self._throttling(number, repeat))
+        if "views" in groups:
+            results.update(self._views(max(number // 10, 1), repeat))
+
+        self.stdout.write(format_table(results))
+        if options["output"]:
+            config = {"number": number, "repeat": repeat, "groups": list(groups)}
+            write_results(options["output"], "micro", config, results)
+
+    def _scoring(self, number: int, repeat: int) -> dict[str, dict]:
+        feedback_table()
+        return {
+            "evaluate_guess": time_callable(
+                lambda: evaluate_guess([int(char) for char in "1256"], [int(char) for char in "1234"]),
+                number=number,
+                repeat=repeat,
+            ),
+            "score_guess": time_callable(lambda: score_guess("1256", "1234"), number=number, repeat=repeat),
+            "score_batch[100x10000]": time_callable(
+                lambda: score_batch(range(100), range(10000)), number=max(number // 100, 1), repeat=repeat
+            ),
+        }
+
+    def _serializers(self, number: int, repeat: int) -> dict[str, dict]:
+        created_at = timezone.now().astimezone(dt_timezone.utc)
+        game = Game(id=1, code="1234", attempts_used=10, created_at=created_at)
+        guesses = [
+            GameGuess(id=index, game=game, guess="1256", well_placed=2, misplaced=0, created_at=created_at)
+            for index in range(1, 11)
+        ]
+        response_data = GuessHistoryResponseSerializer({"game": game, "history": guesses}).data
+        json_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        return {
+            "GameSerializer": time_callable(lambda: GameSerializer(game).data, number=number, repeat=repeat),
+            "game_representation": time_callable(lambda: game_representation(game), number=number, repeat=repeat),
+            "GuessResponseSerializer": time_callable(
+                lambda: GuessResponseSerializer({"game": game, "guess": guesses[0]}).data,
+                number=number,
+                repeat=repeat,
+            ),
+            "compiled guess response": time_callable(
+                lambda: {"game": game_representation(game), "guess": guess_representation(guesses[0])},
+                number=number,
+                repeat=repeat,
+            ),
+            "GuessHistoryResponseSerializer[10]": time_callable(
+                lambda: GuessHistoryResponseSerializer({"game": game, "history": guesses}).data,
+                number=number,
+                repeat=repeat,
+            ),
+            "compiled history response[10]": time_callable(
+                lambda: {
+                    "game": game_representation(game),
+                    "history": [guess_representation(guess) for guess in guesses],
+                },
+                number=number,
+                repeat=repeat,
+            ),
+            "JSONRenderer[history 10]": time_callable(
+                lambda: json_renderer.render(response_data), number=number, repeat=repeat
+            ),
+            "FastJSONRenderer[history 10]": time_callable(
+                lambda: fast_renderer.render(response_data), number=number, repeat=repeat
+            ),
+        }
+
+    def _throttling(self, number: int, repeat: int) -> dict[str, dict]:
+        request = Request(APIRequestFactory().post("/api/games/1/guess/"))
+        view = type("View", (), {"kwargs": {"game_id": 1}})()
+        buckets = LocalTokenBuckets()
+        throttles = [GuessRateThrottle(), GameGuessRateThrottle()]
+
+        class CacheRateThrottle(AnonRateThrottle):
+            # DRF's cache-backed sliding window, for comparison.
+            rate = f"{10**9}/s"
+
+        drf_throttle = CacheRateThrottle()
+        limits = {"guess": UNLIMITED, "game_guess": UNLIMITED}
+        with override_settings(GAMES_RATE_LIMITS=limits):
+            return {
+                "LocalTokenBuckets.take": time_callable(
+                    lambda: buckets.take("guess:127.0.0.1", UNLIMITED), number=number, repeat=repeat
+                ),
+                "guess throttles (client + game)": time_callable(
+                    lambda: all(throttle.allow_request(request, view) for throttle in throttles),
+                    number=number,
+                    repeat=repeat,
+                ),
+                "DRF AnonRateThrottle": time_callable(
+                    lambda: drf_throttle.allow_request(request, view), number=max(number // 10, 1), repeat=repeat
+                ),
+            }
+
+    def _views(self, number: int, repeat: int) -> dict[str, dict]:
+        old_name = connection.settings_dict["NAME"]
+        setup_test_environment()
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Time the views rather than the throttles: the configured limits (empty only under DEBUG)
+            # would refuse most of these requests, so only the "[rate limited]" variant applies any.
+            with override_settings(GAMES_RATE_LIMITS={}):
+                client = APIClient()
+                game = Game.objects.create(code="1234", max_attempts=10**9)
+                finished = Game.objects.create(code="1234")
+                for _ in range(10):
+                    client.post(f"/api/games/{finished.id}/guess/", {"code": "1256"}, format="json")
+
+                def history_uncached():
+                    cache.clear()
+                    return client.get(f"/api/games/{finished.id}/history/")
+
+                def detail_uncached():
+                    cache.clear()
+                    return client.get(f"/api/games/{game.id}/")
+
+                with override_settings(GAMES_RATE_LIMITS={"guess": UNLIMITED, "game_guess": UNLIMITED}):
+                    rate_limited = time_callable(
+                        lambda: client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json"),
+                        number=number,
+                        repeat=repeat,
+                    )
+                return {
+                    "view:create_game": time_callable(
+                        lambda: client.post("/api/games/", {"code": "1234"}, format="json"),
+                        number=number,
+                        repeat=repeat,
+                    ),
+                    "view:check_guess": time_callable(
+                        lambda: client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json"),
+                        number=number,
+                        repeat=repeat,
+                    ),
+                    "view:check_guess[rate limited]": rate_limited,
+                    "view:guess_history": time_callable(history_uncached, number=number, repeat=repeat),
+                    "view:guess_history[cached]": time_callable(
+                        lambda: client.get(f"/api/games/{finished.id}/history/"), number=number, repeat=repeat
+                    ),
+                    "view:game_detail": time_callable(detail_uncached, number=number, repeat=repeat),
+                }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
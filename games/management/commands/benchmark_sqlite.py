@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection
+from django.test.utils import override_settings, setup_test_environment
+from rest_framework.test import APIClient
+
+from games.benchmarking import format_table, summarize, write_results
+from games.models import Game
+
+# Environment for each compared configuration; every run gets a fresh database file.
+PROFILES = {
+    "stock": {},
+    "concurrent": {"CODEBREAKER_SQLITE_PROFILE": "concurrent"},
+    "concurrent+writer": {"CODEBREAKER_SQLITE_PROFILE": "concurrent", "CODEBREAKER_SERIALIZED_WRITES": "1"},
+}
+GUESS_CONCURRENCY = ("locking", "optimistic")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare guess-write and read latency under thread contention for the stock SQLite settings, the "
+        "concurrent profile (WAL, tuned pragmas, IMMEDIATE transactions) and the profile plus the writer thread. "
+        "With --guess-concurrency, also compare the locking and optimistic guess paths on each profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent client threads.")
+        parser.add_argument("--games", type=int, default=4, help="Hot games the guesses are spread over.")
+        parser.add_argument("--guesses-per-thread", type=int, default=40)
+        parser.add_argument("--profile", choices=PROFILES, action="append", help="Run only these profiles.")
+        parser.add_argument(
+            "--guess-concurrency",
+            choices=GUESS_CONCURRENCY,
+            action="append",
+            help="GAMES_GUESS_CONCURRENCY modes to run on each profile (default: the configured one).",
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+        parser.add_argument("--workload", action="store_true", help="Internal: run one profile in this process.")
+
+    def handle(self, *args, **options):
+        if options["workload"]:
+            self.stdout.write(json.dumps(self._workload(options)))
+            return
+
+        config = {key: options[key] for key in ("threads", "games", "guesses_per_thread")}
+        modes = options["guess_concurrency"] or [None]
+        results = {}
+        for profile in options["profile"] or PROFILES:
+            for mode in modes:
+                label = profile if mode is None else f"{profile}+{mode}"
+                for operation, summary in self._run_profile(profile, {**config, "guess_concurrency": mode}).items():
+                    results[f"{label}:{operation}"] = summary
+
+        self.stdout.write(format_table(results))
+        if options["output"]:
+            write_results(options["output"], "sqlite-contention", {**config, "guess_concurrency": modes}, results)
+
+    def _run_profile(self, profile: str, config: dict) -> dict:
+        manage_py = str(Path(settings.BASE_DIR) / "manage.py")
+        arguments = [f"--{key.replace('_', '-')}={value}" for key, value in config.items() if value is not None]
+
+        with tempfile.TemporaryDirectory() as directory:
+            database = str(Path(directory) / "bench.sqlite3")
+            env = {**os.environ, **PROFILES[profile], "CODEBREAKER_SQLITE_PATH": database}
+            try:
+                subprocess.run([sys.executable, manage_py, "migrate", "-v0"], env=env, check=True)
+                completed = subprocess.run(
+                    [sys.executable, manage_py, "benchmark_sqlite", "--workload", *arguments],
+                    env=env,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                )
+            except subprocess.CalledProcessError as error:
+                raise CommandError(f"Profile {profile} failed: {error.stderr or error}") from error
+        return json.loads(completed.stdout)
+
+    def _workload(self, options: dict) -> dict:
+        setup_test_environment()
+        mode = (options["guess_concurrency"] or [getattr(settings, "GAMES_GUESS_CONCURRENCY", "locking")])[0]
+        with override_settings(GAMES_GUESS_CONCURRENCY=mode):
+            return self._contend(options)
+
+    def _contend(self, options: dict) -> dict:
+        game_ids = [Game.objects.create(code="1234", max_attempts=10**9).pk for _ in range(options["games"])]
+        connection.close()
+
+        samples: dict[str, list[float]] = {"guess": [], "read": []}
+        errors = {"guess": 0, "read": 0}
+        samples_lock = threading.Lock()
+        barrier = threading.Barrier(options["threads"])
+
+        def record(operation: str, started: float, ok: bool) -> None:
+            elapsed = time.perf_counter() - started
+            with samples_lock:
+                if ok:
+                    samples[operation].append(elapsed)
+                else:
+                    errors[operation] += 1
+
+        def worker() -> None:
+            client = APIClient()
+            barrier.wait()
+            try:
+                for _ in range(options["guesses_per_thread"]):
+                    game_id = random.choice(game_ids)
+                    started = time.perf_counter()
+                    try:
+                        response = client.post(f"/api/games/{game_id}/guess/", {"code": "5678"}, format="json")
+                        record("guess", started, response.status_code == 200)
+                    except DatabaseError:
+                        record("guess", started, False)
+
+                    started = time.perf_counter()
+                    try:
+                        response = client.get("/api/games/", {"limit": 20})
+                        record("read", started, response.status_code == 200)
+                    except DatabaseError:
+                        record("read", started, False)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            operation: summarize(latencies, elapsed, errors=errors[operation])
+            for operation, latencies in samples.items()
+        }
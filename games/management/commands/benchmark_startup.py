@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from games.benchmarking import format_table, write_results
+
+TARGETS = ("wsgi", "asgi")
+
+# Shared by both probes: import the application and send one GET through the bare WSGI/ASGI callable.
+_CLIENT = r"""
+import json, os, sys, time
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+def load(target):
+    return __import__(f"codebreaker.{target}", fromlist=["application"]).application
+
+def request(application, target, path):
+    authorization = f"Bearer {os.environ['CODEBREAKER_METRICS_TOKEN']}"
+    if target == "wsgi":
+        from io import BytesIO
+        from wsgiref.util import setup_testing_defaults
+
+        environ = {"PATH_INFO": path, "wsgi.input": BytesIO(), "HTTP_AUTHORIZATION": authorization}
+        setup_testing_defaults(environ)
+        statuses = []
+        b"".join(application(environ, lambda status, headers: statuses.append(status)))
+        return int(statuses[0].split()[0])
+
+    import asyncio
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"authorization", authorization.encode())], "server": ("localhost", 80), "client": ("127.0.0.1", 1),
+    }
+    messages, pending = [], [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if pending:
+            return pending.pop()
+        await asyncio.Event().wait()  # Never disconnect; the handler cancels this once it responds.
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(application(scope, receive, send))
+    return messages[0]["status"]
+"""
+
+# Runs in a fresh interpreter so nothing is imported yet: time the application import, then two
+# requests (the first one loads the URLconf and the views).
+PROBE = _CLIENT + r"""
+target, path = sys.argv[1], sys.argv[2]
+application, import_ms = timed(lambda: load(target))
+status, first_ms = timed(lambda: request(application, target, path))
+_, second_ms = timed(lambda: request(application, target, path))
+print(json.dumps({
+    "import_ms": import_ms,
+    "first_request_ms": first_ms,
+    "second_request_ms": second_ms,
+    "status": status,
+    "modules": len(sys.modules),
+    "docs_loaded": "drf_spectacular.openapi" in sys.modules,
+}))
+"""
+
+# Imports the application once (warming up with CODEBREAKER_WARMUP=1), forks `workers` children like
+# a pre-fork server, and has each report its first request and its memory from /proc after serving it.
+PREFORK_PROBE = _CLIENT + r"""
+target, path, workers = sys.argv[1], sys.argv[2], int(sys.argv[3])
+application = load(target)
+
+def memory_kb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return fields["Rss"], fields["Private_Clean"] + fields["Private_Dirty"]
+
+reports = []
+for _ in range(workers):
+    read_end, write_end = os.pipe()
+    if os.fork() == 0:
+        os.close(read_end)
+        status, first_ms = timed(lambda: request(application, target, path))
+        rss_kb, private_kb = memory_kb()
+        report = {"status": status, "first_request_ms": first_ms, "rss_kb": rss_kb, "private_kb": private_kb}
+        os.write(write_end, json.dumps(report).encode())
+        os._exit(0)
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        reports.append(json.loads(pipe.read()))
+    os.wait()
+print(json.dumps(reports))
+"""
+
+
+def _run(script: str, arguments: list[str], env: dict[str, str] | None):
+    target = arguments[0]
+    # The probes authenticate to the default path, /metrics, with this process's token or a throwaway one.
+    token = os.environ.get("CODEBREAKER_METRICS_TOKEN") or secrets.token_urlsafe()
+    completed = subprocess.run(
+        [sys.executable, "-c", script, *arguments],
+        cwd=settings.BASE_DIR,
+        env={
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "codebreaker.settings",
+            "CODEBREAKER_METRICS_TOKEN": token,
+            **(env or {}),
+        },
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        raise CommandError(f"{target} probe failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+
+def probe(target: str, path: str, env: dict[str, str] | None = None) -> dict:
+    """
+    Start one fresh interpreter for `target` and return its import and request timings.
+    """
+    return _run(PROBE, [target, path], env)
+
+
+def probe_prefork(target: str, path: str, workers: int, env: dict[str, str] | None = None) -> list[dict]:
+    """
+    Fork `workers` workers from one parent that imported `target`; returns one report per worker.
+
+    Linux only: memory is read from /proc/self/smaps_rollup. Workers run one after the other, so
+    their timings do not compete for the CPU.
+    """
+    return _run(PREFORK_PROBE, [target, path, str(workers)], env)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start of codebreaker.wsgi and codebreaker.asgi: application import time and the "
+        "latency of the first and second request, each run in a fresh interpreter. With --workers, also "
+        "fork that many workers from one parent, with and without warm-up, and report their first "
+        "request and resident memory."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per configuration.")
+        parser.add_argument("--path", default="/metrics", help="Path requested after the import.")
+        parser.add_argument("--target", choices=TARGETS, action="append", help="Run only these targets.")
+        parser.add_argument(
+            "--compare-docs",
+            action="store_true",
+            help="Also measure with the API docs disabled (CODEBREAKER_API_DOCS=0).",
+        )
+        parser.add_argument("--workers", type=int, default=0, help="Pre-forked workers to compare (Linux).")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        configurations = {"": {}}
+        if options["compare_docs"]:
+            configurations = {":docs on": {"CODEBREAKER_API_DOCS": "1"}, ":docs off": {"CODEBREAKER_API_DOCS": "0"}}
+
+        results = {}
+        for target in options["target"] or TARGETS:
+            for label, env in configurations.items():
+                runs = [probe(target, options["path"], env) for _ in range(options["runs"])]
+                results[f"{target}{label}"] = _medians(runs, "import_ms", "first_request_ms", "second_request_ms") | {
+                    "status": runs[0]["status"],
+                    "modules": runs[0]["modules"],
+                }
+            if options["workers"]:
+                for label, warm_up in (("cold", "0"), ("warm", "1")):
+                    reports = probe_prefork(target, options["path"], options["workers"], {"CODEBREAKER_WARMUP": warm_up})
+                    results[f"{target}:prefork {label}"] = _medians(reports, "first_request_ms") | {
+                        "rss_mb_median": round(statistics.median(report["rss_kb"] for report in reports) / 1024, 1),
+                        "private_mb_median": round(
+                            statistics.median(report["private_kb"] for report in reports) / 1024, 1
+                        ),
+                        "status": reports[0]["status"],
+                    }
+
+        self.stdout.write(format_table(results))
+        if options["output"]:
+            config = {key: options[key] for key in ("runs", "path", "compare_docs", "workers")}
+            write_results(options["output"], "startup", config, results)
+
+
+def _medians(runs: list[dict], *fields: str) -> dict[str, float]:
+    return {f"{field}_median": round(statistics.median(run[field] for run in runs), 1) for field in fields}
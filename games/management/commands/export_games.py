@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from games.export import export_lines, export_queryset
+from games.pagination import decode_cursor
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream games with their guesses as newline-delimited JSON, oldest first, archived games included. "
+        "Every line carries a cursor; pass the last one written back with --cursor to resume an interrupted export."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="File to write (appended to when resuming); defaults to stdout.")
+        parser.add_argument("--created-after", help="Only games created at or after this ISO 8601 datetime.")
+        parser.add_argument("--created-before", help="Only games created before this ISO 8601 datetime.")
+        solved = parser.add_mutually_exclusive_group()
+        solved.add_argument("--solved", action="store_true", help="Only solved games.")
+        solved.add_argument("--unsolved", action="store_true", help="Only unsolved games.")
+        parser.add_argument("--cursor", help="Resume after the game this cursor points at.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "GAMES_EXPORT_BATCH_SIZE", 500),
+            help="Games read per keyset batch.",
+        )
+
+    def handle(self, *args, **options):
+        if options["cursor"] is not None:
+            try:
+                decode_cursor(options["cursor"])
+            except ValueError as error:
+                raise CommandError(str(error)) from error
+
+        filters = {
+            "created_after": self._parse_datetime(options["created_after"], "--created-after"),
+            "created_before": self._parse_datetime(options["created_before"], "--created-before"),
+            "is_solved": True if options["solved"] else False if options["unsolved"] else None,
+        }
+        lines = export_lines(
+            export_queryset(**filters),
+            export_queryset(archived=True, **filters),
+            cursor=options["cursor"],
+            batch_size=options["batch_size"],
+        )
+
+        if options["output"] is None:
+            for chunk in lines:
+                sys.stdout.write(chunk)
+            return
+
+        mode = "a" if options["cursor"] else "w"
+        exported = 0
+        with open(options["output"], mode) as output:
+            for chunk in lines:
+                output.write(chunk)
+                exported += chunk.count("\n")
+        self.stderr.write(f"Exported {exported} games to {options['output']}.")
+
+    def _parse_datetime(self, value: str | None, option: str) -> datetime | None:
+        if value is None:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise CommandError(f"{option} must be an ISO 8601 datetime.")
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import secrets
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from games.benchmarking import format_table, summarize, write_results
+
+# (operation, latency in seconds, succeeded, X-Query-Count header value)
+Sample = tuple[str, float, bool, "int | None"]
+
+
+def _request(
+    base_url: str,
+    method: str,
+    path: str,
+    payload: dict | None,
+    timeout: float,
+) -> tuple[int, dict, int | None]:
+    body = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(
+        base_url.rstrip("/") + path,
+        data=body,
+        method=method,
+        headers={"Content-Type": "application/json", "Accept": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, headers, content = response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        status, headers, content = error.code, error.headers, error.read()
+
+    query_count = headers.get("X-Query-Count")
+    data = json.loads(content) if content else {}
+    return status, data, int(query_count) if query_count is not None else None
+
+
+def _random_code() -> str:
+    return f"{secrets.randbelow(10_000):04d}"
+
+
+def play_games(base_url: str, games: int, guesses: int, timeout: float) -> list[Sample]:
+    """
+    Create `games` games, submit up to `guesses` random guesses to each and fetch its history.
+    """
+    samples: list[Sample] = []
+
+    def timed(operation: str, method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+        started = time.perf_counter()
+        try:
+            status, data, queries = _request(base_url, method, path, payload, timeout)
+        except (OSError, ValueError):
+            samples.append((operation, time.perf_counter() - started, False, None))
+            return 0, {}
+        samples.append((operation, time.perf_counter() - started, status < 400 or status == 409, queries))
+        return status, data
+
+    for _ in range(games):
+        status, game = timed("create", "POST", "/api/games/", {"code": _random_code()})
+        if status != 201:
+            continue
+        for _ in range(guesses):
+            status, _ = timed("guess", "POST", f"/api/games/{game['id']}/guess/", {"code": _random_code()})
+            if status == 409:
+                break
+        timed("history", "GET", f"/api/games/{game['id']}/history/")
+
+    return samples
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive concurrent create/guess/history workloads against a running server and report latency "
+        "percentiles, throughput and queries per request (from the X-Query-Count header)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Server to load.")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent clients.")
+        parser.add_argument("--games-per-worker", type=int, default=10)
+        parser.add_argument("--guesses", type=int, default=10, help="Guesses submitted per game.")
+        parser.add_argument("--pool", choices=("thread", "process"), default="thread")
+        parser.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds.")
+        parser.add_argument("--output", help="Write the results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        config = {
+            key: options[key]
+            for key in ("base_url", "workers", "games_per_worker", "guesses", "pool", "timeout")
+        }
+        executor_class = ThreadPoolExecutor if options["pool"] == "thread" else ProcessPoolExecutor
+
+        started = time.perf_counter()
+        with executor_class(max_workers=options["workers"]) as executor:
+            futures = [
+                executor.submit(
+                    play_games,
+                    options["base_url"],
+                    options["games_per_worker"],
+                    options["guesses"],
+                    options["timeout"],
+                )
+                for _ in range(options["workers"])
+            ]
+            samples = [sample for future in futures for sample in future.result()]
+        elapsed = time.perf_counter() - started
+
+        by_operation: dict[str, list[Sample]] = defaultdict(list)
+        for sample in samples:
+            by_operation[sample[0]].append(sample)
+        by_operation["all"] = samples
+
+        results = {
+            operation: summarize(
+                [latency for _, latency, ok, _ in operation_samples if ok],
+                elapsed,
+                [queries for _, _, ok, queries in operation_samples if ok],
+                errors=sum(1 for _, _, ok, _ in operation_samples if not ok),
+            )
+            for operation, operation_samples in by_operation.items()
+        }
+
+        self.stdout.write(format_table(results))
+        if options["output"]:
+            write_results(options["output"], "load", config, results)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from games.provisioning import invalid_code_positions, provision_games
+
+
+class Command(BaseCommand):
+    help = "Create many games at once from explicit codes or server-generated secret codes, printing their IDs."
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument("--count", type=int, help="Number of games to create with generated codes.")
+        source.add_argument(
+            "--codes-file",
+            help="File with one 4-digit code per line, or '-' to read from standard input.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=getattr(settings, "GAMES_BULK_CHUNK_SIZE", 1000),
+            help="Games inserted per bulk_create call.",
+        )
+
+    def handle(self, *args, **options):
+        if options["count"] is not None:
+            if options["count"] < 1:
+                raise CommandError("--count must be positive.")
+            created = provision_games(count=options["count"], chunk_size=options["chunk_size"])
+        else:
+            codes = self._read_codes(options["codes_file"])
+            invalid = invalid_code_positions(codes)
+            if invalid:
+                lines = ", ".join(str(index + 1) for index in invalid[:20])
+                raise CommandError(f"Invalid codes on lines: {lines}")
+            created = provision_games(codes=codes, chunk_size=options["chunk_size"])
+
+        for chunk in created:
+            self.stdout.write("\n".join(str(game_id) for game_id in chunk))
+
+    def _read_codes(self, path: str) -> list[str]:
+        if path == "-":
+            return [line.strip() for line in sys.stdin if line.strip()]
+        try:
+            with open(path) as codes_file:
+                return [line.strip() for line in codes_file if line.strip()]
+        except OSError as error:
+            raise CommandError(f"Cannot read {path}: {error}") from error
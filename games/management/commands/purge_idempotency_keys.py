@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from games.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete durable Idempotency-Key records older than GAMES_IDEMPOTENCY_TTL."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Records deleted per query.")
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency records."))
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import OuterRef, QuerySet, Subquery
+
+from games.archive import restore_game
+from games.history import unpack_history
+from games.models import ArchivedGame, Game, GameGuess, StatBucket, StatCounter
+from games.stats import GAMES_CREATED, StatDeltas, lock_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the stats counter and histogram tables from the games and guesses, or verify that they match. "
+        "Stats writes, and so game creation and guesses, wait while it runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Games read per query.")
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare the stored stats with a fresh computation without writing anything.",
+        )
+
+    def handle(self, *args, **options):
+        # Counting and replacing happen in one transaction that holds off every stats writer, so a game
+        # or guess recorded meanwhile is either in the snapshot or counted on top of it after the commit.
+        with transaction.atomic():
+            lock_stats()
+            expected = self._compute(options["chunk_size"])
+            if not options["verify"]:
+                StatCounter.objects.all().delete()
+                StatBucket.objects.all().delete()
+                StatCounter.objects.bulk_create(
+                    [StatCounter(name=name, value=value) for name, value in expected.counters.items()]
+                )
+                StatBucket.objects.bulk_create(
+                    [
+                        StatBucket(histogram=histogram, bucket=bucket, count=count)
+                        for (histogram, bucket), count in expected.buckets.items()
+                    ],
+                    batch_size=options["chunk_size"],
+                )
+            mismatches = self._compare(expected)
+
+        for mismatch in mismatches:
+            self.stderr.write(mismatch)
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} stats rows do not match the games and guesses.")
+
+        games = expected.counters[GAMES_CREATED]
+        verb = "Verified" if options["verify"] else "Rebuilt"
+        self.stdout.write(self.style.SUCCESS(f"{verb} stats for {games} games."))
+
+    def _compute(self, chunk_size: int) -> StatDeltas:
+        first_guess = GameGuess.objects.filter(game=OuterRef("pk")).order_by("created_at", "id").values("guess")[:1]
+        games = (
+            Game.objects.only("id", "challenge_id", "attempts_used", "max_attempts", "is_solved")
+            .annotate(first_guess=Subquery(first_guess))
+            .order_by("pk")
+        )
+
+        deltas = StatDeltas()
+        deltas.counters[GAMES_CREATED] = 0
+        for chunk in _keyset_chunks(games, chunk_size):
+            for game in chunk:
+                deltas.add_game(game, game.first_guess)
+
+        for chunk in _keyset_chunks(ArchivedGame.objects.order_by("pk"), chunk_size):
+            for archived in chunk:
+                game = restore_game(archived)
+                history = unpack_history(game)
+                deltas.add_game(game, history[0].guess if history else None)
+        return deltas
+
+    def _compare(self, expected: StatDeltas) -> list[str]:
+        stored_counters = dict(StatCounter.objects.values_list("name", "value"))
+        stored_buckets = {
+            (histogram, bucket): count
+            for histogram, bucket, count in StatBucket.objects.values_list("histogram", "bucket", "count")
+        }
+
+        mismatches = []
+        for name in expected.counters.keys() | stored_counters.keys():
+            if expected.counters[name] != stored_counters.get(name, 0):
+                mismatches.append(f"{name}: stored {stored_counters.get(name, 0)}, expected {expected.counters[name]}")
+        for key in expected.buckets.keys() | stored_buckets.keys():
+            if expected.buckets[key] != stored_buckets.get(key, 0):
+                histogram, bucket = key
+                mismatches.append(
+                    f"{histogram}[{bucket}]: stored {stored_buckets.get(key, 0)}, expected {expected.buckets[key]}"
+                )
+        return sorted(mismatches)
+
+
+def _keyset_chunks(queryset: QuerySet, chunk_size: int) -> Iterator[list]:
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1].pk
+        yield chunk
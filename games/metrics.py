@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Iterator
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+
+
+class Histogram:
+    """
+    Thread-safe, in-process histogram rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...], label: str = "view"):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.label = label
+        self._series: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value: str, value: float) -> None:
+        # Layout per series: one slot per bucket, then +Inf, then the running sum.
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {label_value: series[:] for label_value, series in self._series.items()}
+        for label_value, series in sorted(snapshot.items()):
+            labels = f'{self.label}="{label_value}"'
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]:g}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative:g}")
+        return lines
+
+
+VIEW_SECONDS = Histogram("codebreaker_view_seconds", "Total time spent handling a request.", SECONDS_BUCKETS)
+SQL_SECONDS = Histogram("codebreaker_sql_seconds", "Time spent executing SQL per request.", SECONDS_BUCKETS)
+SQL_QUERIES = Histogram("codebreaker_sql_queries", "SQL queries executed per request.", COUNT_BUCKETS)
+SCORING_SECONDS = Histogram("codebreaker_scoring_seconds", "Time spent scoring guesses per request.", SECONDS_BUCKETS)
+SERIALIZATION_SECONDS = Histogram(
+    "codebreaker_serialization_seconds", "Time spent serializing responses per request.", SECONDS_BUCKETS
+)
+LOCK_WAIT_SECONDS = Histogram(
+    "codebreaker_lock_wait_seconds", "Time spent acquiring the game row lock per request.", SECONDS_BUCKETS
+)
+
+HISTOGRAMS = (VIEW_SECONDS, SQL_SECONDS, SQL_QUERIES, SCORING_SECONDS, SERIALIZATION_SECONDS, LOCK_WAIT_SECONDS)
+_PHASE_HISTOGRAMS = {
+    "scoring": SCORING_SECONDS,
+    "serialization": SERIALIZATION_SECONDS,
+    "lock_wait": LOCK_WAIT_SECONDS,
+}
+
+
+class RequestTimings:
+    __slots__ = ("sql_seconds", "queries", "phases")
+
+    def __init__(self) -> None:
+        self.sql_seconds = 0.0
+        self.queries = 0
+        self.phases: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+
+
+_current_timings: ContextVar[RequestTimings | None] = ContextVar("games_request_timings", default=None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Attribute the enclosed block to `phase` of the current request; a no-op for unsampled requests.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def _add_execute_wrapper(wrapper: Callable) -> None:
+    connection.execute_wrappers.append(wrapper)
+
+
+def _remove_execute_wrapper(wrapper: Callable) -> None:
+    connection.execute_wrappers.remove(wrapper)
+
+
+@asynccontextmanager
+async def async_execute_wrapper(wrapper: Callable) -> AsyncIterator[None]:
+    """
+    `connection.execute_wrapper` for async middleware.
+
+    Connections are per thread, and under ASGI the sync views query from the request's sync thread,
+    so the wrapper is installed there rather than on the event loop thread's connection.
+    """
+    await sync_to_async(_add_execute_wrapper)(wrapper)
+    try:
+        yield
+    finally:
+        await sync_to_async(_remove_execute_wrapper)(wrapper)
+
+
+def _sampled() -> bool:
+    sample_rate = getattr(settings, "GAMES_METRICS_SAMPLE_RATE", 0.0)
+    return sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate)
+
+
+class MetricsMiddleware:
+    """
+    Time a sample of requests and record them into the in-process histograms served at `/metrics`.
+
+    `GAMES_METRICS_SAMPLE_RATE` is the fraction of requests measured; unsampled requests skip the SQL
+    wrapper and timing hooks entirely. Runs natively under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not _sampled():
+            return self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timings):
+                response = self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        self._record(request, timings, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        if not _sampled():
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        started = time.perf_counter()
+        try:
+            async with async_execute_wrapper(timings):
+                response = await self.get_response(request)
+        finally:
+            _current_timings.reset(token)
+        self._record(request, timings, time.perf_counter() - started)
+        return response
+
+    def _record(self, request, timings: RequestTimings, elapsed: float) -> None:
+        match = request.resolver_match
+        view = match.url_name if match is not None and match.url_name else "unmatched"
+        if view != "metrics":
+            VIEW_SECONDS.observe(view, elapsed)
+            SQL_SECONDS.observe(view, timings.sql_seconds)
+            SQL_QUERIES.observe(view, timings.queries)
+            for phase, seconds in timings.phases.items():
+                _PHASE_HISTOGRAMS[phase].observe(view, seconds)
+
+
+def render_metrics() -> str:
+    return "\n".join(line for histogram in HISTOGRAMS for line in histogram.render()) + "\n"
+
+
+def _metrics_allowed(request) -> bool:
+    token = getattr(settings, "GAMES_METRICS_TOKEN", None)
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if token and scheme.lower() == "bearer" and constant_time_compare(credentials.strip(), token):
+        return True
+    user = getattr(request, "user", None)
+    return user is not None and user.is_staff
+
+
+def metrics_view(request) -> HttpResponse:
+    """
+    Serve the histograms to staff users and to scrapers sending `Authorization: Bearer <GAMES_METRICS_TOKEN>`.
+    """
+    if not _metrics_allowed(request):
+        return HttpResponseForbidden("Metrics require a staff session or the metrics token.", content_type="text/plain")
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+from .metrics import async_execute_wrapper
+
+
+class QueryCounter:
+    __slots__ = ("executed",)
+
+    def __init__(self) -> None:
+        self.executed = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.executed += 1
+        return execute(sql, params, many, context)
+
+
+class QueryCountMiddleware:
+    """
+    Report the number of SQL queries a request ran in an `X-Query-Count` response header.
+
+    Enabled by `GAMES_QUERY_COUNT_HEADER` so `manage.py loadtest` can report queries per request.
+    Runs natively under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not getattr(settings, "GAMES_QUERY_COUNT_HEADER", False):
+            return self.get_response(request)
+
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        response["X-Query-Count"] = str(counter.executed)
+        return response
+
+    async def __acall__(self, request):
+        if not getattr(settings, "GAMES_QUERY_COUNT_HEADER", False):
+            return await self.get_response(request)
+
+        counter = QueryCounter()
+        async with async_execute_wrapper(counter):
+            response = await self.get_response(request)
+        response["X-Query-Count"] = str(counter.executed)
+        return response
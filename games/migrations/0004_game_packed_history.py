@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("games", "0003_alter_game_code_alter_game_created_at_and_more"),
+    ]
+
+    operations = [
+        # Existing games start as NULL (not packed yet) so the history join stays authoritative for
+        # them until `manage.py backfill_packed_history` runs; new games start with an empty history.
+        migrations.AddField(
+            model_name="game",
+            name="packed_history",
+            field=models.BinaryField(null=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name="game",
+            name="packed_history",
+            field=models.BinaryField(null=True, default=b"", editable=False),
+        ),
+    ]
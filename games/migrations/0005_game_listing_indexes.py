@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_game_packed_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-created_at', '-id'], name='game_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(condition=models.Q(('is_solved', False)), fields=['-created_at', '-id'], name='game_unsolved_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gameguess',
+            index=models.Index(fields=['game', 'created_at'], name='gameguess_game_created_idx'),
+        ),
+    ]
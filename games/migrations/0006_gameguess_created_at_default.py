@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:14
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_game_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='gameguess',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:20
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_stats_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=4)),
+                ('attempts_used', models.PositiveIntegerField()),
+                ('max_attempts', models.PositiveIntegerField()),
+                ('is_solved', models.BooleanField()),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('history', models.BinaryField()),
+            ],
+        ),
+    ]
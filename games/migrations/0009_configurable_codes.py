@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:23
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_archivedgame'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedgame',
+            name='alphabet_size',
+            field=models.PositiveSmallIntegerField(default=10),
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='code_length',
+            field=models.PositiveSmallIntegerField(default=4),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='alphabet_size',
+            field=models.PositiveSmallIntegerField(default=10, validators=[django.core.validators.MinValueValidator(2), django.core.validators.MaxValueValidator(36)]),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='code_length',
+            field=models.PositiveSmallIntegerField(default=4, validators=[django.core.validators.MinValueValidator(4), django.core.validators.MaxValueValidator(12)]),
+        ),
+        migrations.AlterField(
+            model_name='archivedgame',
+            name='code',
+            field=models.CharField(max_length=12),
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='code',
+            field=models.CharField(max_length=12, validators=[django.core.validators.RegexValidator(message='Value must be 4 to 12 symbols from 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.', regex='^[0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ]{4,12}$')]),
+        ),
+        migrations.AlterField(
+            model_name='gameguess',
+            name='guess',
+            field=models.CharField(max_length=12, validators=[django.core.validators.RegexValidator(message='Value must be 4 to 12 symbols from 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.', regex='^[0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ]{4,12}$')]),
+        ),
+    ]
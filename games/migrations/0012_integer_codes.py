@@ -0,0 +1,122 @@
+from bisect import bisect_right
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+import games.fields
+
+CODE_VALIDATOR = django.core.validators.RegexValidator(
+    message='Value must be 4 to 12 symbols from 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.',
+    regex='^[0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ]{4,12}$',
+)
+CHUNK_SIZE = 2000
+SYMBOLS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# The numbering this migration stored, frozen here: 0015_classic_code_values renumbers classic codes.
+LENGTH_OFFSETS = [sum(36**length for length in range(n)) for n in range(14)]
+
+
+def code_to_value(code):
+    return LENGTH_OFFSETS[len(code)] + int(code, 36)
+
+
+def value_to_code(value):
+    length = bisect_right(LENGTH_OFFSETS, value) - 1
+    index = value - LENGTH_OFFSETS[length]
+    symbols = []
+    for _ in range(length):
+        index, symbol = divmod(index, 36)
+        symbols.append(SYMBOLS[symbol])
+    return ''.join(reversed(symbols))
+
+
+def _copy(model, source, target, convert):
+    # `source` is a field name or, for the integer columns, a cast that reads the raw value: neither
+    # direction may go through CodeField, whose numbering is the current one.
+    last_pk = 0
+    while True:
+        rows = list(model.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', source)[:CHUNK_SIZE])
+        if not rows:
+            return
+        model.objects.bulk_update([model(pk=pk, **{target: convert(value)}) for pk, value in rows], [target])
+        last_pk = rows[-1][0]
+
+
+def codes_to_integers(apps, schema_editor):
+    _copy(apps.get_model('games', 'Game'), 'code', 'code_value', code_to_value)
+    _copy(apps.get_model('games', 'GameGuess'), 'guess', 'guess_value', code_to_value)
+
+
+def integers_to_codes(apps, schema_editor):
+    raw = models.BigIntegerField()
+    _copy(apps.get_model('games', 'Game'), Cast('code_value', raw), 'code', value_to_code)
+    _copy(apps.get_model('games', 'GameGuess'), Cast('guess_value', raw), 'guess', value_to_code)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_game_code_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='game',
+            name='game_code_idx',
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='code_value',
+            field=games.fields.CodeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='gameguess',
+            name='guess_value',
+            field=games.fields.CodeField(null=True),
+        ),
+        # Nullable while both columns exist, so that unapplying the RemoveFields below can re-add
+        # the text columns before integers_to_codes fills them.
+        migrations.AlterField(
+            model_name='game',
+            name='code',
+            field=models.CharField(max_length=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='gameguess',
+            name='guess',
+            field=models.CharField(max_length=12, null=True),
+        ),
+        migrations.RunPython(codes_to_integers, integers_to_codes),
+        migrations.RemoveField(
+            model_name='game',
+            name='code',
+        ),
+        migrations.RemoveField(
+            model_name='gameguess',
+            name='guess',
+        ),
+        migrations.RenameField(
+            model_name='game',
+            old_name='code_value',
+            new_name='code',
+        ),
+        migrations.RenameField(
+            model_name='gameguess',
+            old_name='guess_value',
+            new_name='guess',
+        ),
+        migrations.AlterField(
+            model_name='game',
+            name='code',
+            field=games.fields.CodeField(validators=[CODE_VALIDATOR]),
+        ),
+        migrations.AlterField(
+            model_name='gameguess',
+            name='guess',
+            field=games.fields.CodeField(validators=[CODE_VALIDATOR]),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['code'], name='game_code_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:45
+
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import games.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_integer_codes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Challenge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(default=django.utils.timezone.localdate, unique=True)),
+                ('code', games.fields.CodeField(validators=[django.core.validators.RegexValidator(message='Value must be 4 to 12 symbols from 0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ.', regex='^[0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ]{4,12}$')])),
+                ('code_length', models.PositiveSmallIntegerField(default=4)),
+                ('alphabet_size', models.PositiveSmallIntegerField(default=10)),
+                ('max_attempts', models.PositiveIntegerField(default=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archivedgame',
+            name='challenge_id',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='challenge',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='games', to='games.challenge'),
+        ),
+        migrations.CreateModel(
+            name='ChallengeResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('game_id', models.BigIntegerField(unique=True)),
+                ('attempts', models.PositiveIntegerField()),
+                ('solved_at', models.DateTimeField()),
+                ('challenge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='games.challenge')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['challenge', 'attempts', 'solved_at', 'game_id'], name='challengeresult_rank_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0013_challenges'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='idempotencyrecord',
+            name='idempotencyrecord_scope_key_uniq',
+        ),
+        migrations.AddField(
+            model_name='idempotencyrecord',
+            name='client',
+            field=models.CharField(default='', max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='idempotencyrecord',
+            constraint=models.UniqueConstraint(fields=('scope', 'client', 'key'), name='idempotencyrecord_scope_client_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from bisect import bisect_right
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+CHUNK_SIZE = 2000
+CODE_SPACE = 10**4
+# The numbering of 0012_integer_codes: every code is the offset of its length plus its base-36 value.
+LENGTH_OFFSETS = [sum(36**length for length in range(n)) for n in range(14)]
+
+
+def _base36_digits(value):
+    length = bisect_right(LENGTH_OFFSETS, value) - 1
+    index = value - LENGTH_OFFSETS[length]
+    return [index // 36**power % 36 for power in reversed(range(length))]
+
+
+def to_classic_values(value):
+    # Classic codes become their feedback-table index; everything else moves up past them.
+    digits = _base36_digits(value)
+    if len(digits) == 4 and max(digits) < 10:
+        return int(''.join(map(str, digits)))
+    return CODE_SPACE + value
+
+
+def from_classic_values(value):
+    if value < CODE_SPACE:
+        return LENGTH_OFFSETS[4] + int(f'{value:04d}', 36)
+    return value - CODE_SPACE
+
+
+def _renumber(model, field, convert):
+    # Reads the raw integers through a cast, as CodeField would decode them with the current numbering.
+    last_pk = 0
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list('pk', Cast(field, models.BigIntegerField()))[:CHUNK_SIZE]
+        )
+        if not rows:
+            return
+        model.objects.bulk_update([model(pk=pk, **{field: convert(value)}) for pk, value in rows], [field])
+        last_pk = rows[-1][0]
+
+
+def _renumber_all(apps, convert):
+    _renumber(apps.get_model('games', 'Challenge'), 'code', convert)
+    _renumber(apps.get_model('games', 'Game'), 'code', convert)
+    _renumber(apps.get_model('games', 'GameGuess'), 'guess', convert)
+
+
+def forwards(apps, schema_editor):
+    _renumber_all(apps, to_classic_values)
+
+
+def backwards(apps, schema_editor):
+    _renumber_all(apps, from_classic_values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0014_idempotency_client'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
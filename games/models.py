@@ -1,19 +1,98 @@
-from django.core.validators import RegexValidator
+from functools import lru_cache
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 from django.db import models
 from django.utils import timezone
 
-FOUR_DIGIT_VALIDATOR = RegexValidator(regex=r"^\d{4}$", message="Value must be exactly 4 digits.")
+from .fields import CodeField
+from .services import (
+    ALPHABET_SIZE,
+    CODE_LENGTH,
+    MAX_ALPHABET_SIZE,
+    MAX_CODE_LENGTH,
+    MIN_ALPHABET_SIZE,
+    MIN_CODE_LENGTH,
+    SYMBOLS,
+    GuessEvaluation,
+    code_to_index,
+    feedback_row,
+    score_guess,
+    unpack_score,
+)
+
+
+@lru_cache(maxsize=None)
+def code_validator(code_length: int = CODE_LENGTH, alphabet_size: int = ALPHABET_SIZE) -> RegexValidator:
+    """
+    Validator accepting exactly `code_length` symbols from the first `alphabet_size` of `SYMBOLS`.
+    """
+    if alphabet_size == ALPHABET_SIZE:
+        message = f"Value must be exactly {code_length} digits."
+    else:
+        message = f"Value must be exactly {code_length} symbols from {SYMBOLS[:alphabet_size]}."
+    return RegexValidator(regex=rf"^[{SYMBOLS[:alphabet_size]}]{{{code_length}}}$", message=message)
+
+
+FOUR_DIGIT_VALIDATOR = code_validator()
+# Column-level check shared by every configuration; per-game checks use `Game.code_validator`.
+CODE_VALIDATOR = RegexValidator(
+    regex=rf"^[{SYMBOLS}]{{{MIN_CODE_LENGTH},{MAX_CODE_LENGTH}}}$",
+    message=f"Value must be {MIN_CODE_LENGTH} to {MAX_CODE_LENGTH} symbols from {SYMBOLS}.",
+)
+
+
+class Challenge(models.Model):
+    """
+    A shared-secret event, such as a daily code: every game created for it plays the same code.
+    """
+
+    date = models.DateField(unique=True, default=timezone.localdate)
+    code = CodeField(validators=[CODE_VALIDATOR])
+    code_length = models.PositiveSmallIntegerField(default=CODE_LENGTH)
+    alphabet_size = models.PositiveSmallIntegerField(default=ALPHABET_SIZE)
+    max_attempts = models.PositiveIntegerField(default=10)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"Challenge {self.date}"
 
 
 class Game(models.Model):
-    code = models.CharField(
-        max_length=4,
-        validators=[FOUR_DIGIT_VALIDATOR],
+    challenge = models.ForeignKey(
+        Challenge,
+        related_name="games",
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+    )
+    code = CodeField(validators=[CODE_VALIDATOR])
+    code_length = models.PositiveSmallIntegerField(
+        default=CODE_LENGTH,
+        validators=[MinValueValidator(MIN_CODE_LENGTH), MaxValueValidator(MAX_CODE_LENGTH)],
+    )
+    alphabet_size = models.PositiveSmallIntegerField(
+        default=ALPHABET_SIZE,
+        validators=[MinValueValidator(MIN_ALPHABET_SIZE), MaxValueValidator(MAX_ALPHABET_SIZE)],
     )
     attempts_used = models.PositiveIntegerField(default=0)
     max_attempts = models.PositiveIntegerField(default=10)
     is_solved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized copy of the guess history (see games.history); NULL until packed or after it went stale.
+    packed_history = models.BinaryField(null=True, default=b"", editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="game_created_id_idx"),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="game_unsolved_created_id_idx",
+                condition=models.Q(is_solved=False),
+            ),
+            # Exact-match lookups from the admin search.
+            models.Index(fields=["code"], name="game_code_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Game #{self.pk} ({self.code})"
@@ -22,19 +101,147 @@ class Game(models.Model):
     def remaining_attempts(self) -> int:
         return max(self.max_attempts - self.attempts_used, 0)
 
+    @property
+    def code_validator(self) -> RegexValidator:
+        return code_validator(self.code_length, self.alphabet_size)
+
+    @property
+    def is_classic(self) -> bool:
+        return self.code_length == CODE_LENGTH and self.alphabet_size == ALPHABET_SIZE
+
+    def score(self, guess: str) -> GuessEvaluation:
+        """
+        Score `guess` against this game's code; challenge games look it up in their code's feedback row.
+        """
+        if self.challenge_id is not None:
+            row = feedback_row(self.code, self.alphabet_size)
+            if row is not None:
+                return unpack_score(row[code_to_index(guess, self.alphabet_size)])
+        return score_guess(guess, self.code)
+
+    def clean(self) -> None:
+        super().clean()
+        if self.code:
+            try:
+                self.code_validator(self.code)
+            except ValidationError as error:
+                raise ValidationError({"code": error.messages}) from error
+
+
 class GameGuess(models.Model):
     game = models.ForeignKey(Game, related_name="guesses", on_delete=models.CASCADE)
-    guess = models.CharField(
-        max_length=4,
-        validators=[FOUR_DIGIT_VALIDATOR],
-    )
+    guess = CodeField(validators=[CODE_VALIDATOR])
     well_placed = models.PositiveSmallIntegerField()
     misplaced = models.PositiveSmallIntegerField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so write-behind flushes can keep the time the guess was accepted.
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["game", "created_at"], name="gameguess_game_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Guess {self.guess} for Game #{self.game_id}"
 
+
+class ChallengeResult(models.Model):
+    """
+    A solved challenge game, written with its solving guess; the leaderboard reads it in index order.
+
+    `game_id` is not a foreign key so results outlive the games when they are archived.
+    """
+
+    challenge = models.ForeignKey(Challenge, related_name="results", on_delete=models.CASCADE)
+    game_id = models.BigIntegerField(unique=True)
+    attempts = models.PositiveIntegerField()
+    solved_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["challenge", "attempts", "solved_at", "game_id"], name="challengeresult_rank_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Game #{self.game_id} solved {self.challenge} in {self.attempts}"
+
+
+class StatCounter(models.Model):
+    """
+    Named running total maintained by games.stats alongside the writes it counts.
+    """
+
+    name = models.CharField(max_length=64, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.name} = {self.value}"
+
+
+class StatBucket(models.Model):
+    """
+    One bucket of a named histogram maintained by games.stats.
+    """
+
+    histogram = models.CharField(max_length=64)
+    bucket = models.CharField(max_length=32)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["histogram", "bucket"], name="statbucket_histogram_bucket_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.histogram}[{self.bucket}] = {self.count}"
+
+
+class ArchivedGame(models.Model):
+    """
+    Compact, read-only copy of a finished game moved out of `Game` by `manage.py archive_games`.
+
+    The primary key is the original game ID, so lookups by ID are served from the primary key index.
+    `history` is the game's guesses in the games.history packed format, zlib-compressed.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    challenge_id = models.BigIntegerField(null=True)
+    code = models.CharField(max_length=MAX_CODE_LENGTH)
+    code_length = models.PositiveSmallIntegerField(default=CODE_LENGTH)
+    alphabet_size = models.PositiveSmallIntegerField(default=ALPHABET_SIZE)
+    attempts_used = models.PositiveIntegerField()
+    max_attempts = models.PositiveIntegerField()
+    is_solved = models.BooleanField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    history = models.BinaryField()
+
+    def __str__(self) -> str:
+        return f"Archived game #{self.pk} ({self.code})"
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Durable record of an `Idempotency-Key` request, written in the same transaction as the request's
+    own writes; `status_code` is only NULL inside that transaction.
+    """
+
+    scope = models.CharField(max_length=64)
+    client = models.CharField(max_length=255, default="")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "client", "key"], name="idempotencyrecord_scope_client_key_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"], name="idempotencyrecord_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope} {self.key}"
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q, QuerySet
+
+
+def encode_cursor(created_at: datetime, pk: int) -> str:
+    raw = f"{created_at.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`; raises `ValueError` for anything malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split("|")
+        return datetime.fromisoformat(created_at), int(pk)
+    except (ValueError, UnicodeDecodeError) as error:
+        raise ValueError("Invalid cursor.") from error
+
+
+def keyset_page(queryset: QuerySet, cursor: str | None, *, descending: bool = True) -> QuerySet:
+    """
+    Order `queryset` by `(created_at, id)` and keep only rows past `cursor`.
+    """
+    if descending:
+        queryset = queryset.order_by("-created_at", "-id")
+    else:
+        queryset = queryset.order_by("created_at", "id")
+
+    if cursor is None:
+        return queryset
+
+    created_at, pk = decode_cursor(cursor)
+    if descending:
+        return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    return queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
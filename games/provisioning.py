@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import secrets
+from typing import Iterator, Sequence
+
+import numpy as np
+from django.db import transaction
+
+from .models import Game
+from .services import CODE_LENGTH, CODE_SPACE, index_to_code
+from .stats import record_games_created
+
+_ZERO = ord("0")
+_NINE = ord("9")
+_PLACE_VALUES = 10 ** np.arange(CODE_LENGTH - 1, -1, -1)
+
+# Largest multiple of CODE_SPACE below 2**16; 16-bit draws at or above it are rejected to avoid modulo bias.
+_UNBIASED_LIMIT = (2**16 // CODE_SPACE) * CODE_SPACE
+
+
+def generate_codes(count: int) -> np.ndarray:
+    """
+    Draw `count` uniformly distributed code indices from the operating system's CSPRNG.
+    """
+    codes = np.empty(0, dtype=np.uint16)
+    while codes.size < count:
+        missing = count - codes.size
+        # Roughly 8% of draws are rejected, so oversample slightly to usually finish in one pass.
+        draws = np.frombuffer(secrets.token_bytes(2 * (missing + missing // 8 + 8)), dtype=np.uint16)
+        codes = np.concatenate([codes, draws[draws < _UNBIASED_LIMIT] % CODE_SPACE])
+    return codes[:count]
+
+
+def invalid_code_positions(codes: Sequence[str]) -> list[int]:
+    """
+    Return the positions of entries that are not exactly 4 ASCII digits, checking all codes at once.
+    """
+    if not codes:
+        return []
+
+    array = np.asarray(codes, dtype=str)
+    valid = np.char.str_len(array) == CODE_LENGTH
+    chars = array.astype(f"<U{CODE_LENGTH}").view(np.uint32).reshape(-1, CODE_LENGTH)
+    valid &= ((chars >= _ZERO) & (chars <= _NINE)).all(axis=1)
+    return np.flatnonzero(~valid).tolist()
+
+
+def codes_to_indices(codes: Sequence[str]) -> np.ndarray:
+    """
+    Convert already validated 4-digit strings into code indices.
+    """
+    chars = np.asarray(codes, dtype=f"<U{CODE_LENGTH}").view(np.uint32).reshape(-1, CODE_LENGTH)
+    return (chars - _ZERO) @ _PLACE_VALUES
+
+
+def _chunks(codes: np.ndarray | None, count: int, chunk_size: int) -> Iterator[np.ndarray]:
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        yield generate_codes(size) if codes is None else codes[start : start + size]
+
+
+def provision_games(
+    *,
+    codes: Sequence[str] | None = None,
+    count: int | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[list[int]]:
+    """
+    Create games from explicit, pre-validated `codes` or from `count` generated codes.
+
+    Games are inserted with one `bulk_create` per chunk, each in its own transaction, and the created
+    IDs are yielded chunk by chunk so callers can stream them without holding the whole batch.
+    """
+    if (codes is None) == (count is None):
+        raise ValueError("Pass exactly one of codes or count.")
+
+    indices = None if codes is None else codes_to_indices(codes)
+    total = len(indices) if indices is not None else count
+
+    for chunk in _chunks(indices, total, chunk_size):
+        with transaction.atomic():
+            games = Game.objects.bulk_create([Game(code=index_to_code(int(index))) for index in chunk])
+            record_games_created(len(games))
+        yield [game.pk for game in games]
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import lru_cache
+from typing import TypedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework.throttling import BaseThrottle
+
+
+class RateLimit(TypedDict):
+    burst: int
+    per_second: float
+
+
+class TokenBucketBackend:
+    """
+    Interface for token-bucket state shared by the throttles below.
+
+    `take` must check and spend a token as one atomic step. A cross-process backend implements it as
+    a single round trip (for example a short Redis script over the same arithmetic as
+    `LocalTokenBuckets`); several cache calls per request would cost more than the check is worth.
+    """
+
+    def take(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        """
+        Spend `cost` tokens from `key`'s bucket; returns 0 if they were available, else seconds until they are.
+        """
+        raise NotImplementedError
+
+
+class LocalTokenBuckets(TokenBucketBackend):
+    """
+    Buckets in this process's memory, each stored as the single time at which it will be full again.
+
+    That is the generic cell rate algorithm form of a token bucket: a request is allowed while the
+    bucket is no more than `burst - 1` refill intervals from full. Buckets that have refilled are
+    equivalent to absent ones and are swept out as the table grows.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._full_at: dict[str, float] = {}
+        self._sweep_at = 1024
+
+    def take(self, key: str, limit: RateLimit, cost: int = 1) -> float:
+        interval = 1.0 / limit["per_second"]
+        now = time.monotonic()
+        with self._lock:
+            full_at = max(self._full_at.get(key, now), now)
+            available_at = full_at - (limit["burst"] - cost) * interval
+            if available_at > now:
+                return available_at - now
+            self._full_at[key] = full_at + cost * interval
+            if len(self._full_at) >= self._sweep_at:
+                self._sweep(now)
+        return 0.0
+
+    def _sweep(self, now: float) -> None:
+        self._full_at = {key: full_at for key, full_at in self._full_at.items() if full_at > now}
+        self._sweep_at = max(1024, 2 * len(self._full_at))
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> TokenBucketBackend:
+    return import_string(getattr(settings, "GAMES_RATE_LIMIT_BACKEND", "games.ratelimit.LocalTokenBuckets"))()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    DRF throttle over `GAMES_RATE_LIMITS[scope]`; scopes missing from the setting are not limited.
+
+    Refused requests get DRF's 429 response with a `Retry-After` header.
+    """
+
+    scope = ""
+    methods = frozenset({"POST"})
+
+    def allow_request(self, request, view) -> bool:
+        if request.method not in self.methods:
+            return True
+        limit = getattr(settings, "GAMES_RATE_LIMITS", {}).get(self.scope)
+        if limit is None:
+            return True
+        self.retry_after = get_backend().take(
+            f"{self.scope}:{self.get_key(request, view)}", limit, self.get_cost(request)
+        )
+        return not self.retry_after
+
+    def get_key(self, request, view) -> str:
+        return self.get_ident(request)
+
+    def get_cost(self, request) -> int:
+        return 1
+
+    def wait(self) -> float:
+        return self.retry_after
+
+
+class CreateRateThrottle(TokenBucketThrottle):
+    scope = "create"
+
+
+class BulkCreateRateThrottle(TokenBucketThrottle):
+    """
+    Bulk provisioning, charged one token per game requested so that large requests drain the bucket
+    accordingly; a request for more games than `burst` is always refused.
+    """
+
+    scope = "bulk_create"
+
+    def get_cost(self, request) -> int:
+        # Malformed bodies are charged one token and rejected by the view's serializer.
+        data = request.data
+        codes, count = data.get("codes"), data.get("count")
+        if isinstance(codes, list):
+            return max(len(codes), 1)
+        try:
+            return max(int(count), 1)
+        except (TypeError, ValueError):
+            return 1
+
+
+class GuessRateThrottle(TokenBucketThrottle):
+    scope = "guess"
+
+
+class GameGuessRateThrottle(TokenBucketThrottle):
+    """
+    Guesses by one client on one game, so a bot working through a single game is slowed well before
+    the client-wide limit.
+    """
+
+    scope = "game_guess"
+
+    def get_key(self, request, view) -> str:
+        return f"{self.get_ident(request)}:{view.kwargs['game_id']}"
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.compat import LONG_SEPARATORS, SHORT_SEPARATORS
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Drop-in `JSONRenderer` that encodes plain JSON data with one reusable C encoder.
+
+    Output is byte-identical to `JSONRenderer`. Data needing DRF's encoder (dates, decimals, lazy
+    strings) or an indented rendering falls back to the parent implementation.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._encoder = json.JSONEncoder(
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=SHORT_SEPARATORS if self.compact else LONG_SEPARATORS,
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = self._encoder.encode(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
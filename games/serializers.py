@@ -1,19 +1,136 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Callable
+
+from django.conf import settings
 from rest_framework import serializers
 
-from .models import FOUR_DIGIT_VALIDATOR, Game, GameGuess
+from .models import CODE_VALIDATOR, FOUR_DIGIT_VALIDATOR, Challenge, Game, GameGuess, code_validator
+from .pagination import decode_cursor
+from .provisioning import invalid_code_positions
+from .services import (
+    ALPHABET_SIZE,
+    CODE_LENGTH,
+    MAX_ALPHABET_SIZE,
+    MAX_CODE_LENGTH,
+    MIN_ALPHABET_SIZE,
+    MIN_CODE_LENGTH,
+)
+
+
+@lru_cache(maxsize=None)
+def code_serializer(
+    code_length: int = CODE_LENGTH,
+    alphabet_size: int = ALPHABET_SIZE,
+) -> type[serializers.Serializer]:
+    """
+    Serializer class validating a `code` for one game configuration, generated once per configuration.
+    """
+    field = serializers.CharField(
+        max_length=code_length,
+        min_length=code_length,
+        validators=[code_validator(code_length, alphabet_size)],
+    )
+    name = f"Code{code_length}Of{alphabet_size}Serializer"
+    return type(name, (serializers.Serializer,), {"code": field, "__module__": __name__})
 
 
 class CodeSerializer(serializers.Serializer):
+    """
+    A code of any supported configuration; guesses are checked against their game's own afterwards.
+    """
+
     code = serializers.CharField(
-        max_length=4,
-        min_length=4,
-        validators=[FOUR_DIGIT_VALIDATOR],
+        max_length=MAX_CODE_LENGTH,
+        min_length=MIN_CODE_LENGTH,
+        validators=[CODE_VALIDATOR],
+    )
+
+
+class GameCreateSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    code_length = serializers.IntegerField(
+        required=False,
+        default=CODE_LENGTH,
+        min_value=MIN_CODE_LENGTH,
+        max_value=MAX_CODE_LENGTH,
+    )
+    alphabet_size = serializers.IntegerField(
+        required=False,
+        default=ALPHABET_SIZE,
+        min_value=MIN_ALPHABET_SIZE,
+        max_value=MAX_ALPHABET_SIZE,
+        help_text="Number of symbols, taken in order from 0-9 then A-Z.",
+    )
+
+    def validate(self, attrs: dict) -> dict:
+        code = code_serializer(attrs["code_length"], attrs["alphabet_size"])(data={"code": attrs["code"]})
+        code.is_valid(raise_exception=True)
+        return attrs
+
+
+class ChallengeCreateSerializer(GameCreateSerializer):
+    date = serializers.DateField(required=False, help_text="Defaults to today.")
+    max_attempts = serializers.IntegerField(required=False, default=10, min_value=1)
+
+
+class CodeBatchSerializer(serializers.Serializer):
+    codes = serializers.ListField(
+        child=serializers.CharField(
+            max_length=MAX_CODE_LENGTH,
+            min_length=MIN_CODE_LENGTH,
+            validators=[CODE_VALIDATOR],
+        ),
+        min_length=1,
     )
 
 
+class BulkGameSerializer(serializers.Serializer):
+    codes = serializers.ListField(child=serializers.CharField(), required=False, min_length=1)
+    count = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_codes(self, codes: list[str]) -> list[str]:
+        # Checked as one array instead of running FOUR_DIGIT_VALIDATOR once per entry.
+        invalid = invalid_code_positions(codes)
+        if invalid:
+            raise serializers.ValidationError({index: [FOUR_DIGIT_VALIDATOR.message] for index in invalid})
+        return codes
+
+    def validate(self, attrs: dict) -> dict:
+        if ("codes" in attrs) == ("count" in attrs):
+            raise serializers.ValidationError("Provide either codes or count.")
+
+        limit = getattr(settings, "GAMES_BULK_MAX_GAMES", 100_000)
+        if len(attrs.get("codes", ())) > limit or attrs.get("count", 0) > limit:
+            raise serializers.ValidationError(f"At most {limit} games can be created per request.")
+        return attrs
+
+
+class GameListQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    limit = serializers.IntegerField(required=False, default=50, min_value=1, max_value=200)
+    is_solved = serializers.BooleanField(required=False, allow_null=True, default=None)
+    state = serializers.ChoiceField(choices=("active", "exhausted"), required=False)
+
+
+class GameExportQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    is_solved = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate_cursor(self, cursor: str) -> str:
+        try:
+            decode_cursor(cursor)
+        except ValueError as error:
+            raise serializers.ValidationError(str(error)) from error
+        return cursor
+
+
 class GameSerializer(serializers.ModelSerializer):
+    code = serializers.CharField(read_only=True)
     remaining_attempts = serializers.SerializerMethodField()
 
     class Meta:
@@ -21,6 +138,8 @@ class GameSerializer(serializers.ModelSerializer):
         fields = (
             "id",
             "code",
+            "code_length",
+            "alphabet_size",
             "attempts_used",
             "max_attempts",
             "remaining_attempts",
@@ -33,7 +152,43 @@ class GameSerializer(serializers.ModelSerializer):
         return obj.remaining_attempts
 
 
+class GameListResponseSerializer(serializers.Serializer):
+    results = GameSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
+
+
+class ChallengeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Challenge
+        fields = ("id", "date", "code_length", "alphabet_size", "max_attempts", "created_at")
+        read_only_fields = fields
+
+
+class LeaderboardEntrySerializer(serializers.Serializer):
+    game_id = serializers.IntegerField()
+    attempts = serializers.IntegerField()
+    solved_at = serializers.DateTimeField()
+
+
+class ChallengeStatsSerializer(serializers.Serializer):
+    players = serializers.IntegerField()
+    solved = serializers.IntegerField()
+    exhausted = serializers.IntegerField()
+    attempts = serializers.DictField(
+        child=serializers.IntegerField(),
+        help_text="Solved games keyed by the attempt number of the solving guess.",
+    )
+    leaderboard = LeaderboardEntrySerializer(many=True)
+
+
+class ChallengeDetailResponseSerializer(serializers.Serializer):
+    challenge = ChallengeSerializer()
+    stats = ChallengeStatsSerializer()
+
+
 class GuessSerializer(serializers.ModelSerializer):
+    guess = serializers.CharField(read_only=True)
+
     class Meta:
         model = GameGuess
         fields = ("id", "game_id", "guess", "well_placed", "misplaced", "created_at")
@@ -49,3 +204,72 @@ class GuessHistoryResponseSerializer(serializers.Serializer):
     game = GameSerializer()
     history = GuessSerializer(many=True)
 
+
+class GuessBatchResponseSerializer(serializers.Serializer):
+    game = GameSerializer()
+    results = GuessSerializer(many=True)
+
+
+class HintResponseSerializer(serializers.Serializer):
+    hint = serializers.CharField()
+    remaining_candidates = serializers.IntegerField()
+
+
+class FirstGuessCountSerializer(serializers.Serializer):
+    guess = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class StatsResponseSerializer(serializers.Serializer):
+    games_created = serializers.IntegerField()
+    games_solved = serializers.IntegerField()
+    games_exhausted = serializers.IntegerField()
+    games_active = serializers.IntegerField()
+    solve_rate = serializers.FloatField(allow_null=True)
+    attempts_to_solve = serializers.DictField(
+        child=serializers.IntegerField(),
+        help_text="Solved games keyed by the attempt number of the solving guess.",
+    )
+    top_first_guesses = FirstGuessCountSerializer(many=True)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# Field types whose to_representation is a plain conversion for model attribute values.
+_PLAIN_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    serializers.IntegerField: int,
+    serializers.CharField: str,
+    serializers.BooleanField: bool,
+    serializers.ReadOnlyField: _identity,
+}
+
+
+def compile_representation(serializer_class: type[serializers.Serializer]) -> Callable[[Any], dict]:
+    """
+    Precompile a dict builder equivalent to `serializer_class(instance).data` for flat, read-only serializers.
+
+    Field lookup, `SkipField` handling and per-field dispatch are resolved once here instead of on every call.
+    """
+    serializer = serializer_class()
+    plan = []
+    for name, field in serializer.fields.items():
+        if isinstance(field, serializers.SerializerMethodField):
+            plan.append((name, _identity, getattr(serializer, field.method_name)))
+            continue
+        getter = attrgetter(".".join(field.source_attrs)) if field.source_attrs else _identity
+        plan.append((name, getter, _PLAIN_CONVERTERS.get(type(field), field.to_representation)))
+
+    def represent(instance: Any) -> dict:
+        data = {}
+        for name, getter, convert in plan:
+            value = getter(instance)
+            data[name] = None if value is None else convert(value)
+        return data
+
+    return represent
+
+
+game_representation = compile_representation(GameSerializer)
+guess_representation = compile_representation(GuessSerializer)
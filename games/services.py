@@ -1,7 +1,33 @@
 from __future__ import annotations
 
+import logging
+import os
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
 from typing import Iterable, TypedDict
 
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# The classic game: 4 decimal digits, scored from the precomputed feedback table.
+CODE_LENGTH = 4
+ALPHABET_SIZE = 10
+CODE_SPACE = ALPHABET_SIZE**CODE_LENGTH
+
+# Configurable games use the first `alphabet_size` of these symbols.
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+MIN_CODE_LENGTH = 4
+MAX_CODE_LENGTH = 12
+MIN_ALPHABET_SIZE = 2
+MAX_ALPHABET_SIZE = len(SYMBOLS)
+
+# Rows of the feedback table scored per vectorized pass while building it; bounds peak memory.
+_TABLE_BUILD_CHUNK = 250
+
 
 class GuessEvaluation(TypedDict):
     well_placed: int
@@ -10,7 +36,12 @@ class GuessEvaluation(TypedDict):
 
 def evaluate_guess(guess: Iterable[int], secret: Iterable[int]) -> GuessEvaluation:
     """
-    Compare a 4-digit guess against the secret code and return counts of well placed and misplaced digits.
+    Compare a guess against the secret code and return counts of well placed and misplaced symbols.
+
+    Runs in O(n + k) for n positions and k distinct symbols: one pass counts exact matches and the
+    unmatched symbols on each side, and every unmatched symbol present on both sides is misplaced.
+    This is the reference implementation; `score_batch`, `feedback_table` and `score_guess` must always
+    agree with it.
     """
     guess_list = list(guess)
     secret_list = list(secret)
@@ -18,26 +49,307 @@ def evaluate_guess(guess: Iterable[int], secret: Iterable[int]) -> GuessEvaluati
     if len(guess_list) != len(secret_list):
         raise ValueError("Guess and secret must be the same length.")
 
-    guess_copy: list[int] = guess_list[:]
-    secret_copy: list[int] = secret_list[:]
-
     well_placed = 0
-    misplaced = 0
-
-    for index in range(len(secret_copy)):
-        if secret_copy[index] == guess_copy[index]:
+    guess_counts: Counter[int] = Counter()
+    secret_counts: Counter[int] = Counter()
+    for guess_symbol, secret_symbol in zip(guess_list, secret_list):
+        if guess_symbol == secret_symbol:
             well_placed += 1
-            secret_copy[index] = -1
-            guess_copy[index] = -1
-
-    for index in range(len(secret_copy)):
-        if guess_copy[index] != -1:
-            try:
-                misplaced_index = secret_copy.index(guess_copy[index])
-            except ValueError:
-                continue
-            misplaced += 1
-            secret_copy[misplaced_index] = -1
+        else:
+            guess_counts[guess_symbol] += 1
+            secret_counts[secret_symbol] += 1
 
+    misplaced = sum((guess_counts & secret_counts).values())
     return {"well_placed": well_placed, "misplaced": misplaced}
 
+
+def pack_score(well_placed: int, misplaced: int) -> int:
+    """
+    Pack an evaluation into one byte: well placed in the high nibble, misplaced in the low nibble.
+    """
+    return (well_placed << 4) | misplaced
+
+
+def unpack_score(score: int) -> GuessEvaluation:
+    return {"well_placed": int(score) >> 4, "misplaced": int(score) & 0x0F}
+
+
+def code_to_index(code: str, alphabet_size: int = ALPHABET_SIZE) -> int:
+    return int(code, alphabet_size)
+
+
+def index_to_code(index: int, code_length: int = CODE_LENGTH, alphabet_size: int = ALPHABET_SIZE) -> str:
+    if alphabet_size == ALPHABET_SIZE:
+        return f"{index:0{code_length}d}"
+    symbols = []
+    for _ in range(code_length):
+        index, symbol = divmod(index, alphabet_size)
+        symbols.append(SYMBOLS[symbol])
+    return "".join(reversed(symbols))
+
+
+# Storage integers (see games.fields.CodeField): a classic code is its feedback-table index, below
+# CODE_SPACE. Every other code is numbered above that over all MAX_ALPHABET_SIZE symbols, shortest
+# codes first: CODE_SPACE plus the offset of its length plus its base-36 value. The length, and with
+# it any leading zeros, is implied by the value, and the longest codes still fit in a signed 64-bit
+# column.
+_LENGTH_OFFSETS = [sum(MAX_ALPHABET_SIZE**length for length in range(n)) for n in range(MAX_CODE_LENGTH + 2)]
+
+
+def code_to_value(code: str) -> int:
+    """
+    Storage integer of a code; raises ValueError for anything that is not 1 to MAX_CODE_LENGTH symbols.
+    """
+    if isinstance(code, StoredCode):
+        return code.value
+    if not 0 < len(code) <= MAX_CODE_LENGTH or code.strip(SYMBOLS):
+        raise ValueError(f"{code!r} is not a code.")
+    if len(code) == CODE_LENGTH and code.isdigit():
+        return int(code)
+    return CODE_SPACE + _LENGTH_OFFSETS[len(code)] + int(code, MAX_ALPHABET_SIZE)
+
+
+def value_to_code(value: int) -> str:
+    if value < CODE_SPACE:
+        return f"{value:0{CODE_LENGTH}d}"
+    value -= CODE_SPACE
+    length = bisect_right(_LENGTH_OFFSETS, value) - 1
+    return index_to_code(value - _LENGTH_OFFSETS[length], length, MAX_ALPHABET_SIZE)
+
+
+class StoredCode(str):
+    """
+    A code string as loaded from the database, still carrying its storage integer in `value`.
+
+    `score_guess` scores a classic secret straight from `value`, its feedback-table index.
+    """
+
+    value: int
+
+    def __new__(cls, value: int) -> StoredCode:
+        code = super().__new__(cls, value_to_code(value))
+        code.value = value
+        return code
+
+    def __reduce__(self):
+        return StoredCode, (self.value,)
+
+
+def _build_digit_tables() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    indices = np.arange(CODE_SPACE)
+    powers = 10 ** np.arange(CODE_LENGTH - 1, -1, -1)
+    digits = ((indices[:, None] // powers) % 10).astype(np.uint8)
+    counts = np.zeros((CODE_SPACE, 10), dtype=np.uint8)
+    for position in range(CODE_LENGTH):
+        np.add.at(counts, (indices, digits[:, position]), 1)
+
+    # Codes sharing a digit multiset share their "common digits" count with every other code, so the
+    # min-over-histograms step only has to run over the distinct multisets (715 for 4 digits).
+    multisets, multiset_ids = np.unique(counts, axis=0, return_inverse=True)
+    common = np.minimum(multisets[:, None, :], multisets[None, :, :]).sum(axis=2, dtype=np.uint8)
+
+    digits = np.ascontiguousarray(digits.T)
+    for array in (digits, common):
+        array.setflags(write=False)
+    return digits, multiset_ids.reshape(-1).astype(np.intp), common
+
+
+# Per-position digits (CODE_LENGTH x CODE_SPACE), each code's digit-multiset id, and the common digit
+# count between every pair of multisets.
+_POSITION_DIGITS, _MULTISET_IDS, _MULTISET_COMMON = _build_digit_tables()
+
+
+def _as_indices(codes: Iterable[int | str] | np.ndarray) -> np.ndarray:
+    array = np.asarray(codes if isinstance(codes, np.ndarray) else list(codes))
+    if array.dtype.kind in "US":
+        array = array.astype(np.int64)
+    return array.astype(np.intp, copy=False).reshape(-1)
+
+
+def score_batch(
+    guesses: Iterable[int | str] | np.ndarray,
+    secrets: Iterable[int | str] | np.ndarray,
+) -> np.ndarray:
+    """
+    Score every guess against every secret in one vectorized pass.
+
+    Codes may be given as 4-digit strings or as integer indices. Returns a `(len(guesses), len(secrets))`
+    uint8 array of packed scores (see `pack_score`).
+    """
+    guess_indices = _as_indices(guesses)
+    secret_indices = _as_indices(secrets)
+
+    well_placed = np.zeros((guess_indices.size, secret_indices.size), dtype=np.uint8)
+    for position_digits in _POSITION_DIGITS:
+        well_placed += position_digits[guess_indices][:, None] == position_digits[secret_indices][None, :]
+    common = _MULTISET_COMMON[np.ix_(_MULTISET_IDS[guess_indices], _MULTISET_IDS[secret_indices])]
+
+    return (well_placed << 4) | (common - well_placed)
+
+
+@lru_cache(maxsize=None)
+def feedback_table() -> np.ndarray:
+    """
+    Return the read-only CODE_SPACE x CODE_SPACE table of packed scores, indexed `[guess, secret]`.
+
+    The table takes 100 MB. With `GAMES_FEEDBACK_TABLE_FILE` set it is memory-mapped from that .npy
+    file, written on first use if missing or stale, so every worker process on the host shares one
+    physical copy through the page cache. Without it the table is built in process memory on first
+    use, as it is (with a warning) when the file cannot be written.
+    """
+    path = getattr(settings, "GAMES_FEEDBACK_TABLE_FILE", None)
+    if path is None:
+        return build_feedback_table()
+    try:
+        return load_feedback_table(path)
+    except (OSError, ValueError):
+        pass
+    table = build_feedback_table()
+    try:
+        save_feedback_table(path, table)
+        return load_feedback_table(path)
+    except (OSError, ValueError) as error:
+        logger.warning(
+            "Could not write the feedback table to %s (%s); this process keeps its own 100 MB copy.", path, error
+        )
+        return table
+
+
+def build_feedback_table() -> np.ndarray:
+    table = np.empty((CODE_SPACE, CODE_SPACE), dtype=np.uint8)
+    all_codes = np.arange(CODE_SPACE)
+    for start in range(0, CODE_SPACE, _TABLE_BUILD_CHUNK):
+        stop = min(start + _TABLE_BUILD_CHUNK, CODE_SPACE)
+        table[start:stop] = score_batch(all_codes[start:stop], all_codes)
+    table.setflags(write=False)
+    return table
+
+
+def load_feedback_table(path: str | Path) -> np.ndarray:
+    """
+    Map a table saved by `save_feedback_table` read-only; raises ValueError if it does not look current.
+    """
+    table = np.load(path, mmap_mode="r", allow_pickle=False)
+    if table.shape != (CODE_SPACE, CODE_SPACE) or table.dtype != np.uint8:
+        raise ValueError(f"{path} does not hold a {CODE_SPACE}x{CODE_SPACE} uint8 feedback table.")
+    # Spot-check a few rows so a file left over from different scoring rules is rebuilt.
+    rows = [0, 1234, CODE_SPACE - 1]
+    if not np.array_equal(table[rows], score_batch(rows, range(CODE_SPACE))):
+        raise ValueError(f"{path} does not match the current scoring rules.")
+    # A plain ndarray view of the mapping, so results of indexing it are not memmaps themselves.
+    return np.asarray(table)
+
+
+def save_feedback_table(path: str | Path, table: np.ndarray) -> None:
+    # Write beside the target and rename, so concurrent workers never map a half-written file.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporary, "wb") as file:
+            np.save(file, table, allow_pickle=False)
+        os.replace(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+# Largest code space whose per-secret feedback row is precomputed (one byte per possible guess).
+FEEDBACK_ROW_LIMIT = 1 << 20
+_FEEDBACK_ROW_CHUNK = 1 << 16
+
+
+@lru_cache(maxsize=32)
+def feedback_row(secret: str, alphabet_size: int = ALPHABET_SIZE) -> np.ndarray | None:
+    """
+    Packed score of every possible guess against `secret`, indexed by `code_to_index(guess, alphabet_size)`.
+
+    Built once per secret shared by many games (see `Challenge`), so each of their guesses is a single
+    lookup. Returns None when the code space is larger than FEEDBACK_ROW_LIMIT.
+    """
+    code_length = len(secret)
+    space = alphabet_size**code_length
+    if space > FEEDBACK_ROW_LIMIT:
+        return None
+    if code_length == CODE_LENGTH and alphabet_size == ALPHABET_SIZE:
+        row = score_batch(np.arange(CODE_SPACE), [code_to_index(secret)])[:, 0].copy()
+        row.setflags(write=False)
+        return row
+
+    secret_digits = np.array([int(char, alphabet_size) for char in secret])
+    secret_counts = np.bincount(secret_digits, minlength=alphabet_size)
+    powers = alphabet_size ** np.arange(code_length - 1, -1, -1)
+    row = np.empty(space, dtype=np.uint8)
+    for start in range(0, space, _FEEDBACK_ROW_CHUNK):
+        indices = np.arange(start, min(start + _FEEDBACK_ROW_CHUNK, space))
+        digits = (indices[:, None] // powers) % alphabet_size
+        well_placed = (digits == secret_digits).sum(axis=1)
+        counts = np.zeros((indices.size, alphabet_size), dtype=np.int64)
+        for position in range(code_length):
+            np.add.at(counts, (np.arange(indices.size), digits[:, position]), 1)
+        common = np.minimum(counts, secret_counts).sum(axis=1)
+        row[start : start + indices.size] = (well_placed << 4) | (common - well_placed)
+    row.setflags(write=False)
+    return row
+
+
+# Bitset encoding for configurable codes. Positions: one 6-bit field per position holding the symbol.
+# Symbol counts: one 5-bit field per symbol, counts (at most MAX_CODE_LENGTH) in the low 4 bits and a
+# guard bit on top, so field-wise comparisons and sums never carry into the neighbouring field.
+_POSITION_BITS = 6
+_COUNT_BITS = 5
+_POSITION_LOW_BITS = sum(1 << (_POSITION_BITS * position) for position in range(MAX_CODE_LENGTH))
+_COUNT_LOW_BITS = sum(1 << (_COUNT_BITS * symbol) for symbol in range(MAX_ALPHABET_SIZE))
+_COUNT_GUARD_BITS = _COUNT_LOW_BITS << 4
+_COUNT_VALUE_BITS = _COUNT_LOW_BITS * 0xF
+_COUNT_TOTAL_SHIFT = _COUNT_BITS * (MAX_ALPHABET_SIZE - 1)
+
+
+@lru_cache(maxsize=65536)
+def encode_code(code: str) -> tuple[int, int]:
+    """
+    Encode a code as (per-position symbol fields, per-symbol count fields), both plain integers.
+    """
+    positions = counts = 0
+    for position, char in enumerate(code):
+        symbol = int(char, MAX_ALPHABET_SIZE)
+        positions |= symbol << (_POSITION_BITS * position)
+        counts += 1 << (_COUNT_BITS * symbol)
+    return positions, counts
+
+
+def score_encoded(guess: tuple[int, int], secret: tuple[int, int], code_length: int) -> GuessEvaluation:
+    """
+    Score two `encode_code` encodings with a fixed number of integer operations, whatever their length.
+    """
+    # A position matches when its 6-bit field XORs to zero; fold each field onto its lowest bit.
+    mismatch = guess[0] ^ secret[0]
+    differing = mismatch
+    for shift in range(1, _POSITION_BITS):
+        differing |= mismatch >> shift
+    well_placed = code_length - (differing & _POSITION_LOW_BITS).bit_count()
+
+    # Field-wise min of the two count vectors: the guard bit survives the subtraction where a >= b.
+    guess_counts, secret_counts = guess[1], secret[1]
+    guess_not_smaller = (((guess_counts | _COUNT_GUARD_BITS) - secret_counts) & _COUNT_GUARD_BITS) >> 4
+    take_secret = guess_not_smaller * 0xF
+    common = (secret_counts & take_secret) | (guess_counts & ~take_secret & _COUNT_VALUE_BITS)
+    # Multiplying by a one in every field sums all fields into the top one.
+    common = ((common * _COUNT_LOW_BITS) >> _COUNT_TOTAL_SHIFT) & 0x1F
+
+    return {"well_placed": well_placed, "misplaced": common - well_placed}
+
+
+def score_guess(guess: str, secret: str) -> GuessEvaluation:
+    """
+    Score a guess string against a secret string of the same length.
+
+    Classic 4-digit codes are a single feedback-table lookup, indexed by the secret's storage integer
+    when it was loaded from the database; other lengths and alphabets use the bitset encoding, whose
+    cost does not grow with the code length.
+    """
+    classic_secret = isinstance(secret, StoredCode) and secret.value < CODE_SPACE
+    if classic_secret and len(guess) == CODE_LENGTH and guess.isdigit():
+        return unpack_score(feedback_table()[int(guess), secret.value])
+    if len(secret) == CODE_LENGTH and guess.isdigit() and secret.isdigit():
+        return unpack_score(feedback_table()[code_to_index(guess), code_to_index(secret)])
+    return score_encoded(encode_code(guess), encode_code(secret), len(secret))
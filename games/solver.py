@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable
+
+import numpy as np
+
+from .services import CODE_SPACE, code_to_index, feedback_table, index_to_code, pack_score
+
+# A history is the ordered sequence of (guess index, packed score) pairs played so far.
+History = tuple[tuple[int, int], ...]
+
+# Packed scores keep at most 4 in either nibble, so every score value is below 0x45.
+_SCORE_BUCKETS = 0x45
+
+# Knuth-style minimax opening over all 10,000 codes (worst case leaves 3,048 candidates).
+OPENING_GUESS = "0123"
+
+# Minimax second guess for every feedback the opening can receive, keyed by packed score.
+SECOND_GUESSES: dict[int, str] = {
+    pack_score(0, 0): "4455",
+    pack_score(0, 1): "4567",
+    pack_score(0, 2): "1034",
+    pack_score(0, 3): "1242",
+    pack_score(0, 4): "0001",
+    pack_score(1, 0): "0145",
+    pack_score(1, 1): "0145",
+    pack_score(1, 2): "0011",
+    pack_score(1, 3): "0012",
+    pack_score(2, 0): "0245",
+    pack_score(2, 1): "0011",
+    pack_score(2, 2): "0011",
+    pack_score(3, 0): "0011",
+    pack_score(4, 0): "0123",
+}
+
+_ALL_CODES = np.arange(CODE_SPACE, dtype=np.int16)
+_ALL_CODES.setflags(write=False)
+
+
+def build_history(entries: Iterable[tuple[str, int, int]]) -> History:
+    """
+    Convert `(guess, well_placed, misplaced)` rows, as stored on `GameGuess`, into a solver history.
+    """
+    return tuple(
+        (code_to_index(guess), pack_score(well_placed, misplaced)) for guess, well_placed, misplaced in entries
+    )
+
+
+@lru_cache(maxsize=4096)
+def candidates_for(history: History) -> np.ndarray:
+    """
+    Return the codes still consistent with `history`, narrowing the cached set for the shorter prefix.
+    """
+    if not history:
+        return _ALL_CODES
+
+    previous = candidates_for(history[:-1])
+    guess_index, score = history[-1]
+    narrowed = previous[feedback_table()[guess_index, previous] == score]
+    narrowed.setflags(write=False)
+    return narrowed
+
+
+# Feedback cells scored per block in `minimax_guess`, which bounds a hint's working memory (about
+# 9 bytes per cell) however many candidates are left.
+_BLOCK_CELLS = 1 << 20
+
+
+def _partition_sizes(guesses: slice, candidates: np.ndarray) -> np.ndarray:
+    """
+    For each guess in the `guesses` range, count how many candidates land in each feedback bucket.
+    """
+    buckets = feedback_table()[guesses][:, candidates].astype(np.intp)
+    rows = buckets.shape[0]
+    buckets += np.arange(rows, dtype=np.intp)[:, None] * _SCORE_BUCKETS
+    return np.bincount(buckets.ravel(), minlength=rows * _SCORE_BUCKETS).reshape(rows, _SCORE_BUCKETS)
+
+
+def minimax_guess(candidates: np.ndarray) -> int:
+    """
+    Pick the guess whose worst-case partition of `candidates` is smallest, preferring consistent codes
+    and then the lowest code on ties.
+
+    Guesses are scored in blocks of rows, so memory stays bounded by `_BLOCK_CELLS`.
+    """
+    if candidates.size <= 2:
+        return int(candidates[0])
+
+    rows = max(_BLOCK_CELLS // candidates.size, 1)
+    worst_case = np.empty(CODE_SPACE, dtype=np.intp)
+    for start in range(0, CODE_SPACE, rows):
+        guesses = slice(start, min(start + rows, CODE_SPACE))
+        worst_case[guesses] = _partition_sizes(guesses, candidates).max(axis=1)
+    best_guesses = np.flatnonzero(worst_case == worst_case.min())
+    consistent = best_guesses[np.isin(best_guesses, candidates)]
+    return int(consistent[0] if consistent.size else best_guesses[0])
+
+
+@lru_cache(maxsize=4096)
+def _best_guess_index(history: History) -> int:
+    candidates = candidates_for(history)
+    if not candidates.size:
+        raise ValueError("No code is consistent with the guess history.")
+    return minimax_guess(candidates)
+
+
+def suggest_guess(history: History) -> str:
+    """
+    Suggest the next guess for `history`, using the precomputed opening tree where it applies.
+    """
+    if not history:
+        return OPENING_GUESS
+
+    if len(history) == 1 and history[0][0] == code_to_index(OPENING_GUESS):
+        return SECOND_GUESSES[history[0][1]]
+
+    return index_to_code(_best_guess_index(history))
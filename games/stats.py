@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Sequence, TypedDict
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Model
+
+from .models import ChallengeResult, Game, GameGuess, StatBucket, StatCounter
+
+# Counters; solved games are the sum of the attempts-to-solve histogram and active games are derived.
+GAMES_CREATED = "games_created"
+GAMES_EXHAUSTED = "games_exhausted"
+
+# Histograms, bucketed by the attempt count of the solving guess and by the first guess's code.
+ATTEMPTS_TO_SOLVE = "attempts_to_solve"
+FIRST_GUESS = "first_guess"
+
+TOP_FIRST_GUESSES = 10
+
+# Per-challenge counters and attempts histogram (bucket "X" counts games that ran out of attempts).
+EXHAUSTED_BUCKET = "X"
+
+
+def challenge_players(challenge_id: int) -> str:
+    return f"challenge:{challenge_id}:players"
+
+
+def challenge_attempts(challenge_id: int) -> str:
+    return f"challenge:{challenge_id}:attempts"
+
+
+class StatDeltas:
+    """
+    Pending increments for the counter and histogram tables, applied with one UPDATE per touched row.
+
+    Challenge games also queue a leaderboard row when they are solved.
+    """
+
+    def __init__(self) -> None:
+        self.counters: Counter[str] = Counter()
+        self.buckets: Counter[tuple[str, str]] = Counter()
+        self.results: list[ChallengeResult] = []
+
+    def add_guesses(self, game: Game, guesses: Sequence[GameGuess]) -> None:
+        """
+        Count `guesses` just recorded for `game`, whose fields already reflect them.
+        """
+        if not guesses:
+            return
+        if game.attempts_used == len(guesses):
+            self.buckets[FIRST_GUESS, guesses[0].guess] += 1
+        self._add_outcome(game)
+        if game.challenge_id is not None and game.is_solved:
+            self.results.append(
+                ChallengeResult(
+                    challenge_id=game.challenge_id,
+                    game_id=game.pk,
+                    attempts=game.attempts_used,
+                    solved_at=guesses[-1].created_at,
+                )
+            )
+
+    def add_game(self, game: Game, first_guess: str | None) -> None:
+        """
+        Count an existing game from scratch: its creation, its first guess and how it ended.
+        """
+        self.counters[GAMES_CREATED] += 1
+        if game.challenge_id is not None:
+            self.counters[challenge_players(game.challenge_id)] += 1
+        if first_guess is not None:
+            self.buckets[FIRST_GUESS, first_guess] += 1
+        self._add_outcome(game)
+
+    def _add_outcome(self, game: Game) -> None:
+        if game.is_solved:
+            self.buckets[ATTEMPTS_TO_SOLVE, str(game.attempts_used)] += 1
+        elif game.attempts_used >= game.max_attempts:
+            self.counters[GAMES_EXHAUSTED] += 1
+        else:
+            return
+        if game.challenge_id is not None:
+            bucket = str(game.attempts_used) if game.is_solved else EXHAUSTED_BUCKET
+            self.buckets[challenge_attempts(game.challenge_id), bucket] += 1
+
+    def apply(self) -> None:
+        # Callers run this inside the transaction that recorded the games or guesses being counted.
+        for name, delta in self.counters.items():
+            _increment(StatCounter, {"name": name}, "value", delta)
+        for (histogram, bucket), delta in self.buckets.items():
+            _increment(StatBucket, {"histogram": histogram, "bucket": bucket}, "count", delta)
+        if self.results:
+            ChallengeResult.objects.bulk_create(self.results, ignore_conflicts=True)
+
+
+def _increment(model: type[Model], lookup: dict[str, str], field: str, delta: int) -> None:
+    if model.objects.filter(**lookup).update(**{field: F(field) + delta}):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **{field: delta})
+    except IntegrityError:
+        # Another transaction created the row first.
+        model.objects.filter(**lookup).update(**{field: F(field) + delta})
+
+
+def lock_stats() -> None:
+    """
+    Block every `StatDeltas.apply` until the current transaction ends; call inside `transaction.atomic()`.
+
+    Writers that already counted something hold their row locks, so this also waits for them to commit.
+    """
+    if connection.vendor == "postgresql":
+        tables = ", ".join(connection.ops.quote_name(model._meta.db_table) for model in (StatCounter, StatBucket))
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {tables} IN EXCLUSIVE MODE")
+    elif connection.vendor == "sqlite":
+        # SQLite allows one writer at a time, and the first write statement takes the database lock.
+        StatCounter.objects.filter(name=GAMES_CREATED).update(value=F("value"))
+    else:
+        # Row locks only: a row created meanwhile is not covered.
+        list(StatCounter.objects.select_for_update().values_list("pk"))
+        list(StatBucket.objects.select_for_update().values_list("pk"))
+
+
+def record_games_created(count: int = 1, challenge_id: int | None = None) -> None:
+    deltas = StatDeltas()
+    deltas.counters[GAMES_CREATED] += count
+    if challenge_id is not None:
+        deltas.counters[challenge_players(challenge_id)] += count
+    deltas.apply()
+
+
+def record_guesses(game: Game, guesses: Sequence[GameGuess]) -> None:
+    deltas = StatDeltas()
+    deltas.add_guesses(game, guesses)
+    deltas.apply()
+
+
+class Stats(TypedDict):
+    games_created: int
+    games_solved: int
+    games_exhausted: int
+    games_active: int
+    solve_rate: float | None
+    attempts_to_solve: dict[str, int]
+    top_first_guesses: list[dict[str, object]]
+
+
+def read_stats() -> Stats:
+    counters = dict(StatCounter.objects.values_list("name", "value"))
+    attempts = {
+        bucket: count
+        for bucket, count in StatBucket.objects.filter(histogram=ATTEMPTS_TO_SOLVE).values_list("bucket", "count")
+        if count
+    }
+    first_guesses = (
+        StatBucket.objects.filter(histogram=FIRST_GUESS, count__gt=0)
+        .order_by("-count", "bucket")
+        .values_list("bucket", "count")[:TOP_FIRST_GUESSES]
+    )
+
+    created = counters.get(GAMES_CREATED, 0)
+    exhausted = counters.get(GAMES_EXHAUSTED, 0)
+    solved = sum(attempts.values())
+    return {
+        "games_created": created,
+        "games_solved": solved,
+        "games_exhausted": exhausted,
+        "games_active": max(created - solved - exhausted, 0),
+        "solve_rate": solved / created if created else None,
+        "attempts_to_solve": dict(sorted(attempts.items(), key=lambda item: int(item[0]))),
+        "top_first_guesses": [{"guess": guess, "count": count} for guess, count in first_guesses],
+    }
+
+
+LEADERBOARD_SIZE = 10
+
+
+class ChallengeStats(TypedDict):
+    players: int
+    solved: int
+    exhausted: int
+    attempts: dict[str, int]
+    leaderboard: list[dict[str, object]]
+
+
+def read_challenge_stats(challenge_id: int, leaderboard_size: int = LEADERBOARD_SIZE) -> ChallengeStats:
+    """
+    Live standings of a challenge: a counter, one histogram and the first rows of the rank index.
+    """
+    players = StatCounter.objects.filter(name=challenge_players(challenge_id)).values_list("value", flat=True).first()
+    attempts = {
+        bucket: count
+        for bucket, count in StatBucket.objects.filter(histogram=challenge_attempts(challenge_id)).values_list(
+            "bucket", "count"
+        )
+        if count
+    }
+    exhausted = attempts.pop(EXHAUSTED_BUCKET, 0)
+    leaderboard = (
+        ChallengeResult.objects.filter(challenge_id=challenge_id)
+        .order_by("attempts", "solved_at", "game_id")
+        .values("game_id", "attempts", "solved_at")[:leaderboard_size]
+    )
+    return {
+        "players": players or 0,
+        "solved": sum(attempts.values()),
+        "exhausted": exhausted,
+        "attempts": dict(sorted(attempts.items(), key=lambda item: int(item[0]))),
+        "leaderboard": list(leaderboard),
+    }
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from games.admin import EstimatedCountPaginator
+from games.cache import get_game_state
+from games.models import Game, GameGuess
+
+CHANGELIST_URL = "/admin/games/game/"
+
+
+class GameAdminTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+    def add_games(self, count: int, guesses: int = 3) -> list[Game]:
+        games = Game.objects.bulk_create(Game(code=f"{index:04d}", attempts_used=guesses) for index in range(count))
+        GameGuess.objects.bulk_create(
+            GameGuess(game=game, guess="5678", well_placed=0, misplaced=0) for game in games for _ in range(guesses)
+        )
+        return games
+
+    def count_queries(self, url: str) -> int:
+        # Fill per-process caches (content types, permissions) so only per-request queries remain.
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.add_games(5)
+        few = self.count_queries(CHANGELIST_URL)
+        self.add_games(150, guesses=8)
+        many = self.count_queries(CHANGELIST_URL)
+
+        self.assertEqual(few, many)
+        # Session, user, count and the page itself (guess counts included).
+        self.assertLessEqual(many, 5)
+
+    def test_changelist_shows_annotated_guess_counts(self):
+        game = self.add_games(1, guesses=4)[0]
+
+        response = self.client.get(CHANGELIST_URL)
+
+        self.assertEqual(response.context["cl"].result_list.get(pk=game.pk).guess_count, 4)
+        self.assertContains(response, "Guesses")
+        self.assertNotContains(response, "?o=3")
+
+    def test_bulk_delete_invalidates_cached_games(self):
+        games = self.add_games(3)
+        for game in games:
+            self.assertEqual(self.client.get(f"/api/games/{game.pk}/").status_code, 200)
+            self.assertIsNotNone(get_game_state(game.pk))
+
+        response = self.client.post(
+            CHANGELIST_URL,
+            {"action": "delete_selected", "_selected_action": [game.pk for game in games[:2]], "post": "yes"},
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual([get_game_state(game.pk) is None for game in games], [True, True, False])
+
+    def test_search_is_an_exact_match_on_code_or_id(self):
+        games = self.add_games(20)
+        lettered = Game.objects.create(code="A1B2", code_length=4, alphabet_size=12)
+
+        by_code = self.client.get(CHANGELIST_URL, {"q": "a1b2"})
+        by_id = self.client.get(CHANGELIST_URL, {"q": str(games[12].pk)})
+        partial = self.client.get(CHANGELIST_URL, {"q": "A1B"})
+
+        self.assertEqual([game.pk for game in by_code.context["cl"].result_list], [lettered.pk])
+        # A number matches both the game with that ID and a game with that code.
+        self.assertIn(games[12].pk, [game.pk for game in by_id.context["cl"].result_list])
+        self.assertEqual(len(partial.context["cl"].result_list), 0)
+
+    def test_search_query_uses_equality(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(CHANGELIST_URL, {"q": "0012"})
+
+        self.assertFalse(any("LIKE" in query["sql"] for query in queries))
+
+    def test_change_page_loads_a_capped_read_only_inline(self):
+        game = self.add_games(1, guesses=3)[0]
+        url = f"/admin/games/game/{game.pk}/change/"
+        few = self.count_queries(url)
+        GameGuess.objects.bulk_create(
+            GameGuess(game=game, guess="1111", well_placed=0, misplaced=0) for _ in range(60)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(len(queries), few)
+        self.assertLessEqual(few, 5)
+        formset = response.context["inline_admin_formsets"][0].formset
+        self.assertEqual(len(formset.forms), 20)
+        self.assertFalse(response.context["inline_admin_formsets"][0].has_change_permission)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        self.games = Game.objects.bulk_create(Game(code="1234") for _ in range(30))
+
+    def test_small_tables_are_counted_exactly(self):
+        self.games[-1].delete()
+
+        self.assertEqual(EstimatedCountPaginator(Game.objects.order_by("-pk"), 10).count, 29)
+
+    def test_large_tables_use_the_estimate(self):
+        paginator = EstimatedCountPaginator(Game.objects.order_by("-pk"), 10)
+        paginator.exact_count_below = 10
+        self.games[0].delete()
+
+        # The largest primary key stands in for the row count on SQLite.
+        self.assertEqual(paginator.count, self.games[-1].pk)
+
+    def test_filtered_counts_are_capped(self):
+        paginator = EstimatedCountPaginator(Game.objects.filter(code="1234").order_by("-pk"), 10)
+        paginator.max_count = 25
+
+        self.assertEqual(paginator.count, 25)
+        self.assertEqual(paginator.num_pages, 3)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import zlib
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from games.archive import archive_games
+from games.models import ArchivedGame, Game, GameGuess
+
+
+class ArchiveGamesTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.solved = self.play("1234", ["5678", "1243", "1234"])
+        self.exhausted = Game.objects.create(code="1234", max_attempts=1)
+        self.client.post(f"/api/games/{self.exhausted.id}/guess/", {"code": "0000"}, format="json")
+        self.active = self.play("1234", ["5678"])
+        self.recent = self.play("1234", ["1234"], age=timedelta(0))
+        cache.clear()
+
+    def play(self, code: str, guesses: list[str], age: timedelta = timedelta(days=60)) -> Game:
+        game = Game.objects.create(code=code)
+        for guess in guesses:
+            self.client.post(f"/api/games/{game.id}/guess/", {"code": guess}, format="json")
+        Game.objects.filter(pk=game.pk).update(created_at=timezone.now() - age)
+        return game
+
+    def test_command_moves_only_old_finished_games(self) -> None:
+        Game.objects.filter(pk=self.exhausted.pk).update(created_at=timezone.now() - timedelta(days=60))
+        out = StringIO()
+
+        call_command("archive_games", "--batch-size", "1", "--delete-chunk-size", "1", stdout=out)
+
+        self.assertIn("Archived 2 games", out.getvalue())
+        self.assertEqual(set(ArchivedGame.objects.values_list("pk", flat=True)), {self.solved.pk, self.exhausted.pk})
+        self.assertEqual(set(Game.objects.values_list("pk", flat=True)), {self.active.pk, self.recent.pk})
+        self.assertFalse(GameGuess.objects.filter(game_id__in=[self.solved.pk, self.exhausted.pk]).exists())
+
+    def test_archived_games_are_served_transparently(self) -> None:
+        detail_before = self.client.get(f"/api/games/{self.solved.id}/").data
+        history_before = self.client.get(f"/api/games/{self.solved.id}/history/").data
+        cache.clear()
+
+        list(archive_games(timezone.now() - timedelta(days=30)))
+
+        self.assertFalse(Game.objects.filter(pk=self.solved.pk).exists())
+        self.assertEqual(self.client.get(f"/api/games/{self.solved.id}/").data, detail_before)
+        self.assertEqual(self.client.get(f"/api/games/{self.solved.id}/history/").data, history_before)
+        response = self.client.post(f"/api/games/{self.solved.id}/guess/", {"code": "1234"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.client.get("/api/games/999999/").status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_interrupted_run_is_finished_on_the_next_run(self) -> None:
+        batches = archive_games(timezone.now() - timedelta(days=30))
+        # Simulate a crash after the copy committed but before the source rows were deleted.
+        ArchivedGame.objects.create(
+            id=self.active.pk,
+            code="1234",
+            attempts_used=1,
+            max_attempts=10,
+            is_solved=True,
+            created_at=self.active.created_at,
+            history=zlib.compress(b""),
+        )
+
+        self.assertEqual(list(batches), [1])
+
+        self.assertFalse(Game.objects.filter(pk=self.active.pk).exists())
+        self.assertFalse(Game.objects.filter(pk=self.solved.pk).exists())
+
+    def test_stats_rebuild_counts_archived_games(self) -> None:
+        call_command("rebuild_stats", stdout=StringIO())
+        expected = self.client.get("/api/stats/").data
+
+        list(archive_games(timezone.now() - timedelta(days=30)))
+        call_command("rebuild_stats", stdout=StringIO())
+
+        self.assertEqual(self.client.get("/api/stats/").data, expected)
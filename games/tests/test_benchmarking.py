@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from games.benchmarking import percentile, summarize, write_results
+from games.models import Game
+
+
+class BenchmarkingHelpersTests(SimpleTestCase):
+    def test_percentile_uses_nearest_rank(self) -> None:
+        values = [float(value) for value in range(1, 101)]
+
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.99), 99.0)
+        self.assertEqual(percentile([7.0], 0.95), 7.0)
+
+    def test_summarize_reports_latency_throughput_and_queries(self) -> None:
+        summary = summarize([0.001, 0.002, 0.003, 0.004], elapsed=2.0, queries=[2, 4, None], errors=1)
+
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["errors"], 1)
+        self.assertEqual(summary["per_second"], 2.0)
+        self.assertEqual(summary["queries_per_request"], 3.0)
+        self.assertEqual(summary["p50_ms"], 2.0)
+        self.assertEqual(summary["p99_ms"], 4.0)
+
+    def test_write_results_records_run_metadata(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+            write_results(path, "micro", {"number": 1}, {"score_guess": {"best_us": 1.0}})
+            document = json.loads(path.read_text())
+
+        self.assertEqual(document["kind"], "micro")
+        self.assertEqual(document["results"]["score_guess"]["best_us"], 1.0)
+        self.assertIn("commit", document)
+
+
+class QueryCountMiddlewareTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    @override_settings(GAMES_QUERY_COUNT_HEADER=True)
+    def test_header_reports_queries_for_request(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        response = self.client.get(f"/api/games/{game.id}/history/")
+
+        self.assertEqual(response["X-Query-Count"], "2")
+
+    @override_settings(GAMES_QUERY_COUNT_HEADER=True)
+    async def test_header_counts_queries_under_asgi(self) -> None:
+        game = await Game.objects.acreate(code="1234")
+
+        response = await self.async_client.get(f"/api/games/{game.id}/history/")
+
+        self.assertEqual(response["X-Query-Count"], "2")
+
+    @override_settings(GAMES_QUERY_COUNT_HEADER=False)
+    def test_header_is_omitted_when_disabled(self) -> None:
+        response = self.client.get("/api/games/")
+
+        self.assertNotIn("X-Query-Count", response)
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import random
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from games.models import ChallengeResult, Game
+from games.services import SYMBOLS, code_to_index, feedback_row, pack_score, score_guess
+
+
+class FeedbackRowTests(SimpleTestCase):
+    def test_row_matches_score_guess(self) -> None:
+        rng = random.Random(25)
+        for secret, alphabet_size in (("1123", 10), ("0F3A", 16), ("101101", 2), ("ABC00", 13)):
+            row = feedback_row(secret, alphabet_size)
+            self.assertEqual(row.size, alphabet_size ** len(secret))
+            self.assertFalse(row.flags.writeable)
+            for _ in range(500):
+                guess = "".join(rng.choice(SYMBOLS[:alphabet_size]) for _ in secret)
+                expected = score_guess(guess, secret)
+                self.assertEqual(
+                    row[code_to_index(guess, alphabet_size)],
+                    pack_score(expected["well_placed"], expected["misplaced"]),
+                    f"{guess} vs {secret}",
+                )
+
+    def test_no_row_for_large_code_spaces(self) -> None:
+        self.assertIsNone(feedback_row("ZZZZZZZZZZZZ", 36))
+
+
+class ChallengeTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        response = self.client.post(
+            "/api/challenges/",
+            {"code": "1234", "date": "2026-10-18", "max_attempts": 3},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.challenge_id = response.data["id"]
+
+    def play(self, guesses: list[str]) -> int:
+        response = self.client.post(f"/api/challenges/{self.challenge_id}/games/")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        game_id = response.data["id"]
+        for guess in guesses:
+            self.client.post(f"/api/games/{game_id}/guess/", {"code": guess}, format="json")
+        return game_id
+
+    def test_games_share_the_challenge_code(self) -> None:
+        game_id = self.play(["1243"])
+
+        game = Game.objects.get(pk=game_id)
+        self.assertEqual((game.challenge_id, game.code, game.max_attempts), (self.challenge_id, "1234", 3))
+        self.assertEqual(
+            self.client.get(f"/api/games/{game_id}/history/").data["history"][0]["misplaced"],
+            2,
+        )
+
+    def test_standings_are_maintained_by_guesses(self) -> None:
+        slow = self.play(["5678", "1243", "1234"])
+        fast = self.play(["1234"])
+        self.play(["0000", "1111", "2222"])
+        self.play(["1243"])
+        middle = self.play(["4321"])
+        self.client.post(f"/api/games/{middle}/guesses/", {"codes": ["1234", "5678"]}, format="json")
+
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/challenges/{self.challenge_id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("code", response.data["challenge"])
+        stats = response.data["stats"]
+        self.assertEqual(
+            {key: stats[key] for key in ("players", "solved", "exhausted", "attempts")},
+            {"players": 5, "solved": 3, "exhausted": 1, "attempts": {"1": 1, "2": 1, "3": 1}},
+        )
+        self.assertEqual([entry["game_id"] for entry in stats["leaderboard"]], [fast, middle, slow])
+        self.assertEqual([entry["attempts"] for entry in stats["leaderboard"]], [1, 2, 3])
+
+    def test_stats_rebuild_agrees_with_incremental_counts(self) -> None:
+        self.play(["1234"])
+        self.play(["0000", "1111", "2222"])
+
+        out = StringIO()
+        call_command("rebuild_stats", "--verify", stdout=out)
+
+        self.assertIn("Verified stats for 2 games.", out.getvalue())
+        self.assertEqual(ChallengeResult.objects.count(), 1)
+
+    def test_one_challenge_per_date(self) -> None:
+        response = self.client.post("/api/challenges/", {"code": "5678", "date": "2026-10-18"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_challenge_code_is_validated_for_its_configuration(self) -> None:
+        response = self.client.post(
+            "/api/challenges/",
+            {"code": "12A4", "date": "2026-10-19", "alphabet_size": 10},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_challenge(self) -> None:
+        self.assertEqual(self.client.post("/api/challenges/999/games/").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get("/api/challenges/999/").status_code, status.HTTP_404_NOT_FOUND)
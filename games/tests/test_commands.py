@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import tempfile
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from games.history import pack_guesses, unpack_history
+from games.models import Game, GameGuess
+
+
+class BackfillPackedHistoryCommandTests(TestCase):
+    def _game_with_guesses(self) -> Game:
+        game = Game.objects.create(code="1234", packed_history=None)
+        GameGuess.objects.create(game=game, guess="1256", well_placed=2, misplaced=0)
+        GameGuess.objects.create(game=game, guess="4321", well_placed=0, misplaced=4)
+        return game
+
+    def test_backfill_packs_unpacked_games(self) -> None:
+        game = self._game_with_guesses()
+
+        call_command("backfill_packed_history", "--batch-size", "1", stdout=StringIO())
+
+        game.refresh_from_db()
+        history = unpack_history(game)
+        guesses = list(game.guesses.all())
+        self.assertEqual([entry.id for entry in history], [guess.id for guess in guesses])
+        self.assertEqual([entry.created_at for entry in history], [guess.created_at for guess in guesses])
+        self.assertEqual(history[1].misplaced, 4)
+
+    def test_verify_reports_unpacked_and_mismatched_games(self) -> None:
+        game = self._game_with_guesses()
+        stdout = StringIO()
+
+        call_command("backfill_packed_history", "--verify", stdout=stdout)
+        self.assertIn("1 not packed", stdout.getvalue())
+
+        game.packed_history = pack_guesses(game.guesses.all()[:1])
+        game.save(update_fields=["packed_history"])
+        with self.assertRaises(CommandError):
+            call_command("backfill_packed_history", "--verify", stdout=StringIO(), stderr=StringIO())
+
+
+class ProvisionGamesCommandTests(TestCase):
+    def test_count_creates_games_and_prints_ids(self) -> None:
+        stdout = StringIO()
+
+        call_command("provision_games", "--count", "7", "--chunk-size", "3", stdout=stdout)
+
+        ids = [int(line) for line in stdout.getvalue().split()]
+        self.assertEqual(len(ids), 7)
+        self.assertEqual(Game.objects.filter(pk__in=ids).count(), 7)
+
+    def test_codes_file_is_validated_before_inserting(self) -> None:
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as codes_file:
+            codes_file.write("1234\n12x4\n")
+            codes_file.flush()
+
+            with self.assertRaises(CommandError):
+                call_command("provision_games", "--codes-file", codes_file.name, stdout=StringIO())
+
+        self.assertFalse(Game.objects.exists())
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from games.models import Game, GameGuess
+from games.writer import SerializedWriter, WriterBusy, writer
+
+THREADS = 8
+GUESSES_PER_THREAD = 6
+MAX_ATTEMPTS = 30
+
+
+def hammer(game: Game) -> Counter:
+    """
+    Fire THREADS x GUESSES_PER_THREAD concurrent guesses at `game` and tally the response codes.
+    """
+    outcomes: Counter = Counter()
+    outcomes_lock = threading.Lock()
+    barrier = threading.Barrier(THREADS)
+
+    def worker() -> None:
+        client = APIClient()
+        barrier.wait()
+        try:
+            for _ in range(GUESSES_PER_THREAD):
+                try:
+                    response = client.post(f"/api/games/{game.id}/guess/", {"code": "5678"}, format="json")
+                    outcome = response.status_code
+                except DatabaseError:
+                    outcome = "database-error"
+                with outcomes_lock:
+                    outcomes[outcome] += 1
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+class GuessContentionTests(TransactionTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def _run_mode(self, mode: str) -> dict[str, object]:
+        game = Game.objects.create(code="1234", max_attempts=MAX_ATTEMPTS)
+        with override_settings(GAMES_GUESS_CONCURRENCY=mode):
+            outcomes = hammer(game)
+
+        game.refresh_from_db()
+        recorded = GameGuess.objects.filter(game=game).count()
+        return {"outcomes": outcomes, "attempts_used": game.attempts_used, "recorded": recorded}
+
+    def test_both_paths_keep_attempts_and_guesses_in_step_under_contention(self) -> None:
+        # Throughput is compared by `manage.py benchmark_sqlite --guess-concurrency locking
+        # --guess-concurrency optimistic`, not here, where it would depend on the machine's load.
+        locking = self._run_mode("locking")
+        optimistic = self._run_mode("optimistic")
+        results = {"locking": locking, "optimistic": optimistic}
+
+        # Both paths must keep attempts_used and the audit rows in step and never overshoot.
+        for result in results.values():
+            self.assertEqual(result["attempts_used"], result["recorded"], results)
+            self.assertLessEqual(result["attempts_used"], MAX_ATTEMPTS, results)
+
+        # The optimistic path resolves every request as either an accepted guess or a clean 409.
+        outcomes = optimistic["outcomes"]
+        self.assertEqual(outcomes[200], MAX_ATTEMPTS, results)
+        self.assertEqual(outcomes[409], THREADS * GUESSES_PER_THREAD - MAX_ATTEMPTS, results)
+        self.assertNotIn("database-error", outcomes, results)
+
+
+class SerializedWriterTests(TransactionTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def tearDown(self) -> None:
+        writer.stop()
+
+    @override_settings(GAMES_SERIALIZED_WRITES=True)
+    def test_guesses_are_funnelled_through_writer_thread(self) -> None:
+        game = Game.objects.create(code="1234", max_attempts=MAX_ATTEMPTS)
+
+        outcomes = hammer(game)
+
+        game.refresh_from_db()
+        self.assertEqual(outcomes[200], MAX_ATTEMPTS)
+        self.assertEqual(outcomes[409], THREADS * GUESSES_PER_THREAD - MAX_ATTEMPTS)
+        self.assertEqual(GameGuess.objects.filter(game=game).count(), MAX_ATTEMPTS)
+
+    def test_writer_runs_on_one_thread_and_reraises_errors(self) -> None:
+        thread_names = {writer.submit(lambda: threading.current_thread().name) for _ in range(3)}
+        self.assertEqual(thread_names, {"games-writer"})
+
+        with self.assertRaises(ZeroDivisionError):
+            writer.submit(lambda: 1 / 0)
+
+    def test_write_still_queued_at_timeout_is_cancelled(self) -> None:
+        busy = SerializedWriter(timeout=0.1)
+        release = threading.Event()
+        ran = []
+        blocker = threading.Thread(target=busy.submit, args=(release.wait,))
+        blocker.start()
+        try:
+            with self.assertRaises(WriterBusy):
+                busy.submit(ran.append, "queued")
+        finally:
+            release.set()
+            blocker.join()
+            busy.stop()
+
+        self.assertEqual(ran, [])
+
+    def test_write_running_at_timeout_is_waited_for(self) -> None:
+        busy = SerializedWriter(timeout=0.05)
+        try:
+            self.assertEqual(busy.submit(lambda: threading.Event().wait(0.2) or "committed"), "committed")
+        finally:
+            busy.stop()
+
+    @override_settings(GAMES_SERIALIZED_WRITES=True)
+    def test_cancelled_guess_write_answers_503(self) -> None:
+        game = Game.objects.create(code="1234", max_attempts=MAX_ATTEMPTS)
+
+        with mock.patch("games.views.run_write", side_effect=WriterBusy):
+            response = APIClient().post(f"/api/games/{game.id}/guess/", {"code": "5678"}, format="json")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(GameGuess.objects.exists())
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from codebreaker.docs import _read_schema
+from games.management.commands.benchmark_startup import probe
+
+
+class ApiDocsTests(SimpleTestCase):
+    def setUp(self):
+        _read_schema.cache_clear()
+        self.addCleanup(_read_schema.cache_clear)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_prebuilt_schema_is_served_as_is(self):
+        schema_file = self.directory / "openapi.json"
+        schema_file.write_text('{"openapi": "3.0.3"}')
+
+        with override_settings(API_SCHEMA_FILE=schema_file):
+            response = self.client.get("/docs/schema/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.oai.openapi+json")
+        self.assertEqual(response.content, b'{"openapi": "3.0.3"}')
+
+    def test_schema_is_generated_without_a_prebuilt_file(self):
+        with override_settings(API_SCHEMA_FILE=self.directory / "missing.yaml"):
+            response = self.client.get("/docs/schema/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"/api/games/{game_id}/guess/", response.content)
+
+    def test_schema_file_built_after_the_first_request_is_served(self):
+        schema_file = self.directory / "openapi.json"
+
+        with override_settings(API_SCHEMA_FILE=schema_file):
+            generated = self.client.get("/docs/schema/")
+            schema_file.write_text('{"openapi": "3.0.3"}')
+            prebuilt = self.client.get("/docs/schema/")
+
+        self.assertIn(b"/api/games/{game_id}/guess/", generated.content)
+        self.assertEqual(prebuilt.content, b'{"openapi": "3.0.3"}')
+
+    def test_swagger_ui_is_served(self):
+        response = self.client.get("/docs/swagger/")
+
+        self.assertEqual(response.status_code, 200)
+
+
+class StartupProbeTests(SimpleTestCase):
+    def test_docs_stay_unloaded_when_disabled(self):
+        for target in ("wsgi", "asgi"):
+            with self.subTest(target=target):
+                result = probe(target, "/metrics", {"CODEBREAKER_API_DOCS": "0"})
+
+                self.assertEqual(result["status"], 200)
+                self.assertFalse(result["docs_loaded"])
+                self.assertGreater(result["first_request_ms"], 0)
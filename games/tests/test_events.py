@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from games.events import END_EVENT, get_backend
+from games.models import Game
+
+
+async def next_chunk(response) -> str:
+    chunk = await asyncio.wait_for(anext(response.streaming_content), timeout=5)
+    return chunk.decode()
+
+
+class GameEventsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def post_guesses(self, game: Game, *codes: str) -> None:
+        client = APIClient()
+        for code in codes:
+            client.post(f"/api/games/{game.id}/guess/", {"code": code}, format="json")
+
+    async def test_streams_snapshot_then_published_guesses_until_finished(self) -> None:
+        game = await Game.objects.acreate(code="1234")
+
+        response = await self.async_client.get(f"/api/games/{game.id}/events/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+        snapshot = await next_chunk(response)
+        self.assertTrue(snapshot.startswith("id: 0\nevent: game\n"))
+        self.assertTrue(get_backend().has_subscribers(game.id))
+
+        await sync_to_async(self.post_guesses)(game, "5678")
+        guess = await next_chunk(response)
+        self.assertTrue(guess.startswith("id: 1\nevent: guess\n"))
+        self.assertIn('"guess":"5678"', guess)
+
+        await sync_to_async(self.post_guesses)(game, "1234")
+        final = await next_chunk(response)
+        self.assertTrue(final.endswith(END_EVENT))
+        with self.assertRaises(StopAsyncIteration):
+            await next_chunk(response)
+        self.assertFalse(get_backend().has_subscribers(game.id))
+
+    async def test_finished_game_sends_snapshot_and_ends(self) -> None:
+        game = await Game.objects.acreate(code="1234", is_solved=True, attempts_used=1)
+
+        response = await self.async_client.get(f"/api/games/{game.id}/events/")
+
+        chunks = [chunk.decode() async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), 2)
+        self.assertIn('"is_solved":true', chunks[0])
+        self.assertEqual(chunks[1], END_EVENT)
+
+    async def test_unknown_game_returns_404(self) -> None:
+        response = await self.async_client.get("/api/games/999999/events/")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_publishing_without_subscribers_is_a_no_op(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        response = APIClient().post(f"/api/games/{game.id}/guess/", {"code": "5678"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(get_backend().has_subscribers(game.id))
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from games.archive import archive_games
+from games.models import ArchivedGame, Game, GameGuess
+
+
+def read_lines(response) -> list[dict]:
+    body = b"".join(response.streaming_content).decode()
+    return [json.loads(line) for line in body.splitlines()]
+
+
+class ExportGamesTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.games = [Game.objects.create(code="1234") for _ in range(5)]
+        for game in self.games[:2]:
+            for code in ("5678", "1234"):
+                self.client.post(f"/api/games/{game.id}/guess/", {"code": code}, format="json")
+
+    @override_settings(GAMES_EXPORT_BATCH_SIZE=2)
+    def test_streams_every_game_with_its_guesses_in_keyset_batches(self) -> None:
+        response = self.client.get("/api/games/export/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        # Three batches of games plus the empty query that ends them, one guess query and one archive
+        # query per batch, and the archive past the last game.
+        with self.assertNumQueries(11):
+            lines = read_lines(response)
+
+        self.assertEqual([line["game"]["id"] for line in lines], [game.id for game in self.games])
+        self.assertEqual([guess["guess"] for guess in lines[0]["guesses"]], ["5678", "1234"])
+        self.assertEqual(lines[0]["game"]["is_solved"], True)
+        self.assertEqual(lines[4]["guesses"], [])
+
+    def test_resumes_from_cursor(self) -> None:
+        lines = read_lines(self.client.get("/api/games/export/"))
+
+        resumed = read_lines(self.client.get("/api/games/export/", {"cursor": lines[2]["cursor"]}))
+
+        self.assertEqual([line["game"]["id"] for line in resumed], [game.id for game in self.games[3:]])
+
+    def test_filters_by_solved_state_and_created_at(self) -> None:
+        Game.objects.filter(pk=self.games[4].pk).update(created_at=timezone.now() - timedelta(days=2))
+
+        solved = read_lines(self.client.get("/api/games/export/", {"is_solved": "true"}))
+        recent = read_lines(
+            self.client.get("/api/games/export/", {"created_after": (timezone.now() - timedelta(days=1)).isoformat()})
+        )
+
+        self.assertEqual([line["game"]["id"] for line in solved], [game.id for game in self.games[:2]])
+        self.assertEqual(len(recent), 4)
+        self.assertNotIn(self.games[4].id, [line["game"]["id"] for line in recent])
+
+    @override_settings(GAMES_EXPORT_BATCH_SIZE=2)
+    def test_archived_games_are_exported_in_order(self) -> None:
+        Game.objects.filter(pk__in=[self.games[0].pk, self.games[2].pk]).update(
+            created_at=timezone.now() - timedelta(days=60)
+        )
+        Game.objects.filter(pk=self.games[2].pk).update(attempts_used=10, max_attempts=10)
+        list(archive_games(timezone.now() - timedelta(days=30)))
+        self.assertEqual(ArchivedGame.objects.count(), 2)
+
+        lines = read_lines(self.client.get("/api/games/export/"))
+        resumed = read_lines(self.client.get("/api/games/export/", {"cursor": lines[0]["cursor"]}))
+
+        order = [self.games[0].id, self.games[2].id, self.games[1].id, self.games[3].id, self.games[4].id]
+        self.assertEqual([line["game"]["id"] for line in lines], order)
+        self.assertEqual([guess["guess"] for guess in lines[0]["guesses"]], ["5678", "1234"])
+        self.assertEqual(lines[0]["game"]["is_solved"], True)
+        self.assertEqual([line["game"]["id"] for line in resumed], order[1:])
+
+    @override_settings(GAMES_EXPORT_BATCH_SIZE=2)
+    def test_game_in_both_tables_is_exported_once_from_the_archive(self) -> None:
+        Game.objects.filter(pk=self.games[0].pk).update(created_at=timezone.now() - timedelta(days=60))
+        # Stop archive_games between copying the game and deleting it.
+        with mock.patch("games.archive._delete_games"):
+            list(archive_games(timezone.now() - timedelta(days=30)))
+        self.assertTrue(Game.objects.filter(pk=self.games[0].pk).exists())
+        GameGuess.objects.filter(game=self.games[0]).delete()
+
+        lines = read_lines(self.client.get("/api/games/export/"))
+
+        self.assertEqual([line["game"]["id"] for line in lines], [game.id for game in self.games])
+        self.assertEqual([guess["guess"] for guess in lines[0]["guesses"]], ["5678", "1234"])
+
+    def test_invalid_cursor_is_rejected_before_streaming(self) -> None:
+        response = self.client.get("/api/games/export/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", response.data)
+
+    def test_command_writes_and_resumes_a_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "export.ndjson"
+            call_command("export_games", "--output", str(path), "--unsolved", stderr=StringIO())
+            lines = [json.loads(line) for line in path.read_text().splitlines()]
+            self.assertEqual([line["game"]["id"] for line in lines], [game.id for game in self.games[2:]])
+
+            path.write_text("".join(json.dumps(line) + "\n" for line in lines[:1]))
+            call_command(
+                "export_games", "--output", str(path), "--unsolved", "--cursor", lines[0]["cursor"], stderr=StringIO()
+            )
+
+            resumed = [json.loads(line)["game"]["id"] for line in path.read_text().splitlines()]
+            self.assertEqual(resumed, [game.id for game in self.games[2:]])
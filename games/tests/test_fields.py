@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pickle
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from games.models import Game, GameGuess
+from games.services import (
+    CODE_SPACE,
+    MAX_CODE_LENGTH,
+    SYMBOLS,
+    StoredCode,
+    code_to_index,
+    code_to_value,
+    score_guess,
+    value_to_code,
+)
+
+
+class CodeValueTests(SimpleTestCase):
+    def test_round_trip_keeps_leading_zeros_and_length(self):
+        for code in ("0000", "0012", "1234", "9999", "00000A", "ZZZZZZZZZZZZ", "0" * MAX_CODE_LENGTH):
+            with self.subTest(code=code):
+                self.assertEqual(value_to_code(code_to_value(code)), code)
+
+    def test_classic_codes_are_their_feedback_table_index(self):
+        for code in ("0000", "0012", "1234", "9999"):
+            with self.subTest(code=code):
+                self.assertEqual(code_to_value(code), code_to_index(code))
+        self.assertGreaterEqual(code_to_value("000A"), CODE_SPACE)
+        self.assertGreaterEqual(code_to_value("00000"), CODE_SPACE)
+
+    def test_stored_codes_score_like_strings_and_survive_pickling(self):
+        for secret in ("0012", "A1B2"):
+            stored = StoredCode(code_to_value(secret))
+            with self.subTest(secret=secret):
+                self.assertEqual(stored, secret)
+                self.assertEqual(score_guess("0021", stored), score_guess("0021", secret))
+                self.assertEqual(pickle.loads(pickle.dumps(stored)).value, stored.value)
+
+    def test_codes_of_different_lengths_never_collide(self):
+        self.assertNotEqual(code_to_value("0000"), code_to_value("00000"))
+        self.assertEqual(code_to_value("ZZZZ") + 1, code_to_value("00000"))
+
+    def test_longest_code_fits_a_signed_64_bit_column(self):
+        self.assertLess(code_to_value(SYMBOLS[-1] * MAX_CODE_LENGTH), 2**63)
+
+    def test_non_codes_are_rejected(self):
+        for value in ("", "12a4", "12-4", "1" * (MAX_CODE_LENGTH + 1)):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                code_to_value(value)
+
+
+class IntegerCodeStorageTests(TestCase):
+    def test_codes_are_stored_as_integers_and_read_back_as_strings(self):
+        game = Game.objects.create(code="0012")
+        GameGuess.objects.create(game=game, guess="0021", well_placed=2, misplaced=2)
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT code FROM games_game WHERE id = %s", [game.pk])
+            self.assertEqual(cursor.fetchone()[0], code_to_value("0012"))
+
+        game.refresh_from_db()
+        self.assertEqual(game.code, "0012")
+        self.assertEqual(game.code.value, 12)
+        self.assertEqual(list(GameGuess.objects.values_list("guess", flat=True)), ["0021"])
+
+    def test_lookups_take_code_strings(self):
+        game = Game.objects.create(code="A1B2", alphabet_size=12)
+        Game.objects.create(code="1234")
+
+        self.assertEqual(list(Game.objects.filter(code="A1B2")), [game])
+        self.assertEqual(Game.objects.filter(code__in=["A1B2", "1234", "0000"]).count(), 2)
+
+    def test_invalid_lookup_value_raises(self):
+        with self.assertRaisesMessage(ValueError, "Field 'code' expected a code"):
+            Game.objects.filter(code="12?4").exists()
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from games.idempotency import purge_expired
+from games.models import Game, GameGuess, IdempotencyRecord
+
+
+class IdempotencyKeyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.game = Game.objects.create(code="1234", max_attempts=5)
+
+    def guess(self, code: str, key: str = "retry-1"):
+        return self.client.post(
+            f"/api/games/{self.game.id}/guess/", {"code": code}, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retried_guess_is_replayed_without_consuming_an_attempt(self):
+        first = self.guess("1256")
+        retry = self.guess("1256")
+
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 1)
+        self.assertEqual(GameGuess.objects.filter(game=self.game).count(), 1)
+
+    def test_guess_replay_survives_cache_loss(self):
+        first = self.guess("1256")
+        cache.clear()
+
+        retry = self.guess("1256")
+
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(GameGuess.objects.filter(game=self.game).count(), 1)
+
+    def test_batch_retry_is_replayed(self):
+        url = f"/api/games/{self.game.id}/guesses/"
+        payload = {"codes": ["5678", "1256"]}
+
+        first = self.client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="batch")
+        retry = self.client.post(url, payload, format="json", HTTP_IDEMPOTENCY_KEY="batch")
+
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(GameGuess.objects.filter(game=self.game).count(), 2)
+
+    def test_key_reused_for_a_different_body_is_rejected(self):
+        self.guess("1256")
+
+        response = self.guess("5678")
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(GameGuess.objects.filter(game=self.game).count(), 1)
+
+    def test_keys_are_scoped_per_game(self):
+        other = Game.objects.create(code="5678", max_attempts=5)
+        self.guess("1256")
+
+        response = self.client.post(
+            f"/api/games/{other.id}/guess/", {"code": "1256"}, format="json", HTTP_IDEMPOTENCY_KEY="retry-1"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+
+    def test_keys_are_scoped_per_client(self):
+        self.guess("1256")
+
+        response = self.client.post(
+            f"/api/games/{self.game.id}/guess/",
+            {"code": "1256"},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY="retry-1",
+            REMOTE_ADDR="10.0.0.9",
+        )
+
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 2)
+
+    def test_guess_and_record_commit_together(self):
+        with mock.patch("games.views.guess_representation", side_effect=RuntimeError("crash")):
+            with self.assertRaises(RuntimeError):
+                self.guess("1256")
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 0)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+        retry = self.guess("1256")
+
+        self.assertEqual(retry.status_code, 200)
+        self.assertEqual(retry.data["game"]["attempts_used"], 1)
+        self.assertEqual(IdempotencyRecord.objects.get().status_code, 200)
+
+    def test_failed_request_does_not_hold_the_key(self):
+        invalid = self.guess("12")
+        self.assertEqual(invalid.status_code, 400)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+    def test_requests_without_a_key_are_not_deduplicated(self):
+        url = f"/api/games/{self.game.id}/guess/"
+        self.client.post(url, {"code": "1256"}, format="json")
+        self.client.post(url, {"code": "1256"}, format="json")
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 2)
+
+    def test_overlong_key_is_rejected(self):
+        response = self.guess("1256", key="k" * 256)
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_retried_create_returns_the_same_game(self):
+        first = self.client.post("/api/games/", {"code": "4321"}, format="json", HTTP_IDEMPOTENCY_KEY="create-1")
+        retry = self.client.post("/api/games/", {"code": "4321"}, format="json", HTTP_IDEMPOTENCY_KEY="create-1")
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data["id"], first.data["id"])
+        self.assertEqual(Game.objects.count(), 2)
+
+    def test_purge_deletes_only_expired_records(self):
+        self.guess("1256", key="old")
+        self.guess("5678", key="new")
+        IdempotencyRecord.objects.filter(key="old").update(created_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(purge_expired(chunk_size=1), 1)
+        self.assertEqual(list(IdempotencyRecord.objects.values_list("key", flat=True)), ["new"])
+
+    def test_purge_command(self):
+        self.guess("1256", key="old")
+        IdempotencyRecord.objects.update(created_at=timezone.now() - timedelta(days=2))
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+
+class ConcurrentRetryTests(TransactionTestCase):
+    def test_concurrent_duplicates_record_one_guess(self):
+        cache.clear()
+        game = Game.objects.create(code="1234", max_attempts=10)
+        threads = 6
+        barrier = threading.Barrier(threads)
+        statuses: list[int] = []
+        lock = threading.Lock()
+
+        def worker():
+            client = APIClient()
+            barrier.wait()
+            response = client.post(
+                f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json", HTTP_IDEMPOTENCY_KEY="dup"
+            )
+            with lock:
+                statuses.append(response.status_code)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual(statuses, [200] * threads)
+        game.refresh_from_db()
+        self.assertEqual(game.attempts_used, 1)
+        self.assertEqual(GameGuess.objects.filter(game=game).count(), 1)
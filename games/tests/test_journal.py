@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from games.journal import check_write_behind_support, guess_journal, reserve_guess_ids
+from games.models import Game, GameGuess
+
+
+@override_settings(GAMES_WRITE_BEHIND=True)
+class WriteBehindJournalTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.game = Game.objects.create(code="1234", max_attempts=3)
+        # Keep the flusher idle so each test decides when entries reach the database.
+        self.flush_interval = guess_journal.flush_interval
+        guess_journal.flush_interval = 60
+
+    def tearDown(self):
+        guess_journal.stop()
+        guess_journal.flush_interval = self.flush_interval
+
+    def test_guess_is_answered_before_it_is_flushed(self):
+        response = self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "1256"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["game"]["attempts_used"], 1)
+        self.assertEqual(response.data["guess"]["well_placed"], 2)
+        self.assertFalse(GameGuess.objects.exists())
+
+    def test_reads_include_unflushed_guesses(self):
+        self.client.post(f"/api/games/{self.game.id}/guesses/", {"codes": ["5678", "1256"]}, format="json")
+        cache.clear()
+
+        detail = self.client.get(f"/api/games/{self.game.id}/")
+        history = self.client.get(f"/api/games/{self.game.id}/history/")
+        hint = self.client.get(f"/api/games/{self.game.id}/hint/")
+
+        self.assertEqual(detail.data["attempts_used"], 2)
+        self.assertEqual([entry["guess"] for entry in history.data["history"]], ["5678", "1256"])
+        self.assertEqual(hint.status_code, 200)
+
+    def test_flush_writes_guesses_and_game_state(self):
+        response = self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "1256"}, format="json")
+
+        self.assertEqual(guess_journal.flush(), 1)
+
+        guess = GameGuess.objects.get()
+        self.assertEqual(guess.pk, response.data["guess"]["id"])
+        self.assertEqual(guess.created_at.isoformat().replace("+00:00", "Z"), response.data["guess"]["created_at"])
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 1)
+        self.assertEqual(guess_journal.flush(), 0)
+
+    def test_stop_drains_the_journal(self):
+        self.client.post(f"/api/games/{self.game.id}/guesses/", {"codes": ["5678", "1234"]}, format="json")
+
+        guess_journal.stop()
+
+        self.assertEqual(GameGuess.objects.filter(game=self.game).count(), 2)
+        self.game.refresh_from_db()
+        self.assertTrue(self.game.is_solved)
+        self.assertIsNone(guess_journal.game(self.game.id))
+
+    def test_closed_game_is_rejected_from_memory(self):
+        self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "1234"}, format="json")
+
+        response = self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "1234"}, format="json")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data, {"error": "Game is already solved."})
+
+    def test_unknown_game_returns_404(self):
+        response = self.client.post("/api/games/999999/guess/", {"code": "1234"}, format="json")
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_guesses_written_by_other_paths_do_not_collide(self):
+        self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "5678"}, format="json")
+        other = Game.objects.create(code="1234")
+        direct = GameGuess.objects.create(game=other, guess="0000", well_placed=0, misplaced=0)
+        self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "1256"}, format="json")
+
+        self.assertEqual(guess_journal.flush(), 2)
+
+        self.assertEqual(GameGuess.objects.count(), 3)
+        journaled = GameGuess.objects.exclude(pk=direct.pk).values_list("pk", flat=True)
+        self.assertTrue(all(pk < direct.pk for pk in journaled))
+
+    def test_guess_ids_are_reserved_without_holding_the_journal_lock(self):
+        held = []
+
+        def reserve(count):
+            held.append(guess_journal._lock.locked())
+            return reserve_guess_ids(count)
+
+        with mock.patch("games.journal.reserve_guess_ids", side_effect=reserve):
+            response = self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "5678"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(held, [False])
+
+    def test_full_journal_refuses_guesses(self):
+        other = Game.objects.create(code="1234")
+        self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "5678"}, format="json")
+
+        with mock.patch.object(guess_journal, "max_pending", 1), mock.patch("games.journal._FULL_WAIT_SECONDS", 0):
+            response = self.client.post(f"/api/games/{other.id}/guess/", {"code": "5678"}, format="json")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(guess_journal.flush(), 1)
+
+    def test_idle_and_surplus_games_leave_memory_once_flushed(self):
+        games = [self.game, Game.objects.create(code="1234"), Game.objects.create(code="1234")]
+        for game in games:
+            self.client.post(f"/api/games/{game.id}/guess/", {"code": "5678"}, format="json")
+
+        with mock.patch.object(guess_journal, "max_games", 2):
+            guess_journal.flush()
+
+        self.assertIsNone(guess_journal.game(games[0].id))
+        self.assertIsNotNone(guess_journal.game(games[2].id))
+
+        with mock.patch.object(guess_journal, "idle_seconds", 0):
+            guess_journal.flush()
+
+        self.assertIsNone(guess_journal.game(games[2].id))
+        response = self.client.post(f"/api/games/{games[2].id}/guess/", {"code": "1256"}, format="json")
+        self.assertEqual(response.data["game"]["attempts_used"], 2)
+
+    def test_rejected_game_does_not_block_the_batch(self):
+        doomed = Game.objects.create(code="1234")
+        self.client.post(f"/api/games/{doomed.id}/guess/", {"code": "5678"}, format="json")
+        self.client.post(f"/api/games/{self.game.id}/guess/", {"code": "5678"}, format="json")
+        Game.objects.filter(pk=doomed.pk).delete()
+
+        with self.assertLogs("games.journal", "ERROR"):
+            self.assertEqual(guess_journal.flush(), 1)
+
+        self.assertEqual(list(GameGuess.objects.values_list("game_id", flat=True)), [self.game.id])
+        self.assertEqual(guess_journal.flush(), 0)
+
+
+class WriteBehindSupportTests(SimpleTestCase):
+    def test_write_behind_is_refused_where_ids_cannot_be_reserved(self):
+        with mock.patch("games.journal.connection", mock.Mock(vendor="mysql")):
+            check_write_behind_support()
+            with override_settings(GAMES_WRITE_BEHIND=True), self.assertRaises(ImproperlyConfigured):
+                check_write_behind_support()
+
+    @override_settings(GAMES_WRITE_BEHIND=True)
+    def test_write_behind_is_allowed_on_sqlite(self):
+        check_write_behind_support()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from games.metrics import (
+    HISTOGRAMS,
+    LOCK_WAIT_SECONDS,
+    SCORING_SECONDS,
+    SQL_QUERIES,
+    VIEW_SECONDS,
+    Histogram,
+)
+from games.models import Game
+
+
+class HistogramTests(SimpleTestCase):
+    def test_render_uses_cumulative_buckets(self) -> None:
+        histogram = Histogram("test_seconds", "Test histogram.", (0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe("demo", value)
+
+        lines = histogram.render()
+
+        self.assertIn("# TYPE test_seconds histogram", lines)
+        self.assertIn('test_seconds_bucket{view="demo",le="0.1"} 2', lines)
+        self.assertIn('test_seconds_bucket{view="demo",le="1.0"} 3', lines)
+        self.assertIn('test_seconds_bucket{view="demo",le="+Inf"} 4', lines)
+        self.assertIn('test_seconds_count{view="demo"} 4', lines)
+        self.assertIn('test_seconds_sum{view="demo"} 3.65', lines)
+
+
+class MetricsMiddlewareTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+
+    def _count(self, histogram: Histogram, view: str) -> str | None:
+        prefix = f'{histogram.name}_count{{view="{view}"}} '
+        return next((line[len(prefix):] for line in histogram.render() if line.startswith(prefix)), None)
+
+    @override_settings(GAMES_METRICS_SAMPLE_RATE=1.0, GAMES_METRICS_TOKEN="scrape-token")
+    def test_sampled_requests_record_phases(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+
+        self.assertEqual(self._count(VIEW_SECONDS, "check-guess"), "1")
+        self.assertEqual(self._count(SQL_QUERIES, "check-guess"), "1")
+        self.assertEqual(self._count(SCORING_SECONDS, "check-guess"), "1")
+        self.assertEqual(self._count(LOCK_WAIT_SECONDS, "check-guess"), "1")
+
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('codebreaker_serialization_seconds_count{view="check-guess"} 1', response.content.decode())
+        self.assertNotIn('view="metrics"', response.content.decode())
+
+    @override_settings(GAMES_METRICS_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_recorded(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        self.client.get(f"/api/games/{game.id}/")
+
+        self.assertIsNone(self._count(VIEW_SECONDS, "game-detail"))
+
+    @override_settings(GAMES_METRICS_SAMPLE_RATE=1.0)
+    async def test_async_requests_record_sql_from_the_view_thread(self) -> None:
+        game = await Game.objects.acreate(code="1234")
+
+        await self.async_client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, content_type="application/json")
+
+        self.assertEqual(self._count(SQL_QUERIES, "check-guess"), "1")
+        self.assertEqual(self._count(SCORING_SECONDS, "check-guess"), "1")
+        self.assertNotIn('codebreaker_sql_queries_sum{view="check-guess"} 0', SQL_QUERIES.render())
+
+
+class MetricsAccessTests(APITestCase):
+    def test_anonymous_requests_are_refused(self) -> None:
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+
+    @override_settings(GAMES_METRICS_TOKEN="scrape-token")
+    def test_bearer_token_must_match(self) -> None:
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-token").status_code, 200)
+
+    def test_staff_users_are_allowed(self) -> None:
+        self.client.force_login(User.objects.create_user("ops", is_staff=True))
+
+        self.assertEqual(self.client.get("/metrics").status_code, 200)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.test import TestCase
+
+from games.models import Game
+from games.provisioning import codes_to_indices, generate_codes, invalid_code_positions, provision_games
+from games.services import CODE_SPACE
+
+
+class ProvisioningTests(TestCase):
+    def test_generate_codes_stays_in_code_space(self) -> None:
+        codes = generate_codes(5000)
+
+        self.assertEqual(codes.shape, (5000,))
+        self.assertGreaterEqual(int(codes.min()), 0)
+        self.assertLess(int(codes.max()), CODE_SPACE)
+        self.assertGreater(len(set(codes.tolist())), 3000)
+
+    def test_invalid_code_positions_matches_validator_rules(self) -> None:
+        codes = ["1234", "0000", "12a4", "123", "12345", "", "١٢٣٤", " 123", "9999"]
+
+        self.assertEqual(invalid_code_positions(codes), [2, 3, 4, 5, 6, 7])
+        self.assertEqual(codes_to_indices(["0042", "9999"]).tolist(), [42, 9999])
+
+    def test_provision_games_inserts_in_chunks(self) -> None:
+        chunks = list(provision_games(codes=["0001", "0002", "0003"], chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        games = Game.objects.filter(pk__in=[pk for chunk in chunks for pk in chunk]).order_by("pk")
+        self.assertEqual([game.code for game in games], ["0001", "0002", "0003"])
+
+        generated = [pk for chunk in provision_games(count=5, chunk_size=2) for pk in chunk]
+        self.assertEqual(len(generated), 5)
+        codes = Game.objects.filter(pk__in=generated).values_list("code", flat=True)
+        self.assertTrue(all(len(code) == 4 and code.isdigit() for code in codes))
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+
+from games.models import Game, GameGuess
+
+
+@skipUnless(connection.vendor == "sqlite", "Query plans are asserted in SQLite's EXPLAIN QUERY PLAN format.")
+class QueryPlanTests(TestCase):
+    """
+    Guard the hot queries against silently falling back to full table scans.
+    """
+
+    def assertUsesIndex(self, queryset, index_name: str) -> None:
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+
+    def test_game_listing_uses_created_id_index(self) -> None:
+        self.assertUsesIndex(Game.objects.order_by("-created_at", "-id")[:50], "game_created_id_idx")
+
+    def test_unsolved_listing_uses_partial_index(self) -> None:
+        queryset = Game.objects.filter(is_solved=False, attempts_used__lt=F("max_attempts"))
+        self.assertUsesIndex(queryset.order_by("-created_at", "-id")[:50], "game_unsolved_created_id_idx")
+
+    def test_guess_history_uses_game_created_index(self) -> None:
+        self.assertUsesIndex(GameGuess.objects.filter(game_id=1), "gameguess_game_created_idx")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from games.models import Game
+from games.ratelimit import LocalTokenBuckets, get_backend
+
+
+class LocalTokenBucketsTests(SimpleTestCase):
+    def setUp(self):
+        self.buckets = LocalTokenBuckets()
+        self.limit = {"burst": 3, "per_second": 2.0}
+        patcher = mock.patch("games.ratelimit.time.monotonic", return_value=100.0)
+        self.clock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_allows_a_burst_then_refuses_until_a_token_refills(self):
+        self.assertEqual([self.buckets.take("a", self.limit) for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(self.buckets.take("a", self.limit), 0.5)
+
+        self.clock.return_value = 100.5
+        self.assertEqual(self.buckets.take("a", self.limit), 0.0)
+        self.assertGreater(self.buckets.take("a", self.limit), 0.0)
+
+    def test_idle_bucket_refills_only_up_to_the_burst(self):
+        for _ in range(3):
+            self.buckets.take("a", self.limit)
+        self.clock.return_value = 1000.0
+
+        allowed = [self.buckets.take("a", self.limit) == 0.0 for _ in range(4)]
+
+        self.assertEqual(allowed, [True, True, True, False])
+
+    def test_buckets_are_independent(self):
+        for _ in range(3):
+            self.buckets.take("a", self.limit)
+
+        self.assertEqual(self.buckets.take("b", self.limit), 0.0)
+
+    def test_cost_spends_several_tokens(self):
+        self.assertEqual(self.buckets.take("a", self.limit, cost=2), 0.0)
+        self.assertAlmostEqual(self.buckets.take("a", self.limit, cost=2), 0.5)
+        self.assertEqual(self.buckets.take("a", self.limit), 0.0)
+        self.assertGreater(self.buckets.take("a", self.limit, cost=4), 0.0)
+
+    def test_refilled_buckets_are_swept(self):
+        for index in range(1024):
+            self.buckets.take(f"key-{index}", self.limit)
+        self.clock.return_value = 200.0
+
+        self.buckets.take("fresh", self.limit)
+        self.buckets._sweep(200.0)
+
+        self.assertEqual(list(self.buckets._full_at), ["fresh"])
+
+
+@override_settings(
+    GAMES_RATE_LIMITS={
+        "create": {"burst": 2, "per_second": 0.1},
+        "bulk_create": {"burst": 5, "per_second": 0.1},
+        "guess": {"burst": 5, "per_second": 0.1},
+        "game_guess": {"burst": 2, "per_second": 0.1},
+    }
+)
+class RateLimitedViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        get_backend.cache_clear()
+        self.addCleanup(get_backend.cache_clear)
+        self.client = APIClient()
+        self.game = Game.objects.create(code="1234", max_attempts=20)
+
+    def guess(self, game_id: int, address: str = "10.0.0.1"):
+        return self.client.post(
+            f"/api/games/{game_id}/guess/", {"code": "5678"}, format="json", REMOTE_ADDR=address
+        )
+
+    def test_refused_guess_gets_429_with_retry_after(self):
+        self.guess(self.game.id)
+        self.guess(self.game.id)
+
+        response = self.guess(self.game.id)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "10")
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.attempts_used, 2)
+
+    def test_game_limit_is_per_game_and_client_limit_spans_games(self):
+        other = Game.objects.create(code="1234", max_attempts=20)
+        third = Game.objects.create(code="1234", max_attempts=20)
+        statuses = [self.guess(game_id).status_code for game_id in (self.game.id, self.game.id, other.id, other.id)]
+
+        self.assertEqual(statuses, [200, 200, 200, 200])
+        self.assertEqual(self.guess(third.id).status_code, 200)
+        self.assertEqual(self.guess(third.id).status_code, 429)
+
+    def test_clients_are_limited_separately(self):
+        self.guess(self.game.id)
+        self.guess(self.game.id)
+
+        self.assertEqual(self.guess(self.game.id, address="10.0.0.2").status_code, 200)
+
+    def test_spoofed_forwarded_for_does_not_reset_the_bucket(self):
+        self.guess(self.game.id)
+        self.guess(self.game.id)
+
+        response = self.client.post(
+            f"/api/games/{self.game.id}/guess/",
+            {"code": "5678"},
+            format="json",
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR="203.0.113.7",
+        )
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_batch_guesses_share_the_guess_buckets(self):
+        self.guess(self.game.id)
+        self.guess(self.game.id)
+
+        response = self.client.post(
+            f"/api/games/{self.game.id}/guesses/", {"codes": ["5678"]}, format="json", REMOTE_ADDR="10.0.0.1"
+        )
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_create_is_limited_but_listing_is_not(self):
+        statuses = [self.client.post("/api/games/", {"code": "1234"}, format="json").status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(self.client.get("/api/games/").status_code, 200)
+
+    def test_bulk_create_is_charged_per_game(self):
+        statuses = []
+        for body in ({"count": 3}, {"codes": ["1234", "5678", "0000"]}, {"codes": ["1234", "5678"]}):
+            response = self.client.post("/api/games/bulk/", body, format="json")
+            statuses.append(response.status_code)
+            if response.status_code == 201:
+                b"".join(response.streaming_content)
+
+        self.assertEqual(statuses, [201, 429, 201])
+        self.assertEqual(Game.objects.count(), 6)
+
+    @override_settings(GAMES_RATE_LIMITS={})
+    def test_unconfigured_scopes_are_not_limited(self):
+        statuses = {self.guess(self.game.id).status_code for _ in range(5)}
+
+        self.assertEqual(statuses, {200})
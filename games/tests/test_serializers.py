@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from games.history import PackedGuess
+from games.models import Game, GameGuess
+from games.renderers import FastJSONRenderer
+from games.serializers import (
+    GameSerializer,
+    GuessHistoryResponseSerializer,
+    GuessResponseSerializer,
+    GuessSerializer,
+    game_representation,
+    guess_representation,
+)
+
+CREATED_AT = datetime(2025, 11, 11, 12, 9, 30, 123456, tzinfo=timezone.utc)
+
+
+class CompiledRepresentationTests(SimpleTestCase):
+    def test_game_representation_matches_serializer(self) -> None:
+        games = [
+            Game(id=1, code="0123", created_at=CREATED_AT),
+            Game(id=2, code="9999", attempts_used=12, max_attempts=10, is_solved=True, created_at=CREATED_AT),
+            Game(id=3, code="1234", created_at=None),
+        ]
+        for game in games:
+            self.assertEqual(game_representation(game), GameSerializer(game).data)
+
+    def test_guess_representation_matches_serializer(self) -> None:
+        game = Game(id=7, code="1234", created_at=CREATED_AT)
+        guesses = [
+            GameGuess(id=1, game=game, guess="1256", well_placed=2, misplaced=0, created_at=CREATED_AT),
+            PackedGuess(id=2, game_id=7, guess="4321", well_placed=0, misplaced=4, created_at=CREATED_AT),
+        ]
+        for guess in guesses:
+            self.assertEqual(guess_representation(guess), GuessSerializer(guess).data)
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertRendersIdentically(self, data, accepted_media_type=None, renderer_context=None) -> None:
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type, renderer_context),
+            JSONRenderer().render(data, accepted_media_type, renderer_context),
+        )
+
+    def test_matches_json_renderer(self) -> None:
+        game = Game(id=1, code="0123", created_at=CREATED_AT)
+        guess = GameGuess(id=1, game=game, guess="1256", well_placed=2, misplaced=0, created_at=CREATED_AT)
+
+        self.assertRendersIdentically(GuessResponseSerializer({"game": game, "guess": guess}).data)
+        self.assertRendersIdentically(GuessHistoryResponseSerializer({"game": game, "history": [guess]}).data)
+        self.assertRendersIdentically({"error": "Game is already solved.", "note": "ünïcode \u2028 \u2029"})
+        self.assertRendersIdentically({"code": [ErrorDetail("Value must be exactly 4 digits.", code="invalid")]})
+        self.assertRendersIdentically(None)
+
+    def test_falls_back_for_rich_types_and_indentation(self) -> None:
+        self.assertRendersIdentically({"created_at": CREATED_AT})
+        self.assertRendersIdentically({"id": 1}, "application/json; indent=4")
+        self.assertRendersIdentically({"id": 1}, None, {"indent": 2})
+
+
+class HotEndpointOutputTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_responses_are_byte_identical_to_serializer_output(self) -> None:
+        game = Game.objects.create(code="1234")
+        response = self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+
+        game.refresh_from_db()
+        guess = GameGuess.objects.get(game=game)
+        expected = JSONRenderer().render(GuessResponseSerializer({"game": game, "guess": guess}).data)
+        self.assertEqual(response.content, expected)
+
+        history = self.client.get(f"/api/games/{game.id}/history/")
+        expected = JSONRenderer().render(GuessHistoryResponseSerializer({"game": game, "history": [guess]}).data)
+        self.assertEqual(history.content, expected)
+
+        detail = self.client.get(f"/api/games/{game.id}/")
+        self.assertEqual(detail.content, JSONRenderer().render(GameSerializer(game).data))
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import random
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, override_settings
+
+from games.services import (
+    CODE_SPACE,
+    MAX_CODE_LENGTH,
+    SYMBOLS,
+    code_to_index,
+    encode_code,
+    evaluate_guess,
+    feedback_table,
+    index_to_code,
+    load_feedback_table,
+    pack_score,
+    save_feedback_table,
+    score_batch,
+    score_encoded,
+    score_guess,
+    unpack_score,
+)
+
+
+def _reference_score(guess: str, secret: str) -> int:
+    evaluation = evaluate_guess([int(char) for char in guess], [int(char) for char in secret])
+    return pack_score(evaluation["well_placed"], evaluation["misplaced"])
+
+
+class FeedbackTableTests(SimpleTestCase):
+    def test_pack_and_unpack_round_trip(self) -> None:
+        for well_placed in range(5):
+            for misplaced in range(5 - well_placed):
+                packed = pack_score(well_placed, misplaced)
+                self.assertEqual(unpack_score(packed), {"well_placed": well_placed, "misplaced": misplaced})
+
+    def test_score_batch_matches_reference_for_sampled_rows(self) -> None:
+        rng = random.Random(1234)
+        guesses = [index_to_code(index) for index in rng.sample(range(CODE_SPACE), 40)]
+        guesses += ["0000", "1122", "9999", "1234"]
+        secrets = [index_to_code(index) for index in range(CODE_SPACE)]
+
+        scores = score_batch(guesses, range(CODE_SPACE))
+
+        for row, guess in enumerate(guesses):
+            expected = [_reference_score(guess, secret) for secret in secrets]
+            np.testing.assert_array_equal(scores[row], expected, err_msg=f"guess {guess}")
+
+    def test_feedback_table_matches_score_batch_and_reference(self) -> None:
+        table = feedback_table()
+        self.assertEqual(table.shape, (CODE_SPACE, CODE_SPACE))
+        self.assertFalse(table.flags.writeable)
+
+        rng = random.Random(4321)
+        for _ in range(5000):
+            guess = index_to_code(rng.randrange(CODE_SPACE))
+            secret = index_to_code(rng.randrange(CODE_SPACE))
+            self.assertEqual(table[int(guess), int(secret)], _reference_score(guess, secret))
+
+        rows = rng.sample(range(CODE_SPACE), 20)
+        np.testing.assert_array_equal(table[rows], score_batch(rows, range(CODE_SPACE)))
+
+    def test_saved_table_is_mapped_read_only(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "table.npy"
+            save_feedback_table(path, feedback_table())
+
+            table = load_feedback_table(path)
+
+            self.assertIsInstance(table.base, np.memmap)
+            self.assertFalse(table.flags.writeable)
+            self.assertEqual(table[1256, 1234], pack_score(2, 0))
+            self.assertEqual(list(Path(directory).iterdir()), [path])
+            del table
+
+    def test_stale_or_malformed_table_file_is_rejected(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            stale = Path(directory) / "stale.npy"
+            save_feedback_table(stale, np.zeros((CODE_SPACE, CODE_SPACE), dtype=np.uint8))
+            wrong_shape = Path(directory) / "shape.npy"
+            save_feedback_table(wrong_shape, np.zeros((10, 10), dtype=np.uint8))
+
+            for path in (stale, wrong_shape):
+                with self.subTest(path=path.name), self.assertRaises(ValueError):
+                    load_feedback_table(path)
+
+    def test_unwritable_table_file_falls_back_with_a_warning(self) -> None:
+        self.addCleanup(feedback_table.cache_clear)
+        feedback_table.cache_clear()
+        built = np.zeros((1, 1), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            GAMES_FEEDBACK_TABLE_FILE=Path(directory) / "cache" / "table.npy"
+        ), mock.patch("games.services.build_feedback_table", return_value=built), mock.patch(
+            "games.services.save_feedback_table", side_effect=PermissionError("read-only")
+        ), self.assertLogs("games.services", "WARNING") as logs:
+            self.assertIs(feedback_table(), built)
+
+        self.assertIn("read-only", logs.output[0])
+
+    def test_score_guess_handles_repeated_digits(self) -> None:
+        self.assertEqual(score_guess("1122", "2211"), {"well_placed": 0, "misplaced": 4})
+        self.assertEqual(score_guess("1111", "1222"), {"well_placed": 1, "misplaced": 0})
+        self.assertEqual(score_guess("0012", "2100"), {"well_placed": 0, "misplaced": 4})
+        self.assertEqual(score_guess("1234", "1234"), {"well_placed": 4, "misplaced": 0})
+
+
+class ConfigurableCodeTests(SimpleTestCase):
+    def test_bitset_scoring_matches_reference(self) -> None:
+        rng = random.Random(99)
+        for _ in range(5000):
+            code_length = rng.randint(4, MAX_CODE_LENGTH)
+            symbols = SYMBOLS[: rng.randint(2, len(SYMBOLS))]
+            guess = "".join(rng.choice(symbols) for _ in range(code_length))
+            secret = "".join(rng.choice(symbols) for _ in range(code_length))
+            expected = evaluate_guess([int(char, 36) for char in guess], [int(char, 36) for char in secret])
+
+            self.assertEqual(score_encoded(encode_code(guess), encode_code(secret), code_length), expected)
+            self.assertEqual(score_guess(guess, secret), expected, f"{guess} vs {secret}")
+
+    def test_long_codes_with_repeated_symbols(self) -> None:
+        self.assertEqual(score_guess("AABBCCDDEEFF", "FFEEDDCCBBAA"), {"well_placed": 0, "misplaced": 12})
+        self.assertEqual(score_guess("ZZZZZZZZZZZZ", "ZZZZZZZZZZZZ"), {"well_placed": 12, "misplaced": 0})
+        self.assertEqual(score_guess("00000A", "A00000"), {"well_placed": 4, "misplaced": 2})
+
+    def test_index_round_trip_for_other_alphabets(self) -> None:
+        for code, alphabet_size in (("0F3A", 16), ("101101", 2), ("ZZZZZZZZZZZZ", 36), ("000012", 3)):
+            index = code_to_index(code, alphabet_size)
+            self.assertEqual(index_to_code(index, len(code), alphabet_size), code)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from games.services import code_to_index, feedback_table, index_to_code, pack_score, score_guess
+from games.solver import (
+    OPENING_GUESS,
+    SECOND_GUESSES,
+    build_history,
+    candidates_for,
+    minimax_guess,
+    suggest_guess,
+)
+
+
+def _play(secret: str, guess: str) -> tuple[str, int, int]:
+    evaluation = score_guess(guess, secret)
+    return guess, evaluation["well_placed"], evaluation["misplaced"]
+
+
+class SolverTests(SimpleTestCase):
+    def test_candidates_are_consistent_with_history(self) -> None:
+        history = build_history([_play("4821", "0123"), _play("4821", "4455")])
+
+        candidates = candidates_for(history)
+
+        self.assertIn(code_to_index("4821"), candidates.tolist())
+        for guess_index, score in history:
+            self.assertTrue(np.all(feedback_table()[guess_index, candidates] == score))
+
+    def test_candidates_narrow_from_cached_prefix(self) -> None:
+        history = build_history([_play("9876", "0123"), _play("9876", "4567")])
+
+        prefix = candidates_for(history[:1])
+        narrowed = candidates_for(history)
+
+        self.assertTrue(set(narrowed.tolist()) <= set(prefix.tolist()))
+        self.assertIs(candidates_for(history), narrowed)
+
+    def test_opening_tree_matches_minimax(self) -> None:
+        self.assertEqual(suggest_guess(()), OPENING_GUESS)
+        opening_row = feedback_table()[code_to_index(OPENING_GUESS)]
+        for score in (pack_score(0, 4), pack_score(1, 3), pack_score(2, 0), pack_score(3, 0)):
+            candidates = np.flatnonzero(opening_row == score)
+            self.assertEqual(index_to_code(minimax_guess(candidates)), SECOND_GUESSES[score])
+
+    def test_block_size_does_not_change_the_choice(self) -> None:
+        candidates = candidates_for(build_history([_play("5566", "0000")]))
+
+        with mock.patch("games.solver._BLOCK_CELLS", candidates.size * 7):
+            small_blocks = minimax_guess(candidates)
+
+        self.assertEqual(small_blocks, minimax_guess(candidates))
+        self.assertEqual(index_to_code(small_blocks), "1234")
+
+    def test_suggestions_solve_sampled_secrets(self) -> None:
+        for secret in ("0000", "4821", "9999", "1122", "7305"):
+            entries: list[tuple[str, int, int]] = []
+            while not entries or entries[-1][1] != 4:
+                entries.append(_play(secret, suggest_guess(build_history(entries))))
+            self.assertLessEqual(len(entries), 7, secret)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from games.management.commands.rebuild_stats import Command as RebuildStatsCommand
+from games.models import Game, StatBucket, StatCounter
+
+
+class StatsTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def play(self, code: str, guesses: list[str]) -> int:
+        game_id = self.client.post("/api/games/", {"code": code}, format="json").data["id"]
+        for guess in guesses:
+            self.client.post(f"/api/games/{game_id}/guess/", {"code": guess}, format="json")
+        return game_id
+
+    def test_stats_are_maintained_by_create_and_guess(self) -> None:
+        self.play("1234", ["5678", "1234"])
+        self.play("1234", ["5678", "1243", "1234"])
+        self.play("1234", ["1243"])
+        self.play("1234", [])
+        # The API cannot set max_attempts, so this game is created directly and counted by hand.
+        exhausted = Game.objects.create(code="1234", max_attempts=1)
+        StatCounter.objects.filter(name="games_created").update(value=5)
+        self.client.post(f"/api/games/{exhausted.id}/guess/", {"code": "0000"}, format="json")
+
+        response = self.client.get("/api/stats/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "games_created": 5,
+                "games_solved": 2,
+                "games_exhausted": 1,
+                "games_active": 2,
+                "solve_rate": 0.4,
+                "attempts_to_solve": {"2": 1, "3": 1},
+                "top_first_guesses": [
+                    {"guess": "5678", "count": 2},
+                    {"guess": "0000", "count": 1},
+                    {"guess": "1243", "count": 1},
+                ],
+            },
+        )
+
+    def test_batch_guesses_update_stats(self) -> None:
+        game_id = self.play("1234", [])
+        self.client.post(f"/api/games/{game_id}/guesses/", {"codes": ["4321", "1234", "5678"]}, format="json")
+
+        stats = self.client.get("/api/stats/").data
+
+        self.assertEqual(stats["attempts_to_solve"], {"2": 1})
+        self.assertEqual(stats["top_first_guesses"], [{"guess": "4321", "count": 1}])
+
+    def test_bulk_provisioning_counts_created_games(self) -> None:
+        self.client.post("/api/games/bulk/", {"count": 3}, format="json").getvalue()
+
+        self.assertEqual(self.client.get("/api/stats/").data["games_created"], 3)
+
+    def test_empty_stats(self) -> None:
+        stats = self.client.get("/api/stats/").data
+
+        self.assertEqual(stats["games_created"], 0)
+        self.assertIsNone(stats["solve_rate"])
+        self.assertEqual(stats["top_first_guesses"], [])
+
+
+class RebuildStatsCommandTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_verify_passes_for_incremental_stats(self) -> None:
+        game_id = self.client.post("/api/games/", {"code": "1234"}, format="json").data["id"]
+        self.client.post(f"/api/games/{game_id}/guesses/", {"codes": ["5678", "1234"]}, format="json")
+        out = StringIO()
+
+        call_command("rebuild_stats", "--verify", stdout=out)
+
+        self.assertIn("Verified stats for 1 games.", out.getvalue())
+
+    def test_rebuild_restores_drifted_stats(self) -> None:
+        for code in ("1234", "5678", "1111"):
+            game_id = self.client.post("/api/games/", {"code": code}, format="json").data["id"]
+            self.client.post(f"/api/games/{game_id}/guess/", {"code": "1234"}, format="json")
+        expected = self.client.get("/api/stats/").data
+        StatCounter.objects.update(value=0)
+        StatBucket.objects.filter(histogram="first_guess").delete()
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_stats", "--verify", stdout=StringIO(), stderr=StringIO())
+        call_command("rebuild_stats", "--chunk-size", "2", stdout=StringIO())
+
+        self.assertEqual(self.client.get("/api/stats/").data, expected)
+        call_command("rebuild_stats", "--verify", stdout=StringIO())
+
+
+class RebuildConcurrencyTests(TransactionTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_game_created_during_rebuild_is_not_lost(self) -> None:
+        APIClient().post("/api/games/", {"code": "1234"}, format="json")
+        compute = RebuildStatsCommand._compute
+        writers = []
+
+        def create_game() -> None:
+            try:
+                APIClient().post("/api/games/", {"code": "5678"}, format="json")
+            finally:
+                connection.close()
+
+        def compute_then_create(command, chunk_size):
+            expected = compute(command, chunk_size)
+            writer = threading.Thread(target=create_game)
+            writer.start()
+            writers.append(writer)
+            # Give the writer every chance to commit between the count and the replacement.
+            writer.join(timeout=0.5)
+            return expected
+
+        with mock.patch.object(RebuildStatsCommand, "_compute", compute_then_create):
+            call_command("rebuild_stats", stdout=StringIO())
+        writers[0].join()
+
+        self.assertEqual(Game.objects.count(), 2)
+        call_command("rebuild_stats", "--verify", stdout=StringIO())
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import override_settings
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from games.models import Game, GameGuess
+from games import cache as game_cache
+from games.models import Game, GameGuess, StatBucket
+from games.serializers import game_representation
 
 
 class GameAPITests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_create_game_success(self) -> None:
         response = self.client.post("/api/games/", {"code": "1234"}, format="json")
 
@@ -15,6 +27,10 @@ class GameAPITests(APITestCase):
         self.assertEqual(response.data["attempts_used"], 0)
         self.assertTrue(Game.objects.filter(code="1234").exists())
 
+    def test_game_collection_keeps_its_url_name(self) -> None:
+        # The list endpoint shares the create route; its name is relied on by reverse() callers.
+        self.assertEqual(reverse("create-game"), "/api/games/")
+
     def test_create_game_invalid_code(self) -> None:
         response = self.client.post("/api/games/", {"code": "12a4"}, format="json")
 
@@ -92,3 +108,354 @@ class GameAPITests(APITestCase):
         self.assertEqual(payload["attempts_used"], 3)
         self.assertEqual(payload["remaining_attempts"], 7)
 
+    def test_check_guess_batch_scores_guesses_in_order(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        response = self.client.post(
+            f"/api/games/{game.id}/guesses/",
+            {"codes": ["1256", "4321"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual([result["guess"] for result in results], ["1256", "4321"])
+        self.assertEqual(results[0]["well_placed"], 2)
+        self.assertEqual(results[1]["misplaced"], 4)
+        self.assertEqual(set(results[0]), {"id", "game_id", "guess", "well_placed", "misplaced", "created_at"})
+        self.assertIsNotNone(results[0]["id"])
+        self.assertEqual(response.data["game"]["attempts_used"], 2)
+
+        history = self.client.get(f"/api/games/{game.id}/history/").data["history"]
+        self.assertEqual([entry["id"] for entry in history], [result["id"] for result in results])
+
+    def test_check_guess_batch_stops_when_solved(self) -> None:
+        game = Game.objects.create(code="1234")
+        # Existing histogram buckets cost one UPDATE each: first guess and attempts to solve.
+        StatBucket.objects.create(histogram="first_guess", bucket="5678")
+        StatBucket.objects.create(histogram="attempts_to_solve", bucket="2")
+
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                f"/api/games/{game.id}/guesses/",
+                {"codes": ["5678", "1234", "4321"]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertTrue(response.data["game"]["is_solved"])
+
+        game.refresh_from_db()
+        self.assertEqual(game.attempts_used, 2)
+        self.assertTrue(game.is_solved)
+        self.assertEqual(GameGuess.objects.filter(game=game).count(), 2)
+
+    def test_check_guess_batch_stops_when_attempts_exhausted(self) -> None:
+        game = Game.objects.create(code="1234", attempts_used=8, max_attempts=10)
+
+        response = self.client.post(
+            f"/api/games/{game.id}/guesses/",
+            {"codes": ["5678", "8765", "1234"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertEqual(response.data["game"]["remaining_attempts"], 0)
+        self.assertFalse(response.data["game"]["is_solved"])
+
+    def test_check_guess_batch_rejects_invalid_code(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        response = self.client.post(
+            f"/api/games/{game.id}/guesses/",
+            {"codes": ["5678", "12a4"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(GameGuess.objects.filter(game=game).exists())
+
+    def test_check_guess_batch_conflict_when_game_solved(self) -> None:
+        game = Game.objects.create(code="1234", is_solved=True)
+
+        response = self.client.post(
+            f"/api/games/{game.id}/guesses/",
+            {"codes": ["1234"]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_game_hint_suggests_consistent_code(self) -> None:
+        game = Game.objects.create(code="4821")
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "0123"}, format="json")
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "5678"}, format="json")
+
+        response = self.client.get(f"/api/games/{game.id}/hint/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["hint"]), 4)
+        self.assertGreaterEqual(response.data["remaining_candidates"], 1)
+
+    def test_game_hint_conflict_when_game_solved(self) -> None:
+        game = Game.objects.create(code="1234", is_solved=True)
+
+        response = self.client.get(f"/api/games/{game.id}/hint/")
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_game_detail_returns_not_modified_for_matching_etag(self) -> None:
+        game = Game.objects.create(code="9876")
+        first = self.client.get(f"/api/games/{game.id}/")
+        etag = first["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(f"/api/games/{game.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_check_guess_refreshes_cached_detail_and_history(self) -> None:
+        game = Game.objects.create(code="1234")
+        detail_etag = self.client.get(f"/api/games/{game.id}/")["ETag"]
+        history_etag = self.client.get(f"/api/games/{game.id}/history/")["ETag"]
+
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+
+        with self.assertNumQueries(0):
+            detail = self.client.get(f"/api/games/{game.id}/", HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail.data["attempts_used"], 1)
+
+        history = self.client.get(f"/api/games/{game.id}/history/", HTTP_IF_NONE_MATCH=history_etag)
+        self.assertEqual(history.status_code, status.HTTP_200_OK)
+        self.assertEqual([entry["guess"] for entry in history.data["history"]], ["1256"])
+
+    def test_history_filled_from_an_older_read_is_not_served(self) -> None:
+        game = Game.objects.create(code="1234")
+        stale = {"game": game_representation(game), "history": []}
+
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+        game_cache.fill_history_state(game, stale)
+        history = self.client.get(f"/api/games/{game.id}/history/")
+
+        self.assertEqual([entry["guess"] for entry in history.data["history"]], ["1256"])
+
+    def test_out_of_order_refresh_keeps_the_later_state(self) -> None:
+        game = Game.objects.create(code="1234")
+        earlier = Game.objects.get(pk=game.pk)
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+
+        game_cache.refresh_after_guess(earlier, game_representation(earlier))
+
+        self.assertEqual(self.client.get(f"/api/games/{game.id}/").data["attempts_used"], 1)
+
+    def test_etag_covers_every_field(self) -> None:
+        game = Game.objects.create(code="1234")
+        etag = self.client.get(f"/api/games/{game.id}/")["ETag"]
+
+        Game.objects.filter(pk=game.pk).update(max_attempts=12)
+        game_cache.invalidate_game(game.pk)
+        response = self.client.get(f"/api/games/{game.id}/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["max_attempts"], 12)
+
+    def test_finished_game_responses_are_long_lived(self) -> None:
+        game = Game.objects.create(code="1234")
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1234"}, format="json")
+
+        response = self.client.get(f"/api/games/{game.id}/history/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("immutable", response["Cache-Control"])
+
+    @override_settings(GAMES_GUESS_CONCURRENCY="optimistic")
+    def test_optimistic_check_guess_records_guess(self) -> None:
+        game = Game.objects.create(code="1234", attempts_used=9, max_attempts=10)
+
+        response = self.client.post(f"/api/games/{game.id}/guess/", {"code": "1234"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["game"]["attempts_used"], 10)
+        self.assertTrue(response.data["game"]["is_solved"])
+        self.assertEqual(response.data["guess"]["well_placed"], 4)
+
+        again = self.client.post(f"/api/games/{game.id}/guess/", {"code": "1234"}, format="json")
+        self.assertEqual(again.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(GameGuess.objects.filter(game=game).count(), 1)
+
+    @override_settings(GAMES_GUESS_CONCURRENCY="optimistic")
+    def test_optimistic_check_guess_not_found(self) -> None:
+        response = self.client.post("/api/games/999999/guess/", {"code": "1234"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_guess_history_from_packed_column_matches_join(self) -> None:
+        game = Game.objects.create(code="1234")
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+        self.client.post(f"/api/games/{game.id}/guesses/", {"codes": ["4321", "1234"]}, format="json")
+
+        cache.clear()
+        joined = self.client.get(f"/api/games/{game.id}/history/").data
+
+        cache.clear()
+        with override_settings(GAMES_PACKED_HISTORY=True), self.assertNumQueries(1):
+            packed = self.client.get(f"/api/games/{game.id}/history/").data
+
+        self.assertEqual(packed, joined)
+        self.assertEqual([entry["guess"] for entry in packed["history"]], ["1256", "4321", "1234"])
+
+    @override_settings(GAMES_GUESS_CONCURRENCY="optimistic", GAMES_PACKED_HISTORY=True)
+    def test_optimistic_check_guess_marks_packed_history_stale(self) -> None:
+        game = Game.objects.create(code="1234")
+
+        self.client.post(f"/api/games/{game.id}/guess/", {"code": "1256"}, format="json")
+
+        game.refresh_from_db()
+        self.assertIsNone(game.packed_history)
+        history = self.client.get(f"/api/games/{game.id}/history/").data["history"]
+        self.assertEqual([entry["guess"] for entry in history], ["1256"])
+
+    def test_list_games_paginates_newest_first_with_cursor(self) -> None:
+        games = [Game.objects.create(code=f"{index:04d}") for index in range(5)]
+
+        with self.assertNumQueries(1):
+            first = self.client.get("/api/games/", {"limit": 3})
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([game["id"] for game in first.data["results"]], [game.id for game in games[:1:-1]])
+        self.assertIsNotNone(first.data["next_cursor"])
+
+        second = self.client.get("/api/games/", {"limit": 3, "cursor": first.data["next_cursor"]})
+
+        self.assertEqual([game["id"] for game in second.data["results"]], [games[1].id, games[0].id])
+        self.assertIsNone(second.data["next_cursor"])
+
+    def test_list_games_filters_by_state(self) -> None:
+        active = Game.objects.create(code="1111")
+        exhausted = Game.objects.create(code="2222", attempts_used=10, max_attempts=10)
+        solved = Game.objects.create(code="3333", attempts_used=2, is_solved=True)
+
+        def listed(params: dict[str, str]) -> list[int]:
+            return [game["id"] for game in self.client.get("/api/games/", params).data["results"]]
+
+        self.assertEqual(listed({"state": "active"}), [active.id])
+        self.assertEqual(listed({"state": "exhausted"}), [exhausted.id])
+        self.assertEqual(listed({"is_solved": "true"}), [solved.id])
+        self.assertEqual(listed({"is_solved": "false"}), [exhausted.id, active.id])
+
+    def test_list_games_rejects_invalid_cursor(self) -> None:
+        response = self.client.get("/api/games/", {"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", response.data)
+
+    def test_list_games_query_count_does_not_grow_with_page_size(self) -> None:
+        for index in range(20):
+            game = Game.objects.create(code=f"{index:04d}")
+            GameGuess.objects.create(game=game, guess="9999", well_placed=0, misplaced=0)
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/games/", {"limit": 20})
+
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_create_games_bulk_streams_created_ids(self) -> None:
+        response = self.client.post("/api/games/bulk/", {"count": 25}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        ids = [line["id"] for line in lines[:-1]]
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(lines[-1], {"status": "complete", "created": 25})
+        self.assertEqual(Game.objects.filter(pk__in=ids).count(), 25)
+
+    def test_create_games_bulk_with_explicit_codes(self) -> None:
+        response = self.client.post("/api/games/bulk/", {"codes": ["0012", "9876"]}, format="json")
+
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        ids = [json.loads(line)["id"] for line in lines[:-1]]
+        codes = Game.objects.filter(pk__in=ids).order_by("pk").values_list("code", flat=True)
+        self.assertEqual(list(codes), ["0012", "9876"])
+
+    @override_settings(GAMES_BULK_CHUNK_SIZE=2)
+    def test_create_games_bulk_reports_a_failed_chunk(self) -> None:
+        with mock.patch("games.provisioning.record_games_created", side_effect=[None, DatabaseError("down")]):
+            response = self.client.post("/api/games/bulk/", {"count": 5}, format="json")
+            lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[-1]["status"], "error")
+        self.assertEqual(lines[-1]["created"], 2)
+        self.assertEqual(Game.objects.count(), 2)
+
+    def test_create_games_bulk_fails_plainly_before_streaming(self) -> None:
+        with mock.patch("games.provisioning.record_games_created", side_effect=DatabaseError("down")):
+            response = self.client.post("/api/games/bulk/", {"count": 5}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertFalse(Game.objects.exists())
+
+    def test_create_games_bulk_rejects_invalid_codes(self) -> None:
+        response = self.client.post("/api/games/bulk/", {"codes": ["0012", "98a6"]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Value must be exactly 4 digits.", str(response.data["codes"]))
+        self.assertFalse(Game.objects.exists())
+
+    def test_create_games_bulk_requires_exactly_one_source(self) -> None:
+        response = self.client.post("/api/games/bulk/", {"codes": ["0012"], "count": 3}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConfigurableGameTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_game_with_longer_code_and_larger_alphabet(self) -> None:
+        response = self.client.post(
+            "/api/games/", {"code": "0A1B2C", "code_length": 6, "alphabet_size": 13}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((response.data["code_length"], response.data["alphabet_size"]), (6, 13))
+        game_id = response.data["id"]
+
+        response = self.client.post(f"/api/games/{game_id}/guess/", {"code": "A0B1C2"}, format="json")
+        self.assertEqual(response.data["guess"]["misplaced"], 6)
+        self.assertFalse(response.data["game"]["is_solved"])
+
+        response = self.client.post(f"/api/games/{game_id}/guesses/", {"codes": ["0A1B2C", "000000"]}, format="json")
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertTrue(response.data["game"]["is_solved"])
+
+        with override_settings(GAMES_PACKED_HISTORY=True):
+            history = self.client.get(f"/api/games/{game_id}/history/").data["history"]
+        self.assertEqual([entry["guess"] for entry in history], ["A0B1C2", "0A1B2C"])
+
+    def test_codes_are_validated_against_the_game_configuration(self) -> None:
+        response = self.client.post("/api/games/", {"code": "0A1B2C", "code_length": 6}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Value must be exactly 6 digits.", response.data["code"][0])
+
+        game = Game.objects.create(code="0123", alphabet_size=6)
+        response = self.client.post(f"/api/games/{game.id}/guess/", {"code": "0129"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Value must be exactly 4 symbols from 012345.", response.data["code"][0])
+
+        response = self.client.post(f"/api/games/{game.id}/guesses/", {"codes": ["0123", "012345"]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(GameGuess.objects.exists())
+
+    def test_hint_requires_a_classic_game(self) -> None:
+        game = Game.objects.create(code="ABCDE", code_length=5, alphabet_size=16)
+
+        response = self.client.get(f"/api/games/{game.id}/hint/")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
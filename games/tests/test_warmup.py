@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import os
+import statistics
+import sys
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TransactionTestCase
+
+from games.management.commands.benchmark_startup import probe_prefork
+from games.models import Game
+
+WORKERS = 3
+
+
+@skipUnless(sys.platform == "linux" and hasattr(os, "fork"), "needs fork() and /proc/self/smaps_rollup")
+class PreforkWarmUpTests(TransactionTestCase):
+    """
+    Fork workers from a parent that imported codebreaker.wsgi, with and without CODEBREAKER_WARMUP.
+    """
+
+    def measure(self, warm_up: bool) -> list[dict]:
+        env = {
+            "CODEBREAKER_SQLITE_PATH": str(connection.settings_dict["NAME"]),
+            "CODEBREAKER_WARMUP": "1" if warm_up else "0",
+        }
+        return probe_prefork("wsgi", f"/api/games/{self.game.id}/hint/", WORKERS, env)
+
+    def setUp(self):
+        self.game = Game.objects.create(code="1234")
+
+    def test_warm_workers_serve_requests_and_share_more_memory(self):
+        # First-request latency is compared by `manage.py benchmark_startup --workers`; here it would
+        # depend on the machine's load.
+        cold, warm = self.measure(warm_up=False), self.measure(warm_up=True)
+
+        self.assertEqual({report["status"] for report in cold + warm}, {200})
+        # Without warm-up each worker imports the views and DRF into its own private pages.
+        self.assertLess(
+            statistics.median(report["private_kb"] for report in warm),
+            statistics.median(report["private_kb"] for report in cold),
+        )
+        self.assertTrue(all(report["rss_kb"] > report["private_kb"] for report in warm))
@@ -1,11 +1,34 @@
 from django.urls import path
 
-from .views import check_guess, create_game, game_detail, guess_history
+from .views import (
+    challenge_detail,
+    check_guess,
+    check_guess_batch,
+    create_challenge,
+    create_games_bulk,
+    export_games,
+    game_events,
+    game_collection,
+    game_detail,
+    game_hint,
+    game_stats,
+    guess_history,
+    join_challenge,
+)
 
 urlpatterns = [
-    path("games/", create_game, name="create-game"),
+    path("games/", game_collection, name="create-game"),
+    path("games/bulk/", create_games_bulk, name="create-games-bulk"),
+    path("games/export/", export_games, name="export-games"),
     path("games/<int:game_id>/guess/", check_guess, name="check-guess"),
+    path("games/<int:game_id>/guesses/", check_guess_batch, name="check-guess-batch"),
     path("games/<int:game_id>/", game_detail, name="game-detail"),
     path("games/<int:game_id>/history/", guess_history, name="guess-history"),
+    path("games/<int:game_id>/hint/", game_hint, name="game-hint"),
+    path("games/<int:game_id>/events/", game_events, name="game-events"),
+    path("stats/", game_stats, name="game-stats"),
+    path("challenges/", create_challenge, name="create-challenge"),
+    path("challenges/<int:challenge_id>/", challenge_detail, name="challenge-detail"),
+    path("challenges/<int:challenge_id>/games/", join_challenge, name="join-challenge"),
 ]
 
@@ -1,21 +1,67 @@
-from typing import Mapping
+import itertools
+import json
+from typing import AsyncIterator, Callable, Iterator, Mapping
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import F
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema
-from rest_framework import status
-from rest_framework.decorators import api_view
+from django.utils.http import parse_etags
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 
-from .models import Game, GameGuess
+from . import cache as game_cache
+from .archive import archived_game, is_archived
+from .events import END_EVENT, format_event, get_backend, publish_guesses
+from .export import export_lines, export_queryset
+from .history import append_guesses, unpack_history
+from .idempotency import after_commit, idempotent
+from .journal import GameClosed, JournalFull, guess_journal, write_behind_enabled
+from .metrics import timed
+from .models import Challenge, Game, GameGuess
+from .pagination import encode_cursor, keyset_page
+from .provisioning import provision_games
+from .ratelimit import BulkCreateRateThrottle, CreateRateThrottle, GameGuessRateThrottle, GuessRateThrottle
 from .serializers import (
+    BulkGameSerializer,
+    ChallengeCreateSerializer,
+    ChallengeDetailResponseSerializer,
+    ChallengeSerializer,
+    CodeBatchSerializer,
     CodeSerializer,
+    GameCreateSerializer,
+    GameExportQuerySerializer,
+    GameListQuerySerializer,
+    GameListResponseSerializer,
     GameSerializer,
+    GuessBatchResponseSerializer,
     GuessHistoryResponseSerializer,
     GuessResponseSerializer,
-    GuessSerializer,
+    HintResponseSerializer,
+    StatsResponseSerializer,
+    game_representation,
+    guess_representation,
+)
+from .services import feedback_row
+from .solver import build_history, candidates_for, suggest_guess
+from .stats import read_challenge_stats, read_stats, record_games_created, record_guesses
+from .writer import WriterBusy, run_write
+
+
+GUESS_THROTTLES = [GuessRateThrottle, GameGuessRateThrottle]
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    name="Idempotency-Key",
+    location=OpenApiParameter.HEADER,
+    required=False,
+    description="Retries with the same key replay the first response instead of repeating the request.",
 )
-from .services import evaluate_guess
 
 
 def _validate_code(data: Mapping[str, object]) -> str:
@@ -24,13 +70,85 @@ def _validate_code(data: Mapping[str, object]) -> str:
     return serializer.validated_data["code"]
 
 
-@extend_schema(tags=["Games"], request=CodeSerializer, responses=GameSerializer)
-@api_view(["POST"])
-def create_game(request) -> Response:
-    code = _validate_code(request.data)
+def _closed_game_response(game: Game) -> Response | None:
+    if game.is_solved:
+        return Response(
+            {"error": "Game is already solved."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    if game.attempts_used >= game.max_attempts:
+        return Response(
+            {"error": "Maximum number of attempts reached."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    return None
+
 
+def _validate_guesses(game: Game, codes: list[str], field: str = "codes") -> None:
+    # Requests are validated against the widest configuration first; this applies the game's own.
+    validator = game.code_validator
+    errors = {index: [validator.message] for index, code in enumerate(codes) if not validator.regex.search(code)}
+    if errors:
+        raise serializers.ValidationError({field: errors[0] if field == "code" else errors})
+
+
+def _load_game(game_id: int) -> Game:
+    if write_behind_enabled():
+        game = guess_journal.game(game_id)
+        if game is not None:
+            return game
     try:
-        game = Game.objects.create(code=code)
+        return Game.objects.get(pk=game_id)
+    except Game.DoesNotExist:
+        game = archived_game(game_id)
+        if game is None:
+            raise Http404
+        return game
+
+
+def _archived_game_response(game_id: int) -> Response:
+    # Only reached when a write found no live game; archived games are finished, so they are closed.
+    game = archived_game(game_id)
+    if game is None:
+        raise Http404
+    return _closed_game_response(game)
+
+
+def _announce_guesses(game: Game, game_data: dict, guesses_data: list[dict]) -> None:
+    # With a durable Idempotency-Key the guesses commit together with their record, so the cache and
+    # event streams only hear of them once that transaction has committed.
+    def announce() -> None:
+        game_cache.refresh_after_guess(game, game_data)
+        publish_guesses(game_data, guesses_data)
+
+    after_commit(announce)
+
+
+def _cached_response(request, state: game_cache.CachedState) -> Response:
+    if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+    if state["etag"] in if_none_match or "*" in if_none_match:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(state["data"], status=status.HTTP_200_OK)
+
+    response["ETag"] = state["etag"]
+    if state["finished"]:
+        response["Cache-Control"] = f"max-age={game_cache.cache_timeout(True)}, immutable"
+    else:
+        response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _create_game(request) -> Response:
+    serializer = GameCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        with transaction.atomic():
+            game = Game.objects.create(**serializer.validated_data)
+            record_games_created()
     except IntegrityError:
         return Response(
             {"error": "Failed to create game due to integrity error."},
@@ -42,33 +160,158 @@ def create_game(request) -> Response:
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    serializer = GameSerializer(game)
-    return Response(serializer.data, status=status.HTTP_201_CREATED)
+    with timed("serialization"):
+        data = game_representation(game)
+    game_cache.store_game_state(game, data)
+    return Response(data, status=status.HTTP_201_CREATED)
+
+
+def _list_games(request) -> Response:
+    query_serializer = GameListQuerySerializer(data=request.query_params)
+    query_serializer.is_valid(raise_exception=True)
+    params = query_serializer.validated_data
 
+    games = Game.objects.defer("packed_history")
+    if params["is_solved"] is not None:
+        games = games.filter(is_solved=params["is_solved"])
+    if params.get("state") == "active":
+        games = games.filter(is_solved=False, attempts_used__lt=F("max_attempts"))
+    elif params.get("state") == "exhausted":
+        games = games.filter(is_solved=False, attempts_used__gte=F("max_attempts"))
+
+    try:
+        games = keyset_page(games, params.get("cursor"))
+    except ValueError as error:
+        raise serializers.ValidationError({"cursor": [str(error)]}) from error
 
-@extend_schema(tags=["Games"], request=CodeSerializer, responses=GuessResponseSerializer)
+    limit = params["limit"]
+    page = list(games[: limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].pk)
+
+    response_serializer = GameListResponseSerializer({"results": page, "next_cursor": next_cursor})
+    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    methods=["GET"],
+    tags=["Games"],
+    operation_id="api_games_list",
+    parameters=[GameListQuerySerializer],
+    responses=GameListResponseSerializer,
+)
+@extend_schema(
+    methods=["POST"],
+    tags=["Games"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    request=GameCreateSerializer,
+    responses=GameSerializer,
+)
+@api_view(["GET", "POST"])
+@throttle_classes([CreateRateThrottle])
+def game_collection(request) -> Response:
+    if request.method == "GET":
+        return _list_games(request)
+    return idempotent(request, "create", lambda: _create_game(request))
+
+
+@extend_schema(
+    tags=["Games"],
+    request=BulkGameSerializer,
+    responses={
+        (201, "application/x-ndjson"): OpenApiResponse(
+            response=OpenApiTypes.STR,
+            description=(
+                'One `{"id": <game id>}` object per line, streamed as each chunk is inserted, then a final '
+                '`{"status": "complete", "created": <count>}` line. If a later chunk fails the stream ends '
+                'with `{"status": "error", "created": <count>, "error": <message>}` instead; the games listed '
+                "before it exist. A stream without a status line was cut short."
+            ),
+        )
+    },
+)
 @api_view(["POST"])
-def check_guess(request, game_id: int) -> Response:
-    code_value = _validate_code(request.data)
+@throttle_classes([BulkCreateRateThrottle])
+def create_games_bulk(request) -> StreamingHttpResponse | Response:
+    serializer = BulkGameSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
 
-    with transaction.atomic():
-        game = get_object_or_404(Game.objects.select_for_update(), pk=game_id)
+    created = provision_games(
+        **serializer.validated_data,
+        chunk_size=getattr(settings, "GAMES_BULK_CHUNK_SIZE", 1000),
+    )
+    # The first chunk is inserted before responding, so a failing database still gets a plain 500.
+    try:
+        first_chunk = next(created)
+    except DatabaseError:
+        return Response(
+            {"error": "Failed to create games due to database error."},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    return StreamingHttpResponse(
+        _bulk_lines(first_chunk, created),
+        content_type="application/x-ndjson",
+        status=status.HTTP_201_CREATED,
+    )
 
-        if game.is_solved:
-            return Response(
-                {"error": "Game is already solved."},
-                status=status.HTTP_409_CONFLICT,
-            )
 
-        if game.attempts_used >= game.max_attempts:
-            return Response(
-                {"error": "Maximum number of attempts reached."},
-                status=status.HTTP_409_CONFLICT,
-            )
+def _bulk_lines(first_chunk: list[int], created: Iterator[list[int]]) -> Iterator[str]:
+    total = 0
+    chunks = itertools.chain([first_chunk], created)
+    try:
+        for chunk in chunks:
+            total += len(chunk)
+            yield "".join(f'{{"id": {game_id}}}\n' for game_id in chunk)
+    except DatabaseError:
+        error = "Failed to create games due to database error."
+        yield json.dumps({"status": "error", "created": total, "error": error}) + "\n"
+        return
+    yield json.dumps({"status": "complete", "created": total}) + "\n"
+
+
+@extend_schema(
+    tags=["Games"],
+    parameters=[GameExportQuerySerializer],
+    responses={
+        (200, "application/x-ndjson"): OpenApiResponse(
+            response=OpenApiTypes.STR,
+            description=(
+                'One `{"game": ..., "guesses": [...], "cursor": ...}` object per line, oldest game first, '
+                "archived games included. Pass the last received `cursor` to resume an interrupted export."
+            ),
+        )
+    },
+)
+@api_view(["GET"])
+def export_games(request) -> StreamingHttpResponse:
+    query_serializer = GameExportQuerySerializer(data=request.query_params)
+    query_serializer.is_valid(raise_exception=True)
+    params = dict(query_serializer.validated_data)
+    cursor = params.pop("cursor", None)
+
+    lines = export_lines(
+        export_queryset(**params),
+        export_queryset(archived=True, **params),
+        cursor=cursor,
+        batch_size=getattr(settings, "GAMES_EXPORT_BATCH_SIZE", 500),
+    )
+    return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+
+def _record_guess_locking(game_id: int, code_value: str) -> tuple[Game, GameGuess] | Response:
+    with transaction.atomic():
+        with timed("lock_wait"):
+            game = get_object_or_404(Game.objects.select_for_update(), pk=game_id)
+
+        _validate_guesses(game, [code_value], "code")
+        closed_response = _closed_game_response(game)
+        if closed_response is not None:
+            return closed_response
 
-        guess_digits = [int(char) for char in code_value]
-        secret_digits = [int(char) for char in game.code]
-        evaluation = evaluate_guess(guess_digits, secret_digits)
+        with timed("scoring"):
+            evaluation = game.score(code_value)
 
         guess = GameGuess.objects.create(
             game=game,
@@ -78,28 +321,362 @@ def check_guess(request, game_id: int) -> Response:
         )
 
         game.attempts_used += 1
-        if evaluation["well_placed"] == 4:
+        if evaluation["well_placed"] == game.code_length:
             game.is_solved = True
-        game.save(update_fields=["attempts_used", "is_solved"])
+        append_guesses(game, [guess])
+        game.save(update_fields=["attempts_used", "is_solved", "packed_history"])
+        record_guesses(game, [guess])
+
+    return game, guess
+
+
+def _record_guess_optimistic(game_id: int, code_value: str) -> tuple[Game, GameGuess] | Response:
+    # The secret never changes, so it can be read and scored without a lock; the conditional UPDATE
+    # below is what claims the attempt, and zero affected rows means another request closed the game.
+    # The packed history cannot be appended without a lock, so it is marked stale instead.
+    game = get_object_or_404(Game, pk=game_id)
+
+    _validate_guesses(game, [code_value], "code")
+    closed_response = _closed_game_response(game)
+    if closed_response is not None:
+        return closed_response
+
+    with timed("scoring"):
+        evaluation = game.score(code_value)
+
+    with transaction.atomic():
+        claimed = Game.objects.filter(
+            pk=game_id,
+            is_solved=False,
+            attempts_used__lt=F("max_attempts"),
+        ).update(
+            attempts_used=F("attempts_used") + 1,
+            is_solved=evaluation["well_placed"] == game.code_length,
+            packed_history=None,
+        )
+
+        if claimed:
+            guess = GameGuess.objects.create(
+                game=game,
+                guess=code_value,
+                well_placed=evaluation["well_placed"],
+                misplaced=evaluation["misplaced"],
+            )
+            game.refresh_from_db(fields=["attempts_used", "is_solved"])
+            record_guesses(game, [guess])
+            return game, guess
+
+    try:
+        game.refresh_from_db(fields=["attempts_used", "is_solved"])
+    except Game.DoesNotExist:
+        raise Http404
+    return _closed_game_response(game) or Response(
+        {"error": "Game was updated concurrently."},
+        status=status.HTTP_409_CONFLICT,
+    )
+
+
+def _record_guess_journal(
+    game_id: int, codes: list[str], field: str = "codes"
+) -> tuple[Game, list[GameGuess]] | Response:
+    try:
+        return guess_journal.record_guesses(game_id, codes, lambda game: _validate_guesses(game, codes, field))
+    except GameClosed as closed:
+        return _closed_game_response(closed.game)
+    except JournalFull:
+        return Response(
+            {"error": "Too many guesses are waiting to be written; retry shortly."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
+
+
+@extend_schema(
+    tags=["Games"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    request=CodeSerializer,
+    responses=GuessResponseSerializer,
+)
+@api_view(["POST"])
+@throttle_classes(GUESS_THROTTLES)
+def check_guess(request, game_id: int) -> Response:
+    return _write_guesses(request, f"guess:{game_id}", lambda: _check_guess(request, game_id))
+
+
+def _write_guesses(request, scope: str, handler: Callable[[], Response]) -> Response:
+    try:
+        return idempotent(request, scope, handler, durable=True)
+    except WriterBusy:
+        # The queued write was cancelled before it ran, so nothing was recorded.
+        return Response(
+            {"error": "Too many writes are queued; the guess was not recorded, retry shortly."},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "1"},
+        )
 
-    response_serializer = GuessResponseSerializer({"game": game, "guess": guess})
-    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+def _check_guess(request, game_id: int) -> Response:
+    code_value = _validate_code(request.data)
+
+    try:
+        if write_behind_enabled():
+            result = _record_guess_journal(game_id, [code_value], "code")
+        elif getattr(settings, "GAMES_GUESS_CONCURRENCY", "locking") == "optimistic":
+            result = run_write(_record_guess_optimistic, game_id, code_value)
+        else:
+            result = run_write(_record_guess_locking, game_id, code_value)
+    except Http404:
+        return _archived_game_response(game_id)
+
+    if isinstance(result, Response):
+        return result
+    game, guess = result
+    if isinstance(guess, list):
+        (guess,) = guess
+
+    with timed("serialization"):
+        data = {"game": game_representation(game), "guess": guess_representation(guess)}
+    _announce_guesses(game, data["game"], [data["guess"]])
+    return Response(data, status=status.HTTP_200_OK)
+
+
+def _record_guess_batch(game_id: int, codes: list[str]) -> tuple[Game, list[GameGuess]] | Response:
+    with transaction.atomic():
+        with timed("lock_wait"):
+            game = get_object_or_404(Game.objects.select_for_update(), pk=game_id)
+
+        _validate_guesses(game, codes)
+        closed_response = _closed_game_response(game)
+        if closed_response is not None:
+            return closed_response
+
+        guesses: list[GameGuess] = []
+        for code_value in codes[: game.remaining_attempts]:
+            with timed("scoring"):
+                evaluation = game.score(code_value)
+            guesses.append(
+                GameGuess(
+                    game=game,
+                    guess=code_value,
+                    well_placed=evaluation["well_placed"],
+                    misplaced=evaluation["misplaced"],
+                )
+            )
+            if evaluation["well_placed"] == game.code_length:
+                game.is_solved = True
+                break
+
+        guesses = GameGuess.objects.bulk_create(guesses)
+        game.attempts_used += len(guesses)
+        append_guesses(game, guesses)
+        game.save(update_fields=["attempts_used", "is_solved", "packed_history"])
+        record_guesses(game, guesses)
+
+    return game, guesses
+
+
+@extend_schema(
+    tags=["Games"],
+    parameters=[IDEMPOTENCY_KEY_PARAMETER],
+    request=CodeBatchSerializer,
+    responses=GuessBatchResponseSerializer,
+)
+@api_view(["POST"])
+@throttle_classes(GUESS_THROTTLES)
+def check_guess_batch(request, game_id: int) -> Response:
+    return _write_guesses(request, f"guesses:{game_id}", lambda: _check_guess_batch(request, game_id))
+
+
+def _check_guess_batch(request, game_id: int) -> Response:
+    serializer = CodeBatchSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    codes = serializer.validated_data["codes"]
+
+    try:
+        if write_behind_enabled():
+            result = _record_guess_journal(game_id, codes)
+        else:
+            result = run_write(_record_guess_batch, game_id, codes)
+    except Http404:
+        return _archived_game_response(game_id)
+    if isinstance(result, Response):
+        return result
+    game, guesses = result
+
+    with timed("serialization"):
+        data = {
+            "game": game_representation(game),
+            "results": [guess_representation(guess) for guess in guesses],
+        }
+    _announce_guesses(game, data["game"], data["results"])
+    return Response(data, status=status.HTTP_200_OK)
 
 
 @extend_schema(tags=["Games"], responses=GuessHistoryResponseSerializer)
 @api_view(["GET"])
 def guess_history(request, game_id: int) -> Response:
-    game = get_object_or_404(Game.objects.prefetch_related("guesses"), pk=game_id)
-    response_serializer = GuessHistoryResponseSerializer(
-        {"game": game, "history": list(game.guesses.all())}
-    )
-    return Response(response_serializer.data, status=status.HTTP_200_OK)
+    state = game_cache.get_history_state(game_id)
+    if state is None:
+        game = _load_game(game_id)
+        if is_archived(game) or (
+            getattr(settings, "GAMES_PACKED_HISTORY", False) and game.packed_history is not None
+        ):
+            history = unpack_history(game)
+        elif write_behind_enabled():
+            history = guess_journal.guesses_for(game)
+        else:
+            history = list(game.guesses.all())
+        with timed("serialization"):
+            data = {
+                "game": game_representation(game),
+                "history": [guess_representation(guess) for guess in history],
+            }
+        state = game_cache.fill_history_state(game, data)
+    return _cached_response(request, state)
 
 
 @extend_schema(tags=["Games"], responses=GameSerializer)
 @api_view(["GET"])
 def game_detail(request, game_id: int) -> Response:
-    game = get_object_or_404(Game, pk=game_id)
-    serializer = GameSerializer(game)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    state = game_cache.get_game_state(game_id)
+    if state is None:
+        game = _load_game(game_id)
+        with timed("serialization"):
+            data = game_representation(game)
+        state = game_cache.fill_game_state(game, data)
+    return _cached_response(request, state)
+
+
+@extend_schema(tags=["Games"], responses=HintResponseSerializer)
+@api_view(["GET"])
+def game_hint(request, game_id: int) -> Response:
+    game = _load_game(game_id)
+
+    closed_response = _closed_game_response(game)
+    if closed_response is not None:
+        return closed_response
+    if not game.is_classic:
+        return Response(
+            {"error": "Hints are only available for 4-digit games."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if write_behind_enabled():
+        entries = [(guess.guess, guess.well_placed, guess.misplaced) for guess in guess_journal.guesses_for(game)]
+    else:
+        entries = game.guesses.values_list("guess", "well_placed", "misplaced")
+    history = build_history(entries)
+    response_serializer = HintResponseSerializer(
+        {"hint": suggest_guess(history), "remaining_candidates": len(candidates_for(history))}
+    )
+    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Games"], responses=StatsResponseSerializer)
+@api_view(["GET"])
+def game_stats(request) -> Response:
+    response_serializer = StatsResponseSerializer(read_stats())
+    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+@extend_schema(tags=["Challenges"], request=ChallengeCreateSerializer, responses=ChallengeSerializer)
+@api_view(["POST"])
+def create_challenge(request) -> Response:
+    serializer = ChallengeCreateSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    try:
+        with transaction.atomic():
+            challenge = Challenge.objects.create(**serializer.validated_data)
+    except IntegrityError:
+        return Response(
+            {"error": "A challenge already exists for this date."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    # Build the code's feedback row now rather than on the first guess.
+    feedback_row(challenge.code, challenge.alphabet_size)
+    return Response(ChallengeSerializer(challenge).data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(tags=["Challenges"], responses=ChallengeDetailResponseSerializer)
+@api_view(["GET"])
+def challenge_detail(request, challenge_id: int) -> Response:
+    challenge = get_object_or_404(Challenge, pk=challenge_id)
+    response_serializer = ChallengeDetailResponseSerializer(
+        {"challenge": challenge, "stats": read_challenge_stats(challenge.pk)}
+    )
+    return Response(response_serializer.data, status=status.HTTP_200_OK)
+
+
+def _join_challenge(challenge_id: int) -> Response:
+    challenge = get_object_or_404(Challenge, pk=challenge_id)
+    with transaction.atomic():
+        game = Game.objects.create(
+            challenge=challenge,
+            code=challenge.code,
+            code_length=challenge.code_length,
+            alphabet_size=challenge.alphabet_size,
+            max_attempts=challenge.max_attempts,
+        )
+        record_games_created(challenge_id=challenge.pk)
+
+    with timed("serialization"):
+        data = game_representation(game)
+    game_cache.store_game_state(game, data)
+    return Response(data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema(tags=["Challenges"], parameters=[IDEMPOTENCY_KEY_PARAMETER], request=None, responses=GameSerializer)
+@api_view(["POST"])
+@throttle_classes([CreateRateThrottle])
+def join_challenge(request, challenge_id: int) -> Response:
+    """
+    Start a game on the challenge's code; guesses then go to the usual game endpoints.
+    """
+    return idempotent(request, f"challenge:{challenge_id}", lambda: _join_challenge(challenge_id))
+
+
+async def game_events(request, game_id: int) -> StreamingHttpResponse:
+    """
+    Server-Sent Events stream of a game: its current state as a `game` event, then one `guess` event
+    per recorded guess or batch, ending once the game is finished.
+
+    Served as a plain async view so that, under ASGI, each open stream is a suspended coroutine rather
+    than a worker thread. Under WSGI only the initial `game` event is sent.
+    """
+    await sync_to_async(_load_game)(game_id)
+    response = StreamingHttpResponse(
+        _game_event_stream(game_id, live=isinstance(request, ASGIRequest)),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+async def _game_event_stream(game_id: int, *, live: bool) -> AsyncIterator[str]:
+    backend = get_backend()
+    # Subscribe before reading the snapshot so no guess can fall between the two.
+    subscription = backend.subscribe(game_id) if live else None
+    try:
+        game = await sync_to_async(_load_game)(game_id)
+        yield format_event("game", game_representation(game), game.attempts_used)
+        if subscription is None:
+            return
+        if game_cache.is_finished(game):
+            yield END_EVENT
+            return
 
+        keepalive = getattr(settings, "GAMES_EVENTS_KEEPALIVE_SECONDS", 15)
+        while True:
+            message = await subscription.get(keepalive)
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            yield message
+            if message.endswith(END_EVENT):
+                return
+    finally:
+        if subscription is not None:
+            backend.unsubscribe(subscription)
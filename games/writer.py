@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import contextvars
+import queue
+import threading
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, TypeVar
+
+from django.conf import settings
+from django.db import close_old_connections
+
+T = TypeVar("T")
+
+
+class WriterBusy(Exception):
+    """
+    Raised by `SerializedWriter.submit` when a write waited in the queue past the timeout; it was
+    cancelled and never ran.
+    """
+
+
+class SerializedWriter:
+    """
+    Run write transactions one at a time on a dedicated thread with its own database connection.
+
+    SQLite allows a single writer; queueing writes in-process means request threads wait on a cheap
+    in-memory queue instead of spinning on `busy_timeout`, and readers never wait behind them.
+    """
+
+    def __init__(self, timeout: float = 30.0) -> None:
+        self.timeout = timeout
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="games-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                close_old_connections()
+                return
+
+            future, context, func, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            close_old_connections()
+            try:
+                result = context.run(func, *args, **kwargs)
+            except BaseException as error:  # re-raised in the submitting thread
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+            finally:
+                close_old_connections()
+
+    def submit(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run `func` on the writer thread and return its result, re-raising any exception here.
+
+        A write still queued after `timeout` seconds is cancelled and `WriterBusy` raised. One that has
+        started by then is not rolled back, so its outcome is waited for and returned as usual.
+        """
+        if threading.current_thread() is self._thread:
+            return func(*args, **kwargs)
+
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((future, contextvars.copy_context(), func, args, kwargs))
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                raise WriterBusy() from None
+            return future.result()
+
+    def stop(self) -> None:
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+
+writer = SerializedWriter()
+
+
+def run_write(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Call `func` directly, or on the shared writer thread when `GAMES_SERIALIZED_WRITES` is enabled.
+    """
+    if getattr(settings, "GAMES_SERIALIZED_WRITES", False):
+        return writer.submit(func, *args, **kwargs)
+    return func(*args, **kwargs)